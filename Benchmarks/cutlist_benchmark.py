@@ -0,0 +1,151 @@
+"""
+Cut-list optimizer benchmark.
+
+Builds synthetic plans of increasing size, takes off their plate cuts and packs
+them into stock lengths, reporting optimizer time, boards bought and waste as
+JSON. The old summed-length order (total // stock + 1 boards of the longest
+stock) is reported alongside for comparison. No GTK or Cairo is needed.
+
+Run from the repository root:
+
+    python -m Benchmarks.cutlist_benchmark --sizes 1000 10000 100000 --output cutlist.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+from Benchmarks.synthetic_plans import PLAN_KINDS, make_plan
+from Takeoff.cut_list import STOCK_LENGTHS, optimize_cuts, plate_cuts
+from Takeoff.framing_takeoff import FramingTakeoff
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+
+class _PlateSettings:
+    def __init__(self, max_length):
+        self.MAX_WALL_PLATE_INCHES = max_length
+
+
+def plan_cuts(kind, size, max_length, seed):
+    """All plate cuts of a synthetic plan, with wall lengths jittered so they are not all alike."""
+    document = make_plan(kind, size, seed=seed)
+    rng = random.Random(seed)
+    for wall in document.all_walls():
+        # Stretch walls by up to 3' so the cut lengths spread over the stock range
+        sx, sy = wall.start
+        ex, ey = wall.end
+        scale = 1.0 + rng.uniform(0.0, 36.0) / max(abs(ex - sx) + abs(ey - sy), 1.0)
+        wall.end = (sx + (ex - sx) * scale, sy + (ey - sy) * scale)
+    estimate = FramingTakeoff(document, _PlateSettings(max_length)).estimate()
+    cuts = []
+    for size_cuts in plate_cuts(estimate["wall_details"], max_length).values():
+        cuts.extend(size_cuts)
+    return cuts
+
+
+def summarize(samples):
+    """Summary statistics (milliseconds) for a list of durations in seconds."""
+    ms = sorted(s * 1000.0 for s in samples)
+    return {
+        "runs": len(ms),
+        "min_ms": ms[0],
+        "median_ms": statistics.median(ms),
+        "max_ms": ms[-1],
+    }
+
+
+def run_case(kind, size, max_length, kerf, repeats, seed):
+    cuts = plan_cuts(kind, size, max_length, seed)
+    stock_lengths = [length for length in STOCK_LENGTHS if length <= max_length]
+    samples = []
+    plan = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        plan = optimize_cuts(cuts, stock_lengths, kerf)
+        samples.append(time.perf_counter() - start)
+    cut_length = sum(cuts)
+    naive_boards = int(cut_length // max_length) + 1
+    return {
+        "kind": kind,
+        "cuts": len(cuts),
+        "cut_length_ft": cut_length / 12,
+        "optimize": summarize(samples),
+        "boards": len(plan.boards),
+        "board_counts": {str(length): count for length, count in plan.counts().items()},
+        "stock_length_ft": plan.stock_length / 12,
+        "waste_pct": 100.0 * plan.waste / plan.stock_length if plan.boards else 0.0,
+        "summed_length_boards": naive_boards,
+        "summed_length_stock_ft": naive_boards * max_length / 12,
+    }
+
+
+def run_exact_case(n, max_length, kerf, repeats, seed):
+    """Exact solver against first-fit-decreasing on small random sets."""
+    rng = random.Random(seed)
+    stock_lengths = [length for length in STOCK_LENGTHS if length <= max_length]
+    exact_stock = ffd_stock = 0
+    samples = []
+    for _ in range(repeats):
+        cuts = [rng.uniform(24, max_length) for _ in range(n)]
+        start = time.perf_counter()
+        exact_stock += optimize_cuts(cuts, stock_lengths, kerf, exact_limit=n).stock_length
+        samples.append(time.perf_counter() - start)
+        ffd_stock += optimize_cuts(cuts, stock_lengths, kerf, exact_limit=0).stock_length
+    return {
+        "cuts": n,
+        "sets": repeats,
+        "exact": summarize(samples),
+        "exact_stock_ft": exact_stock / 12,
+        "ffd_stock_ft": ffd_stock / 12,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Plate cut-list optimizer benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Approximate wall counts to generate.")
+    parser.add_argument("--kinds", nargs="+", choices=sorted(PLAN_KINDS), default=["grid"],
+                        help="Synthetic plan layouts.")
+    parser.add_argument("--max-length", type=int, default=192, choices=STOCK_LENGTHS,
+                        help="Longest stock length (MAX_WALL_PLATE_INCHES).")
+    parser.add_argument("--kerf", type=float, default=0.125, help="Saw kerf in inches.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case.")
+    parser.add_argument("--exact-sizes", type=int, nargs="*", default=[6, 8, 10],
+                        help="Small set sizes to compare the exact solver against FFD.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for kind in args.kinds:
+        for size in args.sizes:
+            result = run_case(kind, size, args.max_length, args.kerf, args.repeats, args.seed)
+            print(f"{kind:>8} {result['cuts']:>7} cuts: median {result['optimize']['median_ms']:.1f} ms, "
+                  f"{result['boards']} boards ({result['waste_pct']:.1f}% waste), "
+                  f"summed length {result['summed_length_boards']} boards", file=sys.stderr)
+            results.append(result)
+    exact = []
+    for n in args.exact_sizes:
+        result = run_exact_case(n, args.max_length, args.kerf, 20, args.seed)
+        print(f"   exact {n:>4} cuts: median {result['exact']['median_ms']:.1f} ms, "
+              f"{result['exact_stock_ft']:.0f} ft vs FFD {result['ffd_stock_ft']:.0f} ft", file=sys.stderr)
+        exact.append(result)
+
+    report = {"benchmark": "cutlist", "max_length": args.max_length, "kerf": args.kerf,
+              "results": results, "exact": exact}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
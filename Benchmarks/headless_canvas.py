@@ -0,0 +1,157 @@
+"""
+A canvas that runs the real CanvasArea mixins without a window.
+
+HeadlessCanvas shares every drawing and event mixin with CanvasArea but is not a
+Gtk widget: the handful of widget calls the mixins make (queue_draw, emit,
+get_allocation, ...) are recorded or answered with fixed values, and render()
+draws a frame into an offscreen cairo.ImageSurface. GTK and Pango still need to
+be importable; no display is required.
+"""
+from types import SimpleNamespace
+
+import cairo
+
+import config
+from Canvas.canvas_area import CanvasArea, CanvasDocumentMixin
+from Canvas.canvas_draw import CanvasDrawMixin
+from Canvas.canvas_events import CanvasEventsMixin
+from Canvas.canvas_state import CanvasStateMixin
+from Canvas.canvas_geometry import CanvasGeometryMixin
+from Canvas.canvas_tool import CanvasToolMixin
+from Canvas.events_selection import CanvasSelectionMixin
+from Canvas.events_wall import CanvasWallMixin
+from Canvas.events_room import CanvasRoomMixin
+from Canvas.events_tools import CanvasToolsMixin
+from Canvas.events_edit import EditEventsMixin
+from Canvas.utils import UtilsMixin
+from Canvas.events_helpers import EventsHelpersMixin
+
+
+def load_benchmark_config(**overrides):
+    """Defaults merged with the user's settings.json, plus any overrides."""
+    settings = dict(config.DEFAULT_SETTINGS)
+    settings.update(config.load_config())
+    settings.update(overrides)
+    return config.Settings(**settings)
+
+
+class HeadlessCanvas(CanvasDocumentMixin,
+                     CanvasDrawMixin,
+                     CanvasEventsMixin,
+                     CanvasStateMixin,
+                     CanvasGeometryMixin,
+                     CanvasToolMixin,
+                     CanvasSelectionMixin,
+                     CanvasWallMixin,
+                     CanvasRoomMixin,
+                     CanvasToolsMixin,
+                     EditEventsMixin,
+                     UtilsMixin,
+                     EventsHelpersMixin):
+
+    # Non-mixin methods defined on CanvasArea itself
+    adjust_zoom = CanvasArea.adjust_zoom
+    reset_zoom = CanvasArea.reset_zoom
+    set_perf_hud = CanvasArea.set_perf_hud
+    toggle_perf_hud = CanvasArea.toggle_perf_hud
+    delete_selected = CanvasArea.delete_selected
+    copy_selected = CanvasArea.copy_selected
+    cut_selected = CanvasArea.cut_selected
+    paste = CanvasArea.paste
+    _notify_selection_changes = CanvasArea._notify_selection_changes
+
+    def __init__(self, config_constants=None, document=None, width=1600, height=1000):
+        CanvasArea._init_state(self, config_constants or load_benchmark_config(), document)
+        self.width = width
+        self.height = height
+        self.draw_requests = 0
+        self.emitted = []
+
+    # --- Widget stand-ins --------------------------------------------------
+
+    def queue_draw(self):
+        self.damage.add_all()
+        self.draw_requests += 1
+
+    def queue_draw_area(self, x, y, width, height):
+        self.damage.add(x, y, width, height)
+        self.draw_requests += 1
+
+    def emit(self, signal, *args):
+        self.emitted.append(signal)
+
+    def get_allocation(self):
+        return SimpleNamespace(x=0, y=0, width=self.width, height=self.height)
+
+    def get_width(self):
+        return self.width
+
+    def get_height(self):
+        return self.height
+
+    def get_scale_factor(self):
+        return 1
+
+    def add_tick_callback(self, callback):
+        # No frame clock: callers flush pending motion explicitly.
+        return 1
+
+    def remove_tick_callback(self, tick_id):
+        pass
+
+    def grab_focus(self):
+        pass
+
+    def get_root(self):
+        return None
+
+    def get_native(self):
+        return None
+
+    # --- Rendering ---------------------------------------------------------
+
+    def new_surface(self):
+        return cairo.ImageSurface(cairo.FORMAT_ARGB32, self.width, self.height)
+
+    def render(self, surface=None):
+        """Draw one full frame into surface (a new ImageSurface by default) and return it."""
+        surface = surface or self.new_surface()
+        self.damage.add_all()
+        cr = cairo.Context(surface)
+        self.on_draw(self, cr, self.width, self.height)
+        surface.flush()
+        return surface
+
+    def fit_to_bounds(self, min_x, min_y, max_x, max_y, margin=40):
+        """Set zoom and offsets so the model rectangle fills the surface."""
+        pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        span_x = max(max_x - min_x, 1.0)
+        span_y = max(max_y - min_y, 1.0)
+        usable_w = max(self.width - 2 * margin - self.ruler_offset, 1)
+        usable_h = max(self.height - 2 * margin - self.ruler_offset, 1)
+        self.zoom = min(usable_w / span_x, usable_h / span_y) / pixels_per_inch
+        zoom_transform = self.zoom * pixels_per_inch
+        self.offset_x = self.ruler_offset + margin - min_x * zoom_transform
+        self.offset_y = self.ruler_offset + margin - min_y * zoom_transform
+        self.snap_manager.zoom = self.zoom
+
+
+class ScriptedEvent:
+    def __init__(self, modifier_state=0):
+        self.modifier_state = modifier_state
+
+    def get_modifier_state(self):
+        return self.modifier_state
+
+
+class ScriptedGesture:
+    """Stand-in for the Gtk gestures/controllers passed to the canvas event handlers."""
+
+    def __init__(self, modifier_state=0):
+        self.event = ScriptedEvent(modifier_state)
+
+    def get_current_event(self):
+        return self.event
+
+    def set_state(self, state):
+        pass
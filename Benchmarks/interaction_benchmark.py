@@ -0,0 +1,265 @@
+"""
+Interaction latency benchmark.
+
+Replays pointer traces against the real canvas event handlers on synthetic plans
+of increasing size and reports p50/p95/p99 latency per operation, so it is easy
+to see which interactions stop scaling with the plan.
+
+Run from the repository root:
+
+    python -m Benchmarks.interaction_benchmark --sizes 100 1000 10000 --output interaction.json
+
+A recorded trace can be replayed with --trace trace.json, where the file holds a
+JSON list of [x, y] widget coordinates; otherwise a seeded random walk over the
+visible plan is used.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import random
+import sys
+import time
+
+from components import Wall
+from Benchmarks.headless_canvas import HeadlessCanvas, ScriptedGesture, load_benchmark_config
+from Benchmarks.synthetic_plans import PLAN_KINDS, make_plan, plan_bounds
+
+DEFAULT_SIZES = (100, 1000, 10000)
+OPERATIONS = (
+    "motion_walls", "motion_rooms", "motion_polyline", "pointer_click", "box_select",
+    "wall_drag", "wall_drag_end", "paste", "delete_selected", "save_state", "undo", "redo",
+)
+
+
+def percentile(sorted_ms, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_ms:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_ms)))
+    return sorted_ms[rank - 1]
+
+
+def summarize(samples):
+    ms = sorted(s * 1000.0 for s in samples)
+    return {
+        "runs": len(ms),
+        "p50_ms": percentile(ms, 50),
+        "p95_ms": percentile(ms, 95),
+        "p99_ms": percentile(ms, 99),
+        "max_ms": ms[-1] if ms else None,
+    }
+
+
+def random_walk_trace(canvas, n_points, seed=0, step=12.0):
+    """A seeded pointer path wandering over the surface, in widget coordinates."""
+    rng = random.Random(seed)
+    x, y = canvas.width / 2, canvas.height / 2
+    heading = rng.uniform(0, 2 * math.pi)
+    trace = []
+    for _ in range(n_points):
+        heading += rng.gauss(0, 0.4)
+        x = min(max(x + step * math.cos(heading), canvas.ruler_offset), canvas.width - 1)
+        y = min(max(y + step * math.sin(heading), canvas.ruler_offset), canvas.height - 1)
+        trace.append((x, y))
+    return trace
+
+
+def load_trace(path):
+    with open(path) as f:
+        return [(float(x), float(y)) for x, y in json.load(f)]
+
+
+class Timer:
+    """Collects per-operation samples; the handlers' console output is swallowed."""
+
+    def __init__(self):
+        self.samples = {}
+        self._sink = io.StringIO()
+
+    def time(self, name, func, *args):
+        with contextlib.redirect_stdout(self._sink):
+            start = time.perf_counter()
+            result = func(*args)
+            elapsed = time.perf_counter() - start
+        self.samples.setdefault(name, []).append(elapsed)
+        self._sink.seek(0)
+        self._sink.truncate()
+        return result
+
+    def quiet(self, func, *args):
+        with contextlib.redirect_stdout(self._sink):
+            result = func(*args)
+        self._sink.seek(0)
+        self._sink.truncate()
+        return result
+
+
+def bench_motion(canvas, timer, gesture, trace):
+    pixels_per_inch = getattr(canvas.config, "PIXELS_PER_INCH", 2.0)
+    start = canvas.device_to_model(trace[0][0], trace[0][1], pixels_per_inch)
+
+    def move(x, y):
+        canvas.on_motion(gesture, x, y)
+        canvas.flush_pending_motion()
+
+    for name, mode in (("motion_walls", "draw_walls"),
+                       ("motion_rooms", "draw_rooms"),
+                       ("motion_polyline", "add_polyline")):
+        canvas.set_tool_mode(mode)
+        if mode == "draw_walls":
+            canvas.drawing_wall = True
+            canvas.current_wall = Wall(start, start, canvas.config.DEFAULT_WALL_WIDTH,
+                                       canvas.config.DEFAULT_WALL_HEIGHT)
+        elif mode == "draw_rooms":
+            canvas.current_room_points = [start]
+        else:
+            canvas.drawing_polyline = True
+            canvas.current_polyline_start = start
+        for x, y in trace:
+            timer.time(name, move, x, y)
+    canvas.drawing_polyline = False
+    canvas.current_polyline_start = None
+    canvas.current_polyline_preview = None
+    canvas.set_tool_mode(None)
+
+
+def bench_pointer_click(canvas, timer, gesture, trace):
+    canvas.set_tool_mode("pointer")
+    for x, y in trace:
+        canvas.selected_items = []
+        canvas.editing_wall = None
+        canvas.editing_handle = None
+        canvas.click_start = (x, y)
+        timer.time("pointer_click", canvas._handle_pointer_click, gesture, 1, x, y)
+    canvas.editing_wall = None
+    canvas.editing_handle = None
+    canvas.selected_items = []
+
+
+def bench_box_select(canvas, timer, gesture, trace, repeats, rng):
+    canvas.set_tool_mode("pointer")
+    for _ in range(repeats):
+        x, y = rng.choice(trace)
+        w, h = rng.uniform(50, 400), rng.uniform(50, 300)
+        canvas.selected_items = []
+        canvas.on_drag_begin(gesture, x, y)
+        canvas.on_drag_update(gesture, w, h)
+        timer.time("box_select", canvas.on_drag_end, gesture, w, h)
+    canvas.box_selecting = False
+    canvas.selected_items = []
+
+
+def bench_wall_drag(canvas, timer, gesture, repeats, rng, steps=10):
+    pixels_per_inch = getattr(canvas.config, "PIXELS_PER_INCH", 2.0)
+    canvas.set_tool_mode("pointer")
+    walls = canvas.document.all_walls()
+    for _ in range(repeats):
+        wall = rng.choice(walls)
+        mid = ((wall.start[0] + wall.end[0]) / 2, (wall.start[1] + wall.end[1]) / 2)
+        x, y = canvas.model_to_device(mid[0], mid[1], pixels_per_inch)
+        canvas.selected_items = [{"type": "wall", "object": wall}]
+        canvas.on_drag_begin(gesture, x, y)
+        for i in range(1, steps + 1):
+            timer.time("wall_drag", canvas.on_drag_update, gesture, 3.0 * i, 2.0 * i)
+        # Put the wall back where it was before releasing.
+        canvas.on_drag_update(gesture, 0.0, 0.0)
+        timer.time("wall_drag_end", canvas.on_drag_end, gesture, 0.0, 0.0)
+    canvas.selected_items = []
+
+
+def bench_paste_delete(canvas, timer, repeats, rng):
+    for _ in range(repeats):
+        wall_set = rng.choice(canvas.wall_sets)
+        canvas.selected_items = [{"type": "wall", "object": w} for w in wall_set]
+        canvas.copy_selected()
+        timer.time("paste", canvas.paste)
+        # paste selects what it created; delete exactly that.
+        timer.time("delete_selected", canvas.delete_selected)
+    canvas.selected_items = []
+    canvas.clipboard.clear()
+
+
+def bench_undo(canvas, timer, repeats):
+    canvas.undo_stack.clear()
+    canvas.redo_stack.clear()
+    for _ in range(repeats + 1):
+        timer.time("save_state", canvas.save_state)
+    for _ in range(repeats):
+        timer.time("undo", canvas.undo)
+    for _ in range(repeats):
+        timer.time("redo", canvas.redo)
+
+
+def run_case(kind, size, args):
+    rng = random.Random(args.seed)
+    document = make_plan(kind, size)
+    canvas = HeadlessCanvas(load_benchmark_config(), document, width=args.width, height=args.height)
+    canvas.fit_to_bounds(*plan_bounds(document))
+    if args.zoom is not None:
+        canvas.adjust_zoom(args.zoom / canvas.zoom, canvas.width / 2, canvas.height / 2)
+        canvas.snap_manager.zoom = canvas.zoom
+    trace = load_trace(args.trace) if args.trace else random_walk_trace(canvas, args.trace_points, args.seed)
+    gesture = ScriptedGesture()
+    timer = Timer()
+
+    bench_motion(canvas, timer, gesture, trace)
+    bench_pointer_click(canvas, timer, gesture, trace[:args.clicks])
+    bench_box_select(canvas, timer, gesture, trace, args.repeats, rng)
+    bench_wall_drag(canvas, timer, gesture, args.repeats, rng)
+    bench_paste_delete(canvas, timer, args.repeats, rng)
+    # Last: undo/redo replaces the document collections with restored copies.
+    bench_undo(canvas, timer, args.repeats)
+
+    return {
+        "kind": kind,
+        "walls": len(document.all_walls()),
+        "rooms": len(document.rooms),
+        "zoom": canvas.zoom,
+        "trace_points": len(trace),
+        "operations": {name: summarize(timer.samples[name]) for name in OPERATIONS if name in timer.samples},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Canvas interaction latency benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Approximate wall counts to generate.")
+    parser.add_argument("--kinds", nargs="+", choices=sorted(PLAN_KINDS), default=["grid"],
+                        help="Synthetic plan layouts.")
+    parser.add_argument("--trace", help="JSON file with a recorded pointer trace ([[x, y], ...]).")
+    parser.add_argument("--trace-points", type=int, default=300, help="Length of the generated trace.")
+    parser.add_argument("--clicks", type=int, default=100, help="Pointer clicks replayed from the trace.")
+    parser.add_argument("--repeats", type=int, default=20,
+                        help="Repetitions of box select, drags, paste/delete and undo/redo.")
+    parser.add_argument("--zoom", type=float, help="Zoom level (default: fit the plan).")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--width", type=int, default=1600)
+    parser.add_argument("--height", type=int, default=1000)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for kind in args.kinds:
+        for size in args.sizes:
+            result = run_case(kind, size, args)
+            worst = max(result["operations"].items(), key=lambda item: item[1]["p95_ms"])
+            print(f"{kind:>8} {result['walls']:>7} walls: slowest p95 {worst[0]} "
+                  f"{worst[1]['p95_ms']:.2f} ms", file=sys.stderr)
+            results.append(result)
+
+    report = {"benchmark": "interaction", "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Headless rendering benchmark.
+
+Builds synthetic plans of increasing size, renders them into an offscreen
+ImageSurface through the real canvas drawing code and reports per-frame and
+per-layer timings as JSON.
+
+Run from the repository root:
+
+    python -m Benchmarks.render_benchmark --sizes 100 1000 10000 --output render.json
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+import cairo
+
+import Canvas.door_window_renderer as dwr
+import Canvas.wall_room_renderer as wr
+from Canvas.framing_renderer import draw_framing_layer
+from Benchmarks.headless_canvas import HeadlessCanvas, load_benchmark_config
+from Benchmarks.synthetic_plans import PLAN_KINDS, make_plan, plan_bounds
+
+DEFAULT_SIZES = (100, 1000, 10000)
+DEFAULT_ZOOMS = ("fit", "1.0", "4.0")
+
+# (name, callable(canvas, cr, zoom_transform, pixels_per_inch)) in on_draw order
+LAYERS = (
+    ("grid", lambda c, cr, t, ppi: c.draw_grid(cr)),
+    ("rooms", lambda c, cr, t, ppi: wr.draw_rooms(c, cr, t)),
+    ("walls", lambda c, cr, t, ppi: wr.draw_walls(c, cr)),
+    ("framing", lambda c, cr, t, ppi: draw_framing_layer(c, cr, t)),
+    ("doors", lambda c, cr, t, ppi: dwr.draw_doors(c, cr, ppi)),
+    ("windows", lambda c, cr, t, ppi: dwr.draw_windows(c, cr, ppi)),
+    ("texts", lambda c, cr, t, ppi: c.draw_texts(cr)),
+    ("dimensions", lambda c, cr, t, ppi: c.draw_dimensions(cr)),
+)
+
+
+def summarize(samples):
+    """Summary statistics (milliseconds) for a list of durations in seconds."""
+    ms = sorted(s * 1000.0 for s in samples)
+    return {
+        "runs": len(ms),
+        "min_ms": ms[0],
+        "median_ms": statistics.median(ms),
+        "mean_ms": statistics.fmean(ms),
+        "max_ms": ms[-1],
+    }
+
+
+def apply_zoom(canvas, zoom, bounds):
+    """Fit the plan to the surface, then zoom about the surface centre by the given factor."""
+    canvas.fit_to_bounds(*bounds)
+    if zoom != "fit":
+        factor = float(zoom) / canvas.zoom
+        canvas.adjust_zoom(factor, canvas.width / 2, canvas.height / 2)
+        canvas.snap_manager.zoom = canvas.zoom
+
+
+def time_frames(canvas, repeats):
+    surface = canvas.new_surface()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        canvas.render(surface)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def time_layers(canvas, repeats):
+    surface = canvas.new_surface()
+    pixels_per_inch = getattr(canvas.config, "PIXELS_PER_INCH", 2.0)
+    zoom_transform = canvas.zoom * pixels_per_inch
+    samples = {name: [] for name, _ in LAYERS}
+    for _ in range(repeats):
+        for name, draw in LAYERS:
+            cr = cairo.Context(surface)
+            cr.translate(canvas.offset_x, canvas.offset_y)
+            cr.scale(zoom_transform, zoom_transform)
+            start = time.perf_counter()
+            draw(canvas, cr, zoom_transform, pixels_per_inch)
+            surface.flush()
+            samples[name].append(time.perf_counter() - start)
+    return samples
+
+
+def run_case(kind, size, zoom, repeats, warmup, width, height, tiled=False):
+    document = make_plan(kind, size)
+    canvas = HeadlessCanvas(load_benchmark_config(TILED_RENDERING=tiled), document, width=width, height=height)
+    apply_zoom(canvas, zoom, plan_bounds(document))
+
+    # The first frames fill the text layout and path caches; report them separately.
+    first = time_frames(canvas, 1)
+    time_frames(canvas, warmup)
+    frames = time_frames(canvas, repeats)
+    layers = time_layers(canvas, repeats)
+    return {
+        "kind": kind,
+        "walls": len(document.all_walls()),
+        "rooms": len(document.rooms),
+        "doors": len(document.doors),
+        "windows": len(document.windows),
+        "texts": len(document.texts),
+        "dimensions": len(document.dimensions),
+        "zoom": zoom,
+        "effective_zoom": canvas.zoom,
+        "tiled": tiled,
+        "first_frame_ms": first[0] * 1000.0,
+        "frame": summarize(frames),
+        "layers": {name: summarize(s) for name, s in layers.items()},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless canvas rendering benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Approximate wall counts to generate (up to 100000).")
+    parser.add_argument("--kinds", nargs="+", choices=sorted(PLAN_KINDS), default=["grid"],
+                        help="Synthetic plan layouts.")
+    parser.add_argument("--zooms", nargs="+", default=list(DEFAULT_ZOOMS),
+                        help="Zoom levels: 'fit' or a numeric zoom factor.")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed frames per case.")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed frames per case.")
+    parser.add_argument("--width", type=int, default=1600, help="Surface width in pixels.")
+    parser.add_argument("--height", type=int, default=1000, help="Surface height in pixels.")
+    parser.add_argument("--tiled", action="store_true",
+                        help="Render committed rooms and walls through the tiled renderer.")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for kind in args.kinds:
+        for size in args.sizes:
+            for zoom in args.zooms:
+                result = run_case(kind, size, zoom, args.repeats, args.warmup, args.width, args.height,
+                                  tiled=args.tiled)
+                print(f"{kind:>8} {result['walls']:>7} walls  zoom {zoom:>4}: "
+                      f"median frame {result['frame']['median_ms']:.1f} ms", file=sys.stderr)
+                results.append(result)
+
+    report = {"benchmark": "render", "width": args.width, "height": args.height, "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
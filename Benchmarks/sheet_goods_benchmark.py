@@ -0,0 +1,116 @@
+"""
+Sheet goods takeoff benchmark.
+
+Builds synthetic plans of increasing size, marks a share of their walls exterior
+and lays drywall and sheathing panels out on every wall face, reporting the time
+per stage, panels bought and waste as JSON. The face-by-face layout (every face
+through the opening path) is timed alongside the grouped rectangular fast path.
+No GTK or Cairo is needed.
+
+Run from the repository root:
+
+    python -m Benchmarks.sheet_goods_benchmark --sizes 1000 10000 --output sheets.json
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+
+from Benchmarks.synthetic_plans import PLAN_KINDS, make_plan
+from Takeoff.sheet_goods import SHEET_SIZES, plan_sheets, wall_faces
+
+DEFAULT_SIZES = (1000, 10000, 50000)
+
+
+def summarize(samples):
+    """Summary statistics (milliseconds) for a list of durations in seconds."""
+    ms = sorted(s * 1000.0 for s in samples)
+    return {
+        "runs": len(ms),
+        "min_ms": ms[0],
+        "median_ms": statistics.median(ms),
+        "max_ms": ms[-1],
+    }
+
+
+def timed(func, repeats, *args, **kwargs):
+    samples = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        samples.append(time.perf_counter() - start)
+    return result, summarize(samples)
+
+
+def run_case(kind, size, exterior_share, repeats, seed):
+    document = make_plan(kind, size, seed=seed)
+    rng = random.Random(seed)
+    for wall in document.all_walls():
+        wall.exterior_wall = rng.random() < exterior_share
+
+    (interior, exterior), faces_timing = timed(
+        wall_faces, repeats, document.wall_sets, document.doors, document.windows)
+    result = {
+        "kind": kind,
+        "walls": len(document.all_walls()),
+        "faces": len(interior) + len(exterior),
+        "faces_with_openings": sum(1 for face in interior + exterior if face.openings),
+        "wall_faces": faces_timing,
+    }
+    for name, faces in (("interior", interior), ("exterior", exterior)):
+        plan, fast = timed(plan_sheets, repeats, faces)
+        slow_plan, slow = timed(plan_sheets, repeats, faces, group_plain=False)
+        result[name] = {
+            "faces": len(faces),
+            "plan": fast,
+            "face_by_face": slow,
+            "panels": plan.panels,
+            "panel_counts": {f"{w}x{h}": count for (w, h), count in plan.counts.items()},
+            "waste_pct": plan.waste_pct,
+            "face_by_face_panels": slow_plan.panels,
+        }
+    return result
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Sheet goods takeoff benchmark.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Approximate wall counts to generate.")
+    parser.add_argument("--kinds", nargs="+", choices=sorted(PLAN_KINDS), default=["grid"],
+                        help="Synthetic plan layouts.")
+    parser.add_argument("--exterior-share", type=float, default=0.3,
+                        help="Fraction of walls marked exterior (sheathed on one face).")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per case.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    results = []
+    for kind in args.kinds:
+        for size in args.sizes:
+            result = run_case(kind, size, args.exterior_share, args.repeats, args.seed)
+            for name in ("interior", "exterior"):
+                stats = result[name]
+                print(f"{kind:>8} {name:>8} {stats['faces']:>7} faces: median {stats['plan']['median_ms']:.1f} ms "
+                      f"(face by face {stats['face_by_face']['median_ms']:.1f} ms), "
+                      f"{stats['panels']} panels, {stats['waste_pct']:.1f}% waste", file=sys.stderr)
+            results.append(result)
+
+    report = {"benchmark": "sheet_goods", "sheet_sizes": [f"{w}x{h}" for w, h in SHEET_SIZES],
+              "results": results}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
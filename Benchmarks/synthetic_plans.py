@@ -0,0 +1,126 @@
+"""
+Synthetic floor plans for the benchmark suites.
+
+Everything here is plain Python on top of document.Document, so plans can be
+generated (and fed to takeoff code) without GTK.
+"""
+import math
+import random
+
+from components import Wall, Room, Door, Window, Text, Dimension
+from document import Document, generate_identifier
+
+ROOM_WIDTH = 144.0    # 12'
+ROOM_DEPTH = 120.0    # 10'
+CORRIDOR_WIDTH = 60.0
+
+
+def _new_id(doc, component_type):
+    # Random ids are unique in practice; skipping the existing_ids scan keeps
+    # generating 100k-wall plans linear.
+    identifier = generate_identifier(component_type, ())
+    doc.existing_ids.append(identifier)
+    return identifier
+
+
+def _add_room(doc, x, y, w, h, label=None, dimension=True):
+    """Add a closed four-wall room at (x, y) and return its walls."""
+    corners = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+    wall_set = []
+    for i in range(4):
+        wall = Wall(corners[i], corners[(i + 1) % 4], 3.5, 96.0,
+                    identifier=_new_id(doc, "wall"))
+        wall_set.append(wall)
+    doc.wall_sets.append(wall_set)
+    doc.rooms.append(Room(list(corners), 96.0, identifier=_new_id(doc, "room")))
+    if label:
+        doc.texts.append(Text(x + w / 2 - 18, y + h / 2 - 6, content=label, width=36.0, height=12.0,
+                              identifier=_new_id(doc, "text")))
+    if dimension:
+        doc.dimensions.append(Dimension(start=corners[0], end=corners[1], offset=-12.0,
+                                        identifier=_new_id(doc, "dimension")))
+    return wall_set
+
+
+def _add_openings(doc, walls, door_ratio, window_ratio, rng):
+    for wall in walls:
+        roll = rng.random()
+        if roll < door_ratio:
+            doc.doors.append((wall, Door("single", 36.0, 80.0, "left", "inswing",
+                                         identifier=_new_id(doc, "door")), 0.5))
+        elif roll < door_ratio + window_ratio:
+            doc.windows.append((wall, Window(36.0, 48.0, "double-hung",
+                                             identifier=_new_id(doc, "window")), 0.5))
+
+
+def grid_plan(n_walls, door_ratio=0.25, window_ratio=0.25, texts=True, dimensions=True, seed=0):
+    """
+    A square-ish grid of 12'x10' rooms with roughly n_walls walls (four per room).
+
+    Every room gets a label text and a dimension; a fraction of the walls get a
+    door or a window.
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    n_rooms = max(1, n_walls // 4)
+    cols = max(1, int(math.ceil(math.sqrt(n_rooms))))
+    all_walls = []
+    for i in range(n_rooms):
+        row, col = divmod(i, cols)
+        label = f"Room {i + 1}" if texts else None
+        all_walls.extend(_add_room(doc, col * ROOM_WIDTH, row * ROOM_DEPTH, ROOM_WIDTH, ROOM_DEPTH,
+                                   label=label, dimension=dimensions))
+    _add_openings(doc, all_walls, door_ratio, window_ratio, rng)
+    return doc
+
+
+def corridor_plan(n_walls, door_ratio=0.5, window_ratio=0.25, texts=True, dimensions=True, seed=0):
+    """
+    A long double-loaded corridor: one row of rooms on each side of a corridor,
+    whose two side walls are long chains of short segments.
+    """
+    rng = random.Random(seed)
+    doc = Document()
+    # Each room contributes 4 walls plus one corridor segment on its side.
+    n_pairs = max(1, n_walls // 10)
+    all_walls = []
+    for i in range(n_pairs):
+        x = i * ROOM_WIDTH
+        label = f"Office {2 * i + 1}" if texts else None
+        all_walls.extend(_add_room(doc, x, 0.0, ROOM_WIDTH, ROOM_DEPTH, label=label, dimension=dimensions))
+        label = f"Office {2 * i + 2}" if texts else None
+        all_walls.extend(_add_room(doc, x, ROOM_DEPTH + CORRIDOR_WIDTH, ROOM_WIDTH, ROOM_DEPTH,
+                                   label=label, dimension=dimensions))
+    for y in (ROOM_DEPTH + 6.0, ROOM_DEPTH + CORRIDOR_WIDTH - 6.0):
+        chain = []
+        for i in range(n_pairs):
+            wall = Wall((i * ROOM_WIDTH, y), ((i + 1) * ROOM_WIDTH, y), 3.5, 96.0,
+                        identifier=_new_id(doc, "wall"))
+            chain.append(wall)
+        doc.wall_sets.append(chain)
+        all_walls.extend(chain)
+    _add_openings(doc, all_walls, door_ratio, window_ratio, rng)
+    return doc
+
+
+PLAN_KINDS = {
+    "grid": grid_plan,
+    "corridor": corridor_plan,
+}
+
+
+def make_plan(kind, n_walls, **kwargs):
+    """Build a synthetic plan of the given kind ("grid" or "corridor")."""
+    return PLAN_KINDS[kind](n_walls, **kwargs)
+
+
+def plan_bounds(doc):
+    """Return (min_x, min_y, max_x, max_y) of all walls in the document."""
+    xs = []
+    ys = []
+    for wall in doc.all_walls():
+        xs.extend((wall.start[0], wall.end[0]))
+        ys.extend((wall.start[1], wall.end[1]))
+    if not xs:
+        return 0.0, 0.0, 0.0, 0.0
+    return min(xs), min(ys), max(xs), max(ys)
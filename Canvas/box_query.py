@@ -0,0 +1,209 @@
+import math
+
+# Entry layout: (order, item type, selection object, bbox, segment or None)
+#   bbox is (minx, miny, maxx, maxy) in model inches; segment is (ax, ay, bx, by) for walls,
+#   polylines and dimension lines, which are tested exactly against the box.
+# Entries are created in the same order on_drag_end used to build selections, so query
+# results come back in that order too.
+
+
+def segment_intersects_rect(ax, ay, bx, by, rx1, ry1, rx2, ry2):
+    """
+    True if segment A-B lies inside or touches the rectangle (rx1, ry1)-(rx2, ry2).
+
+    Liang-Barsky clipping: the segment is A + t*(B - A) for t in [0, 1], and each of
+    the four rectangle edges narrows that interval; the segment hits the rectangle
+    when the interval is not empty.
+    """
+    dx = bx - ax
+    dy = by - ay
+    t0 = 0.0
+    t1 = 1.0
+    for p, q in ((-dx, ax - rx1), (dx, rx2 - ax), (-dy, ay - ry1), (dy, ry2 - ay)):
+        if p == 0:
+            # Parallel to this edge: outside if it starts on the wrong side.
+            if q < 0:
+                return False
+            continue
+        r = q / p
+        if p < 0:
+            if r > t1:
+                return False
+            if r > t0:
+                t0 = r
+        else:
+            if r < t0:
+                return False
+            if r < t1:
+                t1 = r
+    return True
+
+
+def _opening_bbox(wall, opening, ratio, thickness):
+    """Bounding box of a door/window outline, as drawn by the selection indicators."""
+    ax, ay = wall.start
+    bx, by = wall.end
+    dx = bx - ax
+    dy = by - ay
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return None
+    ux = dx / length
+    uy = dy / length
+    hx = ax + ratio * dx
+    hy = ay + ratio * dy
+    half_w = opening.width / 2
+    half_t = thickness / 2
+    # Half extents of the rotated width x thickness rectangle along x and y
+    ex = abs(ux) * half_w + abs(uy) * half_t
+    ey = abs(uy) * half_w + abs(ux) * half_t
+    return (hx - ex, hy - ey, hx + ex, hy + ey)
+
+
+def _dimension_segment(dimension):
+    start = dimension.start
+    end = dimension.end
+    dx = end[0] - start[0]
+    dy = end[1] - start[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return None
+    px = -dy / length * dimension.offset
+    py = dx / length * dimension.offset
+    return (start[0] + px, start[1] + py, end[0] + px, end[1] + py)
+
+
+class BoxQueryIndex:
+    """
+    Uniform-grid index over everything box selection can pick, for rectangle queries.
+
+    Each selectable element is stored once with its bounding box in every grid cell
+    that box touches. A query only visits the cells under the rectangle, rejects
+    candidates by bounding box and clips the remaining segments exactly, so its cost
+    follows what is under the box rather than the size of the plan. The index is
+    rebuilt lazily whenever the document version changes.
+    """
+
+    # Elements spanning more grid cells than this are kept in a separate list
+    MAX_CELLS_PER_ENTRY = 64
+
+    def __init__(self, document, config):
+        self.document = document
+        self.config = config
+        self.version = None
+        self.entries = []
+        self.cell_size = 1.0
+        self._grid = {}
+        self._oversize = []
+
+    def invalidate(self):
+        self.version = None
+
+    def _build(self):
+        document = self.document
+        entries = []
+
+        def add(item_type, obj, bbox, segment=None):
+            entries.append((len(entries), item_type, obj, bbox, segment))
+
+        for wall_set in document.wall_sets:
+            for wall in wall_set:
+                (ax, ay), (bx, by) = wall.start, wall.end
+                add("wall", wall, (min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)), (ax, ay, bx, by))
+        for room in document.rooms:
+            for idx, (x, y) in enumerate(room.points):
+                add("vertex", (room, idx), (x, y, x, y))
+        thickness = self.config.DEFAULT_WALL_WIDTH
+        for item_type, items in (("door", document.doors), ("window", document.windows)):
+            for item in items:
+                wall, opening, ratio = item
+                if wall is None:
+                    continue
+                bbox = _opening_bbox(wall, opening, ratio, thickness)
+                if bbox is not None:
+                    add(item_type, item, bbox)
+        for poly_list in document.polyline_sets:
+            for pl in poly_list:
+                (ax, ay), (bx, by) = pl.start, pl.end
+                add("polyline", pl, (min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)), (ax, ay, bx, by))
+        for dimension in document.dimensions:
+            segment = _dimension_segment(dimension)
+            if segment is not None:
+                ax, ay, bx, by = segment
+                add("dimension", dimension, (min(ax, bx), min(ay, by), max(ax, bx), max(ay, by)), segment)
+        for text in document.texts:
+            add("text", text, (text.x, text.y, text.x + text.width, text.y + text.height))
+
+        # Cells sized so the plan's bounding box holds roughly one entry per cell
+        if entries:
+            minx = min(e[3][0] for e in entries)
+            miny = min(e[3][1] for e in entries)
+            maxx = max(e[3][2] for e in entries)
+            maxy = max(e[3][3] for e in entries)
+            area = max(maxx - minx, 1.0) * max(maxy - miny, 1.0)
+            self.cell_size = max(math.sqrt(area / len(entries)), 12.0)
+        size = self.cell_size
+        grid = {}
+        oversize = []
+        for entry in entries:
+            x1, y1, x2, y2 = entry[3]
+            cx1, cx2 = math.floor(x1 / size), math.floor(x2 / size)
+            cy1, cy2 = math.floor(y1 / size), math.floor(y2 / size)
+            if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > self.MAX_CELLS_PER_ENTRY:
+                # Long diagonal walls would fill a large block of cells; test them on every query.
+                oversize.append(entry)
+                continue
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    grid.setdefault((cx, cy), []).append(entry)
+        self.entries = entries
+        self._grid = grid
+        self._oversize = oversize
+        self.version = document.version()
+
+    def query(self, rect):
+        """Entries whose element lies inside or crosses rect = (x1, y1, x2, y2), in build order."""
+        if self.version != self.document.version():
+            self._build()
+        rx1, ry1, rx2, ry2 = rect
+        size = self.cell_size
+        cx1, cx2 = math.floor(rx1 / size), math.floor(rx2 / size)
+        cy1, cy2 = math.floor(ry1 / size), math.floor(ry2 / size)
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._grid):
+            # The box covers more cells than are occupied: walk the occupied ones instead.
+            buckets = [bucket for (cx, cy), bucket in self._grid.items()
+                       if cx1 <= cx <= cx2 and cy1 <= cy <= cy2]
+        else:
+            grid = self._grid
+            buckets = [grid[key] for key in
+                       ((cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1))
+                       if key in grid]
+        buckets.append(self._oversize)
+        seen = set()
+        found = []
+        for bucket in buckets:
+            for entry in bucket:
+                order = entry[0]
+                if order in seen:
+                    continue
+                seen.add(order)
+                x1, y1, x2, y2 = entry[3]
+                if x2 < rx1 or x1 > rx2 or y2 < ry1 or y1 > ry2:
+                    continue
+                segment = entry[4]
+                if segment is not None and not segment_intersects_rect(*segment, rx1, ry1, rx2, ry2):
+                    continue
+                found.append(entry)
+        found.sort(key=lambda entry: entry[0])
+        return found
+
+    @staticmethod
+    def selection_items(entries):
+        """Turn query results into selected_items dicts."""
+        items = []
+        for _, item_type, obj, _, _ in entries:
+            if item_type == "polyline":
+                items.append({"type": item_type, "object": obj, "identifier": obj.identifier})
+            else:
+                items.append({"type": item_type, "object": obj})
+        return items
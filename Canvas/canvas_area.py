@@ -4,7 +4,21 @@ from gi.repository import Gtk, Gdk, GObject
 
 from measurement_utils import MeasurementConverter
 from components import Wall, Room, Text, Dimension
+from document import (Document, WALL_ADDED, WALL_REMOVED, OPENING_CHANGED,
+                      ROOM_CHANGED, POLYLINE_CHANGED, ANNOTATION_CHANGED)
 from snapping_manager import SnappingManager
+from dimension_links import DimensionLinks
+from Takeoff.framing_takeoff import FramingTakeoff
+from Takeoff.room_takeoff import RoomTakeoff
+from Takeoff.sheet_goods import SheetTakeoff
+from Takeoff.framing_layout import FramingLayout
+from Takeoff.cost_engine import CostEngine, get_price_catalog
+from Canvas.text_layout_cache import TextLayoutCache
+from Canvas.render_cache import PathCache
+from Canvas.perf_hud import PerfStats
+from Canvas.tile_renderer import TileRenderer
+from Canvas.damage import DamageTracker
+from Canvas.box_query import BoxQueryIndex
 
 from Canvas.canvas_draw import CanvasDrawMixin
 from Canvas.canvas_events import CanvasEventsMixin
@@ -20,7 +34,31 @@ from Canvas.utils import UtilsMixin
 from Canvas.events_helpers import EventsHelpersMixin
 
 
+def _document_property(name):
+    """Expose a Document collection as a plain attribute on the canvas."""
+    return property(
+        lambda self: getattr(self.document, name),
+        lambda self, value: setattr(self.document, name, value),
+    )
+
+
+class CanvasDocumentMixin:
+    # Model state lives on the wrapped Document; these keep the mixins'
+    # self.wall_sets / self.rooms / ... access working unchanged.
+    wall_sets = _document_property("wall_sets")
+    walls = _document_property("walls")
+    polylines = _document_property("polylines")
+    polyline_sets = _document_property("polyline_sets")
+    rooms = _document_property("rooms")
+    doors = _document_property("doors")
+    windows = _document_property("windows")
+    texts = _document_property("texts")
+    dimensions = _document_property("dimensions")
+    existing_ids = _document_property("existing_ids")
+
+
 class CanvasArea(Gtk.DrawingArea, 
+                 CanvasDocumentMixin,
                  CanvasDrawMixin, 
                  CanvasEventsMixin, 
                  CanvasStateMixin, 
@@ -38,12 +76,13 @@ class CanvasArea(Gtk.DrawingArea,
     __gsignals__ = {
         # when selection changes, send the new list of selected items
         'selection-changed': (GObject.SignalFlags.RUN_FIRST, None, (object,)),
+        # when edit_properties() changes the model, with the number of objects changed
+        'properties-edited': (GObject.SignalFlags.RUN_FIRST, None, (int,)),
     }
     
-    def __init__(self, config_constants):
+    def __init__(self, config_constants, document=None):
         super().__init__()
-        self.config = config_constants
-        self.converter = MeasurementConverter()
+        self._init_state(config_constants, document)
 
         self.set_focusable(True)
         self.grab_focus()
@@ -51,6 +90,13 @@ class CanvasArea(Gtk.DrawingArea,
         self.set_vexpand(True)
         self.set_draw_func(self.on_draw)
 
+        self._init_controllers()
+
+    def _init_state(self, config_constants, document=None):
+        """Set up the model, view and tool state (everything except widget plumbing)."""
+        self.config = config_constants
+        self.document = document if document is not None else Document()
+        self.converter = MeasurementConverter()
 
         # Zoom and pan
         self.zoom = self.config.DEFAULT_ZOOM_LEVEL
@@ -59,11 +105,9 @@ class CanvasArea(Gtk.DrawingArea,
         self.offset_y = self.ruler_offset
         
 
-        # Wall drawing state
-        self.walls = []
+        # Wall drawing state (walls and wall_sets live on self.document)
         self.current_wall = None
         self.drawing_wall = False
-        self.wall_sets = []
         
         self.auto_dimension_mode = False
         self.last_wall_angle = None
@@ -75,54 +119,93 @@ class CanvasArea(Gtk.DrawingArea,
         self.handle_radius = 10      # device pixels for hit detection
         
         
-        # Polyline drawing state
-        self.polylines = []                # current segments (list of Polyline)
+        # Polyline drawing state (polylines and polyline_sets live on self.document)
         self.current_polyline_start = None # last click point
         self.current_polyline_preview = None   # live endpoint while moving
         self.drawing_polyline = False      # are we in the middle of drawing?
-        self.polyline_sets = []            # list of finished polyline lists
 
 
-        # Room drawing state
-        self.rooms = []                # Finalized Room objects
+        # Room drawing state (finalized rooms live on self.document)
         self.current_room_points = []  # Manual room drawing points
         self.current_room_preview = None  # Live preview point (snapped)
         
         
-        self.doors = []  # List of door placements; each item is a tuple: (wall, door, position_ratio)
-        self.windows = []  # List of window placements; each item is a tuple: (wall, window, position_ratio)
-        self.texts = [] # List of Text objects
-        
-        # Dimension drawing state
-        self.dimensions = []  # List of finalized Dimension objects
+        # Dimension drawing state (finalized dimensions live on self.document)
         self.drawing_dimension = False  # Flag for dimension mode
         self.dimension_start = None  # First click point (x, y)
         self.dimension_end = None  # Second click point (x, y)
+        self.dimension_start_anchor = None  # Anchor the first click was bound to, if any
+        self.dimension_end_anchor = None  # Anchor the second click was bound to, if any
         self.dimension_offset_preview = None  # Mouse position for offset preview
 
+        # Associative dimensions follow the wall endpoints and opening edges they are bound to
+        self.dimension_links = DimensionLinks(
+            self.document, enabled=getattr(self.config, "ENABLE_DIMENSION_AUTO_UPDATE", True)
+        )
+
+        # Framing takeoff, memoized per wall and updated by delta as walls change
+        self.framing_takeoff = FramingTakeoff(self.document, self.config)
+        # Room finish takeoff (floor, wall and ceiling areas), memoized per room geometry
+        self.room_takeoff = RoomTakeoff(self.document, self.config)
+        # Drywall and sheathing panels per wall face, redone when walls or openings change
+        self.sheet_takeoff = SheetTakeoff(self.document, self.config)
+        # Stud-by-stud layout for the framing layer, re-laid per wall as walls change
+        self.framing_layout = FramingLayout(self.document, self.config)
+        # Prices takeoff lines against the shared catalog, re-pricing only what changed
+        self.cost_engine = CostEngine(get_price_catalog(self.config), self.config)
+
         # Alignment snapping (used for walls and rooms)
         self.alignment_candidate = None
         self.raw_current_end = None
 
         self.snap_type = "none"
         self.tool_mode = None  # "draw_walls" or "draw_rooms"
-        
-        # ID stack 
-        self.existing_ids = []
 
+        # Motion coalescing: latest pointer position, processed once per frame
+        self._pending_motion = None
+        self._motion_tick_id = None
+        
         # Undo/Redo stacks
         self.undo_stack = []
         self.redo_stack = []
+        # Document version the undo stack last matched (see edit_properties)
+        self._undo_version = None
         
         # Selection variables
         self.selected_items = []
         self.box_selecting = False
         self.box_select_start = (0, 0)
         self.box_select_end = (0, 0)
+        # Grid index answering box-selection queries, and the entries the box currently covers
+        self.box_query = BoxQueryIndex(self.document, self.config)
+        self.box_select_preview = []
         
         # Clipboard for copy/paste operations
         self.clipboard = []
 
+        # Laid-out text for canvas texts and dimension labels, reused across frames
+        self.text_layouts = TextLayoutCache(getattr(self.config, "TEXT_LAYOUT_CACHE_SIZE", 2048))
+        self._dimension_labels = {}
+        # Style-batched room/polyline paths, rebuilt when their collection version changes
+        self.path_cache = PathCache()
+        # Optional tiled, multithreaded rendering of committed rooms and walls
+        self.tile_renderer = None
+        if getattr(self.config, "TILED_RENDERING", False):
+            self.tile_renderer = TileRenderer(
+                tile_size=getattr(self.config, "TILE_SIZE", 256),
+                max_tiles=getattr(self.config, "TILE_CACHE_SIZE", 512),
+                workers=getattr(self.config, "TILE_RENDER_THREADS", 0),
+            )
+
+        # Device rectangles to repaint in the back buffer on the next frame
+        self.damage = DamageTracker()
+        self._back_buffer = None
+        self._back_buffer_size = None
+
+        # Performance HUD (frame/layer/snap timings), off unless SHOW_PERF_HUD is set
+        self.perf_stats = PerfStats()
+        self.show_perf_hud = False
+
 
         # Expose Wall and Room for mixins
         self.Wall = Wall
@@ -136,7 +219,14 @@ class CanvasArea(Gtk.DrawingArea,
             config=self.config,
             zoom=self.zoom
         )
+        if getattr(self.config, "SHOW_PERF_HUD", False):
+            self.set_perf_hud(True)
+
+        # Settings edited in a dialog or in settings.json apply without reopening the canvas
+        if hasattr(self.config, "add_listener"):
+            self.config.add_listener(self.on_settings_changed)
 
+    def _init_controllers(self):
         # Set up input controllers (delegated to the events mixin)
         scroll_controller = Gtk.EventControllerScroll.new(Gtk.EventControllerScrollFlags.NONE)
         scroll_controller.connect("scroll", self.on_scroll)
@@ -168,6 +258,16 @@ class CanvasArea(Gtk.DrawingArea,
         self.add_controller(right_click_gesture)
 
     
+    def queue_draw(self):
+        """Invalidate the whole canvas."""
+        self.damage.add_all()
+        super().queue_draw()
+
+    def queue_draw_area(self, x, y, width, height):
+        """Invalidate only a device rectangle; on_draw repaints just that part of the back buffer."""
+        self.damage.add(x, y, width, height)
+        super().queue_draw()
+
     def adjust_zoom(self, factor, center_x, center_y):
         # Calculate the new zoom level.
         new_zoom = self.zoom * factor
@@ -183,6 +283,22 @@ class CanvasArea(Gtk.DrawingArea,
         self.offset_y = 0
         self.queue_draw()
     
+    def set_perf_hud(self, enabled):
+        """Show or hide the performance HUD; snap timing is only hooked in while it is shown."""
+        self.show_perf_hud = enabled
+        if enabled:
+            self.perf_stats.attach_snap_timer(self.snap_manager)
+        else:
+            self.perf_stats.detach_snap_timer()
+        self.queue_draw()
+
+    def toggle_perf_hud(self):
+        self.set_perf_hud(not self.show_perf_hud)
+
+    def toggle_framing_layer(self):
+        """Show or hide the stud layout over the walls (redrawn by the settings listener)."""
+        self.config.update({"SHOW_FRAMING_LAYER": not getattr(self.config, "SHOW_FRAMING_LAYER", False)})
+    
     def delete_selected(self):
         """
         Delete the currently selected object(s) from the canvas.
@@ -191,72 +307,49 @@ class CanvasArea(Gtk.DrawingArea,
         if not self.selected_items:
             return
 
+        selection = self.selected_items
         room_vertices_to_delete = {}  # room_identifier -> list of indices
 
-        for item in list(self.selected_items):            
-            # Walls
-            if item["type"] == "wall":
-                selected_id = item["object"].identifier
-                for wall_set in self.wall_sets:
-                    for wall in wall_set:
-                        if wall.identifier == selected_id:
-                            wall_set.remove(wall)
-                    
-                    # If wall set is empty remove it
-                    if len(wall_set) == 0:
-                        self.wall_sets.remove(wall_set)
-            
-            # Rooms
-            if item["type"] == "vertex":
-                # item["object"] is (room, index)
-                room = item["object"][0]
-                index = item["object"][1]
-                if room.identifier not in room_vertices_to_delete:
-                    room_vertices_to_delete[room.identifier] = []
-                room_vertices_to_delete[room.identifier].append(index)
-                    
-            # Polylines: search and remove from polyline_sets (list of lists)
-            if item["type"] == "polyline":
-                # selection entries may come from click (object only) or box-select (object + identifier)
-                selected_obj = item.get("object")
-                selected_id = item.get("identifier") or getattr(selected_obj, "identifier", None)
-                # iterate over a copy so removals are safe
-                for poly_list in list(self.polyline_sets):
-                    found_index = None
-                    # find the exact segment by identity or by identifier
-                    for idx, segment in enumerate(poly_list):
-                        if segment is selected_obj or (selected_id is not None and getattr(segment, "identifier", None) == selected_id):
-                            found_index = idx
-                            break
-                    if found_index is not None:
-                        del poly_list[found_index]
-                    if len(poly_list) == 0:
-                        self.polyline_sets.remove(poly_list)
-            # Doors
-            if item["type"] == "door":
-                # item["object"] is (wall, door, ratio) tuple
-                door_tuple = item["object"]
-                if door_tuple in self.doors:
-                    self.doors.remove(door_tuple)
-            # Windows
-            if item["type"] == "window":
-                # item["object"] is (wall, window, ratio) tuple
-                window_tuple = item["object"]
-                if window_tuple in self.windows:
-                    self.windows.remove(window_tuple)
-
-            # Text
-            if item["type"] == "text":
-                text_obj = item["object"]
-                if text_obj in self.texts:
-                    self.texts.remove(text_obj)
-            
-            # Dimension
-            if item["type"] == "dimension":
-                dim_obj = item["object"]
-                if dim_obj in self.dimensions:
-                    self.dimensions.remove(dim_obj)
+        # Walls: matched by identity, or by identifier for selections that outlived an undo
+        selected_walls = selection.objects("wall")
+        if selected_walls:
+            wall_ids = {id(wall) for wall in selected_walls}
+            wall_identifiers = {wall.identifier for wall in selected_walls if wall.identifier}
+            for wall_set in self.wall_sets:
+                wall_set[:] = [wall for wall in wall_set
+                               if id(wall) not in wall_ids and wall.identifier not in wall_identifiers]
+            # If a wall set is empty remove it
+            self.wall_sets[:] = [wall_set for wall_set in self.wall_sets if wall_set]
 
+        # Rooms
+        for room, index in selection.objects("vertex"):
+            room_vertices_to_delete.setdefault(room.identifier, []).append(index)
+
+        # Polylines: selection entries may come from click (object only) or box-select (object + identifier)
+        polyline_items = selection.of_type("polyline")
+        if polyline_items:
+            segment_ids = {id(item.get("object")) for item in polyline_items}
+            segment_identifiers = {item.get("identifier") or getattr(item.get("object"), "identifier", None)
+                                   for item in polyline_items}
+            segment_identifiers.discard(None)
+            for poly_list in self.polyline_sets:
+                poly_list[:] = [segment for segment in poly_list
+                                if id(segment) not in segment_ids
+                                and getattr(segment, "identifier", None) not in segment_identifiers]
+            self.polyline_sets[:] = [poly_list for poly_list in self.polyline_sets if poly_list]
+
+        # Doors and windows: (wall, obj, ratio) tuples, matched by the opening itself
+        for name in ("door", "window"):
+            openings = {id(item[1]) for item in selection.objects(name)}
+            if openings:
+                collection = self.doors if name == "door" else self.windows
+                collection[:] = [item for item in collection if id(item[1]) not in openings]
+
+        # Texts and dimensions
+        for name, collection in (("text", self.texts), ("dimension", self.dimensions)):
+            selected = {id(obj) for obj in selection.objects(name)}
+            if selected:
+                collection[:] = [obj for obj in collection if id(obj) not in selected]
 
         # Process room vertex deletions
         for room_id, indices in room_vertices_to_delete.items():
@@ -282,9 +375,29 @@ class CanvasArea(Gtk.DrawingArea,
                     # Once room is removed, stop processing its vertices
                     break
 
+        self._notify_selection_changes(WALL_REMOVED)
         self.selected_items.clear()
         self.queue_draw()
         self.emit('selection-changed', self.selected_items)
+
+    def _notify_selection_changes(self, wall_event):
+        """Publish one change event per collection touched by the current selection."""
+        selection = self.selected_items
+        walls = selection.objects("wall")
+        openings = [item[1] for item in selection.objects("door") + selection.objects("window")]
+        rooms = [room for room, _ in selection.objects("vertex")]
+        polylines = selection.objects("polyline")
+        annotations = selection.objects("text") + selection.objects("dimension")
+        if walls:
+            self.document.notify(wall_event, walls)
+        if openings:
+            self.document.notify(OPENING_CHANGED, openings)
+        if rooms:
+            self.document.notify(ROOM_CHANGED, rooms)
+        if polylines:
+            self.document.notify(POLYLINE_CHANGED, polylines)
+        if annotations:
+            self.document.notify(ANNOTATION_CHANGED, annotations)
     
     def copy_selected(self):
         """Copy selected items to clipboard"""
@@ -457,6 +570,7 @@ class CanvasArea(Gtk.DrawingArea,
                     
                     rooms_to_paste.remove(id(room))  # Don't paste again
         
+        self._notify_selection_changes(WALL_ADDED)
         self.save_state()
         self.queue_draw()
         self.emit('selection-changed', self.selected_items)
@@ -1,8 +1,13 @@
 import math
 import cairo
-from gi.repository import Gtk, Pango, PangoCairo
+from gi.repository import Gtk, PangoCairo
 import Canvas.door_window_renderer as dwr
 import Canvas.wall_room_renderer as wr
+from Canvas.framing_renderer import draw_framing_layer
+from Canvas.perf_hud import draw_perf_hud
+from Canvas.lod import LOD_FULL, LOD_SIMPLE, LOD_SKIP, lod_thresholds, level_of_detail
+from Canvas.render_cache import record_paths
+from Canvas.damage import extent_of, union_rects
 
 class CanvasDrawMixin:
     # Helper: convert a model coordinate (in inches) to device coordinates.
@@ -50,6 +55,64 @@ class CanvasDrawMixin:
         return f"{feet}'-{inch:.0f}\""
 
     def on_draw(self, widget: Gtk.Widget, cr: "cairo.Context", width: int, height: int) -> None:
+        """
+        Draw callback for the canvas widget.
+
+        The scene is kept in a back buffer. Only the device rectangles invalidated with
+        queue_draw_area() since the last frame are redrawn into it (clipped to those
+        rectangles), a plain queue_draw() redraws it entirely, and the buffer is then copied
+        to the widget in one paint. With PARTIAL_REDRAW off the scene is drawn directly.
+        The performance HUD, when shown, is drawn on top of the copied scene.
+
+        Args:
+            widget: the Gtk widget being drawn.
+            cr: the Cairo context.
+            width: device width in pixels.
+            height: device height in pixels.
+
+        Returns:
+            None
+        """
+        perf = self.perf_stats if self.show_perf_hud else None
+        if perf:
+            perf.begin_frame()
+
+        if getattr(self.config, "PARTIAL_REDRAW", True):
+            self._draw_damaged(cr, width, height)
+        else:
+            self.damage.take()
+            self.draw_scene(cr, width, height)
+
+        if perf:
+            perf.end_frame()
+            draw_perf_hud(self, cr, width, height)
+
+    def _draw_damaged(self, cr, width, height):
+        """Bring the back buffer up to date for the damaged rectangles and paint it onto cr."""
+        scale = self.get_scale_factor()
+        if self._back_buffer is None or self._back_buffer_size != (width, height, scale):
+            # An image surface: GTK's draw target is a recording surface, and a similar
+            # one would keep every clipped redraw's commands for the widget's lifetime.
+            self._back_buffer = cairo.ImageSurface(cairo.FORMAT_ARGB32, width * scale, height * scale)
+            self._back_buffer.set_device_scale(scale, scale)
+            self._back_buffer_size = (width, height, scale)
+            self.damage.add_all()
+
+        rects = self.damage.take()
+        if rects is None or rects:
+            buffer_cr = cairo.Context(self._back_buffer)
+            if rects:
+                for x, y, w, h in rects:
+                    buffer_cr.rectangle(x, y, w, h)
+                buffer_cr.clip()
+            self.draw_scene(buffer_cr, width, height)
+
+        cr.save()
+        cr.set_source_surface(self._back_buffer, 0, 0)
+        cr.paint()
+        cr.restore()
+
+    def draw_scene(self, cr: "cairo.Context", width: int, height: int) -> None:
         """
         Render the entire canvas scene.
 
@@ -61,20 +124,22 @@ class CanvasDrawMixin:
         - Draw selection indicators and wall endpoint handles for editing.
         - Draw live measurements, alignment guide, and snap indicator.
         - Restore device coordinates and draw rulers if enabled.
+        - When the performance HUD is on, time each section.
 
         Notes:
         - After the translate/scale transform, drawing is done in model units (inches).
         - Line widths, dash lengths and handle sizes are adjusted for zoom.
         - Uses configuration values: PIXELS_PER_INCH, DEFAULT_WALL_WIDTH, SHOW_RULERS, SHOW_GRID.
         Args:
-            widget: the Gtk widget being drawn.
-            cr: the Cairo context.
+            cr: the Cairo context (possibly clipped to the damaged area).
             width: device width in pixels.
             height: device height in pixels.
 
         Returns:
             None
         """
+        perf = self.perf_stats if self.show_perf_hud else None
+
         # Clear background (device coordinates)
         cr.identity_matrix()
         cr.set_source_rgb(1, 1, 1)
@@ -90,24 +155,54 @@ class CanvasDrawMixin:
 
         # Draw grid, walls, rooms, etc. in model coordinates.
         self.draw_grid(cr)
+        if perf:
+            perf.lap("grid")
         
-        # Draw rooms first (under walls)
-        wr.draw_rooms(self, cr, zoom_transform)
-            
-        # Draw walls on top of rooms
-        wr.draw_walls(self, cr)
+        if self.tile_renderer is not None:
+            # Committed rooms and walls come from cached tiles rasterized on worker threads;
+            # only the in-progress room and wall chain are drawn here.
+            self.tile_renderer.composite(self, cr, width, height)
+            wr.draw_room_preview(self, cr, zoom_transform)
+            if perf:
+                perf.lap("rooms")
+            wr.draw_active_wall_chain(self, cr)
+            if perf:
+                perf.lap("walls")
+        else:
+            # Draw rooms first (under walls)
+            wr.draw_rooms(self, cr, zoom_transform)
+            if perf:
+                perf.lap("rooms")
+                
+            # Draw walls on top of rooms
+            wr.draw_walls(self, cr)
+            if perf:
+                perf.lap("walls")
+
+        if getattr(self.config, "SHOW_FRAMING_LAYER", False):
+            draw_framing_layer(self, cr, zoom_transform)
+            if perf:
+                perf.lap("framing")
 
         # Draw doors
         dwr.draw_doors(self, cr, pixels_per_inch)
+        if perf:
+            perf.lap("doors")
         
         # Draw windows
         dwr.draw_windows(self, cr, pixels_per_inch)
+        if perf:
+            perf.lap("windows")
 
         # Draw texts
         self.draw_texts(cr)
+        if perf:
+            perf.lap("texts")
         
         # Draw dimensions
         self.draw_dimensions(cr)
+        if perf:
+            perf.lap("dimensions")
         
         # Draw text preview
         if self.tool_mode == "add_text" and hasattr(self, "current_text_preview"):
@@ -120,35 +215,19 @@ class CanvasDrawMixin:
              cr.set_line_width(1.0 / zoom_transform)
              cr.stroke()
         
-        # Draw finished polylines
-        cr.save()
-        cr.set_source_rgb(0, 0, 0)
-        cr.set_line_width(1.0 / self.zoom)
-        for poly_list in self.polyline_sets:
-            for pl in poly_list:
-                if pl.style == "dashed":
-                    cr.set_dash([4/self.zoom, 4/self.zoom])
-                else:
-                    cr.set_dash([])
-                cr.move_to(pl.start[0], pl.start[1])
-                cr.line_to(pl.end[0],   pl.end[1])
-                cr.stroke()
-        cr.restore()
+        # Draw finished polylines (one cached path per dash style)
+        finished_paths = self.path_cache.get(
+            "polylines", self.document.version("polylines"), cr,
+            lambda: self._group_polylines_by_style(pl for poly_list in self.polyline_sets for pl in poly_list),
+            self._trace_polyline
+        )
+        self._stroke_polyline_paths(cr, finished_paths)
 
         # Draw in-progress (fixed) segments
         if self.polylines:
-            cr.save()
-            cr.set_source_rgb(0, 0, 0)
-            cr.set_line_width(1.0 / self.zoom)
-            for pl in self.polylines:
-                if pl.style == "dashed":
-                    cr.set_dash([4/self.zoom, 4/self.zoom])
-                else:
-                    cr.set_dash([])
-                cr.move_to(pl.start[0], pl.start[1])
-                cr.line_to(pl.end[0],   pl.end[1])
-                cr.stroke()
-            cr.restore()
+            self._stroke_polyline_paths(cr, record_paths(
+                cr, self._group_polylines_by_style(self.polylines), self._trace_polyline
+            ))
 
         # Draw the live “rubber-band” segment
         if self.tool_mode == "add_polyline" and self.drawing_polyline and self.current_polyline_preview:
@@ -193,6 +272,9 @@ class CanvasDrawMixin:
             cr.rectangle(x1, y1, width, height)
             cr.stroke()
             cr.restore()
+
+            if self.box_select_preview:
+                self._draw_box_select_preview(cr, self.box_select_preview, zoom_transform)
         
         # Draw selection indicators.
         if hasattr(self, "selected_items"):
@@ -201,30 +283,10 @@ class CanvasDrawMixin:
             handle_radius = (self.handle_radius - 2) / (self.zoom * pixels_per_inch)
             
             # We’re still in model coordinates here.
+            self._draw_selected_walls(cr, self.selected_items.objects("wall"), handle_radius)
+
             for item in self.selected_items:
-                if item["type"] == "wall":
-                    # print("Wall selected")
-                    wall = item["object"]
-                    
-                    for pt, pt_name in [(wall.start, "start"), (wall.end, "end")]:
-                        cr.set_source_rgba(1, 1, 0, 1.0)  # Yellow handles
-                        cr.arc(pt[0], pt[1], handle_radius, 0, 2 * 3.14159)
-                        cr.fill()
-                        # Draw a border
-                        cr.set_source_rgba(0, 0, 0, 1.0)
-                        cr.arc(pt[0], pt[1], handle_radius, 0, 2 * 3.14159)
-                        cr.set_line_width(1.0 / self.zoom)
-                        cr.stroke()
-                    
-                    # Set a red color with some opacity.
-                    cr.set_source_rgba(1, 0, 0, 1.0) # Opaque red.
-                    # Set line width same as wall width for selection indicator.
-                    cr.set_line_width(wall.width / self.zoom)
-                    # Draw the wall from start to end.
-                    cr.move_to(wall.start[0], wall.start[1])
-                    cr.line_to(wall.end[0], wall.end[1])
-                    cr.stroke()
-                elif item["type"] == "vertex":
+                if item["type"] == "vertex":
                     # print("Vertex selected")
                     room, idx = item["object"]
                     pt = room.points[idx]
@@ -326,6 +388,175 @@ class CanvasDrawMixin:
         if self.config.SHOW_RULERS:
             self.draw_rulers(cr, width, height, pixels_per_inch)
 
+        if perf:
+            # Polylines, previews, selection, guides and rulers
+            perf.lap("overlays")
+
+    # ───── damage extents (device rectangles for queue_draw_area) ─────
+    def interaction_extent(self):
+        """
+        Device rectangle covering the transient drawing previews: the rubber-band wall with its
+        live measurement, alignment guide and snap marker, and the room, polyline, dimension and
+        text-box previews. Returns None when nothing is being previewed.
+        """
+        pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        to_device = self.model_to_device
+        points = []
+        if self.drawing_wall and self.current_wall:
+            start = to_device(*self.current_wall.start, pixels_per_inch)
+            end = to_device(*self.current_wall.end, pixels_per_inch)
+            # A mitered join can reach miter limit x half the stroke width past the vertex.
+            pad = self.current_wall.width * pixels_per_inch * wr.WALL_MITER_LIMIT / 2 + 4
+            points += [(*start, pad), (*end, pad)]
+            # Live measurement label beside the midpoint and the snap marker with its label
+            points.append(((start[0] + end[0]) / 2, (start[1] + end[1]) / 2, 180))
+            points.append((*end, 100))
+            if self.alignment_candidate and self.raw_current_end:
+                points.append((*to_device(*self.alignment_candidate, pixels_per_inch), 4))
+                points.append((*to_device(*self.raw_current_end, pixels_per_inch), 4))
+        if self.current_room_points:
+            points.append((*to_device(*self.current_room_points[-1], pixels_per_inch), 4))
+            if self.current_room_preview:
+                points.append((*to_device(*self.current_room_preview, pixels_per_inch), 4))
+        if self.drawing_polyline and self.current_polyline_start and self.current_polyline_preview:
+            points.append((*to_device(*self.current_polyline_start, pixels_per_inch), 4))
+            points.append((*to_device(*self.current_polyline_preview, pixels_per_inch), 4))
+        if self.drawing_dimension and self.dimension_start:
+            # Preview line, extension lines and the label
+            for pt in (self.dimension_start, self.dimension_end, self.dimension_offset_preview,
+                       getattr(self, "_last_mouse_pos", None)):
+                if pt:
+                    points.append((*to_device(*pt, pixels_per_inch), 120))
+        if self.tool_mode == "add_text" and getattr(self, "current_text_preview", None):
+            x, y, w, h = self.current_text_preview
+            points.append((*to_device(x, y, pixels_per_inch), 2))
+            points.append((*to_device(x + w, y + h, pixels_per_inch), 2))
+        return extent_of(points)
+
+    def opening_extent(self, wall, obj, ratio):
+        """Device rectangle covering a door/window on a wall: opening, swing, selection and label."""
+        if wall is None:
+            return None
+        pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        T = self.zoom * pixels_per_inch
+        A = wall.start
+        B = wall.end
+        H = (A[0] + ratio * (B[0] - A[0]), A[1] + ratio * (B[1] - A[1]))
+        # The swing arc reaches about 1.12 leaf widths from the centre; the label is ~12px text.
+        pad = 1.2 * (obj.width + self.config.DEFAULT_WALL_WIDTH) * T + 90
+        return extent_of([(*self.model_to_device(H[0], H[1], pixels_per_inch), pad)])
+
+    def dimension_extent(self, dimension):
+        """Device rectangle covering a dimension: extension and dimension lines, arrows and label."""
+        pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        to_device = self.model_to_device
+        start, end = dimension.start, dimension.end
+        length = math.dist(start, end)
+        if length == 0:
+            return extent_of([(*to_device(*start, pixels_per_inch), 4)])
+        px = -(end[1] - start[1]) / length
+        py = (end[0] - start[0]) / length
+        reach = dimension.offset + 2.0   # extension lines overhang the dimension line by 2"
+        arrow_pad = 3.0 * self.zoom * pixels_per_inch + 4
+        layout, w, h = self.text_layouts.get_layout(
+            self._dimension_label(length), "Sans", getattr(dimension, "text_size", 12.0), zoom=self.zoom,
+            absolute_size=True, owner=dimension
+        )
+        mid = ((start[0] + end[0]) / 2 + dimension.offset * px, (start[1] + end[1]) / 2 + dimension.offset * py)
+        return extent_of([
+            (*to_device(*start, pixels_per_inch), 4),
+            (*to_device(*end, pixels_per_inch), 4),
+            (*to_device(start[0] + reach * px, start[1] + reach * py, pixels_per_inch), arrow_pad),
+            (*to_device(end[0] + reach * px, end[1] + reach * py, pixels_per_inch), arrow_pad),
+            (*to_device(*mid, pixels_per_inch), math.hypot(w / 2, h) + 4),
+        ])
+
+    def text_extent(self, text):
+        """Device rectangle covering a text at any rotation, including its selection frame and handle."""
+        pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        layout, w, h = self.text_layouts.get_text_layout(text, self.zoom)
+        radius = math.hypot(w, h) * self.zoom + 8
+        return extent_of([(*self.model_to_device(text.x, text.y, pixels_per_inch), radius)])
+
+    def box_select_extent(self):
+        pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        return extent_of([
+            (*self.model_to_device(*self.box_select_start, pixels_per_inch), 2),
+            (*self.model_to_device(*self.box_select_end, pixels_per_inch), 2),
+        ])
+
+    def box_preview_extent(self, entries):
+        """Device rectangle covering the preview highlight of box query entries."""
+        pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        points = []
+        for entry in entries:
+            x1, y1, x2, y2 = entry[3]
+            points.append((*self.model_to_device(x1, y1, pixels_per_inch), 4))
+            points.append((*self.model_to_device(x2, y2, pixels_per_inch), 4))
+        return extent_of(points)
+
+    def _draw_box_select_preview(self, cr, entries, zoom_transform):
+        """Highlight what the box will select: segments as one stroke, areas and vertices as one fill."""
+        cr.save()
+        cr.set_dash([])
+        cr.set_source_rgba(0, 0.4, 1, 0.35)
+        cr.set_line_width(3.0 / zoom_transform)
+        cr.set_line_cap(cairo.LINE_CAP_ROUND)
+        cr.new_path()
+        for entry in entries:
+            segment = entry[4]
+            if segment is not None:
+                cr.move_to(segment[0], segment[1])
+                cr.line_to(segment[2], segment[3])
+        cr.stroke()
+        dot_radius = 4.0 / zoom_transform
+        for entry in entries:
+            if entry[4] is not None:
+                continue
+            x1, y1, x2, y2 = entry[3]
+            if entry[1] == "vertex":
+                cr.new_sub_path()
+                cr.arc(x1, y1, dot_radius, 0, 2 * math.pi)
+            else:
+                cr.rectangle(x1, y1, x2 - x1, y2 - y1)
+        cr.fill()
+        cr.restore()
+
+    def queue_draw_extents(self, *rects):
+        """Invalidate the union of the given device rectangles (None entries are ignored)."""
+        rect = None
+        for other in rects:
+            rect = union_rects(rect, other)
+        if rect is not None:
+            self.queue_draw_area(*rect)
+
+    @staticmethod
+    def _group_polylines_by_style(segments):
+        groups = {}
+        for pl in segments:
+            groups.setdefault("dashed" if pl.style == "dashed" else "solid", []).append(pl)
+        return groups
+
+    @staticmethod
+    def _trace_polyline(cr, pl):
+        cr.move_to(pl.start[0], pl.start[1])
+        cr.line_to(pl.end[0], pl.end[1])
+
+    def _stroke_polyline_paths(self, cr, paths):
+        """Stroke pre-built polyline paths, one stroke per dash style."""
+        cr.save()
+        cr.set_source_rgb(0, 0, 0)
+        cr.set_line_width(1.0 / self.zoom)
+        for style, path in paths.items():
+            if style == "dashed":
+                cr.set_dash([4/self.zoom, 4/self.zoom])
+            else:
+                cr.set_dash([])
+            cr.new_path()
+            cr.append_path(path)
+            cr.stroke()
+        cr.restore()
+
     def draw_grid(self, cr):
         if not self.config.SHOW_GRID:
             return
@@ -362,15 +593,44 @@ class CanvasDrawMixin:
             y += major_spacing
         cr.stroke()
 
+    def _draw_selected_walls(self, cr, walls, handle_radius):
+        """
+        Highlight selected walls in red with yellow endpoint handles.
+
+        Batched so that selecting everything stays cheap: one stroke per distinct wall
+        width for the highlights, then a single fill and stroke for all handles.
+        """
+        if not walls:
+            return
+        by_width = {}
+        for wall in walls:
+            by_width.setdefault(wall.width, []).append(wall)
+        cr.set_source_rgba(1, 0, 0, 1.0) # Opaque red.
+        for width, group in by_width.items():
+            # Line width same as wall width for the selection indicator.
+            cr.set_line_width(width / self.zoom)
+            for wall in group:
+                cr.move_to(wall.start[0], wall.start[1])
+                cr.line_to(wall.end[0], wall.end[1])
+            cr.stroke()
+
+        for wall in walls:
+            for pt in (wall.start, wall.end):
+                cr.new_sub_path()
+                cr.arc(pt[0], pt[1], handle_radius, 0, 2 * math.pi)
+        cr.set_source_rgba(1, 1, 0, 1.0)  # Yellow handles
+        cr.fill_preserve()
+        cr.set_source_rgba(0, 0, 0, 1.0)  # with a black border
+        cr.set_line_width(1.0 / self.zoom)
+        cr.stroke()
+
     def draw_live_measurements(self, cr, pixels_per_inch):
         walls_to_label = []
         if self.drawing_wall and self.current_wall:
             walls_to_label.append(self.current_wall)
         
         if hasattr(self, "selected_items"):
-            for item in self.selected_items:
-                if item.get("type") == "wall":
-                    walls_to_label.append(item["object"])
+            walls_to_label.extend(self.selected_items.objects("wall"))
 
         for wall in walls_to_label:
             start = wall.start
@@ -526,10 +786,16 @@ class CanvasDrawMixin:
 
     def draw_texts(self, cr):
         pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
+        text_lod = lod_thresholds(self.config, "texts")
         
         for text in self.texts:
             # Check if selected to draw frame/handles
-            is_selected = any(item["type"] == "text" and item["object"] == text for item in self.selected_items)
+            is_selected = self.selected_items.has("text", text)
+
+            # Level of detail from the on-screen font size; selected texts are always drawn in full
+            lod = LOD_FULL if is_selected else level_of_detail(text.font_size * self.zoom, text_lod)
+            if lod == LOD_SKIP:
+                continue
             
             # Using model space drawing for positioning, but text rendering often needs careful scaling
             # Strategy: Render text at projected device location for sharpness, scaled by zoom
@@ -548,34 +814,26 @@ class CanvasDrawMixin:
             cr.rotate(rotation_radians)
             
             cr.scale(self.zoom, self.zoom) # Scale text with zoom
+
+            if lod == LOD_SIMPLE:
+                # Greeked text: a bar roughly the size of the text, without laying it out
+                color = getattr(text, 'color', (0.0, 0.0, 0.0))
+                cr.set_source_rgba(color[0], color[1], color[2], 0.35)
+                cr.rectangle(0, text.font_size * 0.25, 0.55 * text.font_size * len(text.content), text.font_size)
+                cr.fill()
+                cr.restore()
+                continue
             
-            layout = PangoCairo.create_layout(cr)
-            layout.set_text(text.content, -1)
-            desc = Pango.FontDescription(f"{text.font_family} {text.font_size}")
-            if text.bold:
-                desc.set_weight(Pango.Weight.BOLD)
-            if text.italic:
-                desc.set_style(Pango.Style.ITALIC)
-            layout.set_font_description(desc)
-            
-            attr_list = Pango.AttrList()
-            if text.underline:
-                attr = Pango.attr_underline_new(Pango.Underline.SINGLE)
-                attr_list.insert(attr)
-            layout.set_attributes(attr_list)
+            # Laid-out text is reused across frames until content, style or zoom bucket changes
+            layout, w, h = self.text_layouts.get_text_layout(text, self.zoom)
         
             # Use text color if available, otherwise default to black
             color = getattr(text, 'color', (0.0, 0.0, 0.0))
             cr.set_source_rgb(*color)
+            cr.move_to(0, 0)
             PangoCairo.show_layout(cr, layout)
             
-            # Measure layout for selection box
             if is_selected:
-                # Get logical extents
-                ink_rect, logical_rect = layout.get_extents()
-                w = logical_rect.width / Pango.SCALE
-                h = logical_rect.height / Pango.SCALE
-                
                 # Draw selection border
                 cr.set_source_rgb(0, 0, 1)
                 cr.set_line_width(1.0)
@@ -600,9 +858,14 @@ class CanvasDrawMixin:
         """Draw all dimension objects with extension lines, dimension lines, arrows, and measurement text."""
         pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
         
-        # Draw finalized dimensions
+        # Draw finalized dimensions, with level of detail from their on-screen length
+        dimension_lod = lod_thresholds(self.config, "dimensions")
+        zoom_transform = self.zoom * pixels_per_inch
         for dimension in self.dimensions:
-            self._draw_single_dimension(cr, dimension, pixels_per_inch, is_preview=False)
+            detail = level_of_detail(math.dist(dimension.start, dimension.end) * zoom_transform, dimension_lod)
+            if detail == LOD_SKIP:
+                continue
+            self._draw_single_dimension(cr, dimension, pixels_per_inch, is_preview=False, detail=detail)
         
         # Draw dimension preview during creation
         if self.drawing_dimension and self.dimension_start:
@@ -634,8 +897,12 @@ class CanvasDrawMixin:
                     cr.stroke()
                     cr.restore()
     
-    def _draw_single_dimension(self, cr, dimension, pixels_per_inch, is_preview=False):
-        """Draw a single dimension with all its components."""
+    def _draw_single_dimension(self, cr, dimension, pixels_per_inch, is_preview=False, detail=LOD_FULL):
+        """
+        Draw a single dimension with all its components.
+
+        With detail=LOD_SIMPLE only the extension and dimension lines are drawn (no arrows or label).
+        """
         start = dimension.start
         end = dimension.end
         offset = dimension.offset
@@ -663,10 +930,10 @@ class CanvasDrawMixin:
         cr.save()
         
         # Check if this dimension is selected
-        is_selected = any(
-            item.get("type") == "dimension" and item.get("object") is dimension
-            for item in self.selected_items
-        )
+        is_selected = self.selected_items.has("dimension", dimension)
+        
+        if is_selected:
+            detail = LOD_FULL
         
         # Set color
         color = getattr(dimension, 'color', (0.0, 0.0, 0.0))
@@ -711,6 +978,11 @@ class CanvasDrawMixin:
         cr.line_to(dim_end[0], dim_end[1])
         cr.stroke()
         
+        # Simplified dimensions stop at the lines
+        if detail != LOD_FULL:
+            cr.restore()
+            return
+        
         # Draw arrows if enabled
         show_arrows = getattr(dimension, 'show_arrows', True)
         if show_arrows:
@@ -757,8 +1029,8 @@ class CanvasDrawMixin:
         mid_x = (dim_start[0] + dim_end[0]) / 2
         mid_y = (dim_start[1] + dim_end[1]) / 2
         
-        # Format measurement
-        measurement_str = self.converter.format_measurement(length, use_fraction=False)
+        # Format measurement (formatted strings are cached per length)
+        measurement_str = self._dimension_label(length)
         
         # Calculate text angle (parallel to dimension line)
         text_angle = math.atan2(dy, dx)
@@ -767,22 +1039,22 @@ class CanvasDrawMixin:
         if text_angle > math.pi / 2 or text_angle < -math.pi / 2:
             text_angle += math.pi
         
+        # The label is drawn in device pixels from the shared layout cache
+        text_size = getattr(dimension, 'text_size', 12.0)
+        layout, text_width, text_height = self.text_layouts.get_layout(
+            measurement_str, "Sans", text_size, zoom=self.zoom,
+            absolute_size=True, owner=None if is_preview else dimension
+        )
+        device_mid_x, device_mid_y = self.model_to_device(mid_x, mid_y, pixels_per_inch)
+        
         cr.save()
-        cr.translate(mid_x, mid_y)
+        cr.identity_matrix()
+        cr.set_dash([])
+        cr.translate(device_mid_x, device_mid_y)
         cr.rotate(text_angle)
         
-        # Set font
-        text_size = getattr(dimension, 'text_size', 12.0) / (self.zoom * pixels_per_inch)
-        cr.set_font_size(text_size)
-        cr.select_font_face("Sans", 0, 0)
-        
-        # Get text extents for background
-        extents = cr.text_extents(measurement_str)
-        text_width = extents.width
-        text_height = extents.height
-        
         # Draw white background for text
-        padding = 2.0 / (self.zoom * pixels_per_inch)
+        padding = 2.0
         cr.set_source_rgb(1, 1, 1)
         cr.rectangle(
             -text_width / 2 - padding,
@@ -797,8 +1069,19 @@ class CanvasDrawMixin:
             cr.set_source_rgba(color[0], color[1], color[2], 0.5)
         else:
             cr.set_source_rgb(*color)
-        cr.move_to(-text_width / 2, 0)
-        cr.show_text(measurement_str)
+        cr.move_to(-text_width / 2, -text_height)
+        PangoCairo.show_layout(cr, layout)
         
         cr.restore()
-        cr.restore()
\ No newline at end of file
+        cr.restore()
+
+    def _dimension_label(self, length):
+        """Return the formatted measurement for a dimension length, memoized per length."""
+        labels = self._dimension_labels
+        label = labels.get(length)
+        if label is None:
+            if len(labels) > self.text_layouts.max_entries:
+                labels.clear()
+            label = self.converter.format_measurement(length, use_fraction=False)
+            labels[length] = label
+        return label
\ No newline at end of file
@@ -73,42 +73,40 @@ class CanvasEventsMixin:
         if not hasattr(self, "handle_radius"):
             self.handle_radius = 10
 
-        for item in self.selected_items:
-            if item.get("type") == "wall":
-                wall = item.get("object")
-                for handle_name, pt in [("start", wall.start), ("end", wall.end)]:
-                    pt_widget = ((pt[0] * T) + self.offset_x, (pt[1] * T) + self.offset_y)
-                    dx = x - pt_widget[0]
-                    dy = y - pt_widget[1]
-                    if math.hypot(dx, dy) < self.handle_radius:
-                        # Begin editing this wall endpoint.
-                        self.editing_wall = wall
-                        self.editing_handle = handle_name
-
-                        # Original joint position in model space
-                        self.joint_drag_origin = pt
-
-                        # Find ALL endpoints that share this joint (within tolerance)
-                        connected = []
-                        tol = getattr(self.config, "JOINT_SNAP_TOLERANCE", 0.25)
-                        for wall_set in self.wall_sets:
-                            for w in wall_set:
-                                if self._points_close(w.start, pt, tol):
-                                    connected.append((w, "start"))
-                                if self._points_close(w.end, pt, tol):
-                                    connected.append((w, "end"))
-                        self.connected_endpoints = connected
-
-                        # You can still keep this for box-select if you like, but it's
-                        # no longer used for endpoint movement math:
-                        self.box_select_start = pt
-
-                        # Snapshot state for undo.
-                        try:
-                            self.save_state()
-                        except Exception:
-                            pass
-                        return
+        for wall in self.selected_items.objects("wall"):
+            for handle_name, pt in [("start", wall.start), ("end", wall.end)]:
+                pt_widget = ((pt[0] * T) + self.offset_x, (pt[1] * T) + self.offset_y)
+                dx = x - pt_widget[0]
+                dy = y - pt_widget[1]
+                if math.hypot(dx, dy) < self.handle_radius:
+                    # Begin editing this wall endpoint.
+                    self.editing_wall = wall
+                    self.editing_handle = handle_name
+
+                    # Original joint position in model space
+                    self.joint_drag_origin = pt
+
+                    # Find ALL endpoints that share this joint (within tolerance)
+                    connected = []
+                    tol = getattr(self.config, "JOINT_SNAP_TOLERANCE", 0.25)
+                    for wall_set in self.wall_sets:
+                        for w in wall_set:
+                            if self._points_close(w.start, pt, tol):
+                                connected.append((w, "start"))
+                            if self._points_close(w.end, pt, tol):
+                                connected.append((w, "end"))
+                    self.connected_endpoints = connected
+
+                    # You can still keep this for box-select if you like, but it's
+                    # no longer used for endpoint movement math:
+                    self.box_select_start = pt
+
+                    # Snapshot state for undo.
+                    try:
+                        self.save_state()
+                    except Exception:
+                        pass
+                    return
         
         # If no handle was pressed, proceed with normal click selection
         self._handle_pointer_click(gesture, n_press, x, y)
@@ -116,65 +114,51 @@ class CanvasEventsMixin:
         # Check if we clicked on a text object's rotation handle or for potential dragging
         # (Since _handle_pointer_click should have selected it)
         if hasattr(self, "selected_items"):
-             for item in self.selected_items:
-                 if item["type"] == "text":
-                     text = item["object"]
-                     # Check if click was on rotation handle (small circle at top-right)
-                     # First calculate handle position in device coordinates
-                     from gi.repository import Pango, PangoCairo
-                     import cairo
-                     
-                     # Create temporary surface to measure text
-                     temp_surface = cairo.ImageSurface(cairo.Format.ARGB32, 1, 1)
-                     temp_cr = cairo.Context(temp_surface)
-                     layout = PangoCairo.create_layout(temp_cr)
-                     layout.set_text(text.content, -1)
-                     desc = Pango.FontDescription(f"{text.font_family} {text.font_size}")
-                     if text.bold:
-                         desc.set_weight(Pango.Weight.BOLD)
-                     if text.italic:
-                         desc.set_style(Pango.Style.ITALIC)
-                     layout.set_font_description(desc)
-                     ink_rect, logical_rect = layout.get_extents()
-                     text_width = (logical_rect.width / Pango.SCALE) * self.zoom
-                     
-                     # Get text position in device coords
-                     text_x_dev, text_y_dev = self.model_to_device(text.x, text.y, pixels_per_inch)
-                     
-                     # Rotation handle is at top-right of text, rotated with text
-                     rotation_radians = math.radians(text.rotation)
-                     # Handle position relative to text origin
-                     handle_rel_x = text_width * math.cos(rotation_radians)
-                     handle_rel_y = text_width * math.sin(rotation_radians)
-                     handle_x = text_x_dev + handle_rel_x
-                     handle_y = text_y_dev + handle_rel_y
-                     
-                     handle_radius = 8.0  # Slightly larger hit area than visual radius
-                     dx = x - handle_x
-                     dy = y - handle_y
-                     
-                     if math.hypot(dx, dy) < handle_radius:
-                         # User clicked on rotation handle, start rotation
-                         self.rotating_text = text
-                         self.rotation_start_angle = text.rotation
-                         self.rotation_center = (text_x_dev, text_y_dev)
-                         # Calculate initial angle from center to mouse
-                         self.rotation_start_mouse_angle = math.degrees(math.atan2(y - text_y_dev, x - text_x_dev))
-                         return
-                     
-                     # Otherwise, start moving the text
-                     self.moving_text = text
-                     self.moving_text_start_pos = (self.moving_text.x, self.moving_text.y)
+             for item in self.selected_items.of_type("text"):
+                 text = item["object"]
+                 # Check if click was on rotation handle (small circle at top-right)
+                 # First calculate handle position in device coordinates
+                 # Measure the text with the same cached layout the renderer uses
+                 layout, logical_width, _ = self.text_layouts.get_text_layout(text, self.zoom)
+                 text_width = logical_width * self.zoom
+                 
+                 # Get text position in device coords
+                 text_x_dev, text_y_dev = self.model_to_device(text.x, text.y, pixels_per_inch)
+                 
+                 # Rotation handle is at top-right of text, rotated with text
+                 rotation_radians = math.radians(text.rotation)
+                 # Handle position relative to text origin
+                 handle_rel_x = text_width * math.cos(rotation_radians)
+                 handle_rel_y = text_width * math.sin(rotation_radians)
+                 handle_x = text_x_dev + handle_rel_x
+                 handle_y = text_y_dev + handle_rel_y
+                 
+                 handle_radius = 8.0  # Slightly larger hit area than visual radius
+                 dx = x - handle_x
+                 dy = y - handle_y
+                 
+                 if math.hypot(dx, dy) < handle_radius:
+                     # User clicked on rotation handle, start rotation
+                     self.rotating_text = text
+                     self.rotation_start_angle = text.rotation
+                     self.rotation_center = (text_x_dev, text_y_dev)
+                     # Calculate initial angle from center to mouse
+                     self.rotation_start_mouse_angle = math.degrees(math.atan2(y - text_y_dev, x - text_x_dev))
                      return
+                 
+                 # Otherwise, start moving the text
+                 self.moving_text = text
+                 self.moving_text_start_pos = (self.moving_text.x, self.moving_text.y)
+                 return
 
 
     def on_motion(self, controller: Gtk.EventControllerMotion, x: float, y: float) -> None:
         """
         Handle pointer motion events on the canvas.
 
-        This method is called when the pointer moves over the canvas. It updates the mouse coordinates,
-        converts them to model space, and provides live previews for wall, polyline, and room drawing
-        with snapping and alignment assistance.
+        This method only records the latest pointer position. Snapping and the live previews
+        are computed at most once per frame by _on_motion_tick, which is scheduled on the
+        widget's frame clock, so high-rate pointing devices cannot queue up snap work.
 
         Args:
             controller (Gtk.EventControllerMotion): The motion event controller.
@@ -186,23 +170,53 @@ class CanvasEventsMixin:
         """
         self.mouse_x = x
         self.mouse_y = y
-        
+        self._pending_motion = (x, y)
+        if not getattr(self, "_motion_tick_id", None):
+            self._motion_tick_id = self.add_tick_callback(self._on_motion_tick)
+
+    def _on_motion_tick(self, widget: Gtk.Widget, frame_clock) -> bool:
+        """Frame-clock callback: process the most recent pointer position, then unschedule."""
+        self._motion_tick_id = None
+        self.flush_pending_motion()
+        return False  # GLib.SOURCE_REMOVE; the next motion event schedules a new tick
+
+    def flush_pending_motion(self) -> None:
+        """Run the snapping/preview update for the latest recorded pointer position, if any."""
+        pending = getattr(self, "_pending_motion", None)
+        if pending is None:
+            return
+        self._pending_motion = None
+        self._process_motion(*pending)
+
+    def _process_motion(self, x: float, y: float) -> None:
+        """
+        Update live previews for the pointer at (x, y).
+
+        Converts the position to model space and provides live previews for dimension, wall,
+        polyline, and room drawing with snapping and alignment assistance. Only the device
+        area covered by the previews before and after the update is invalidated.
+
+        Args:
+            x (float): The x-coordinate of the pointer in widget coordinates.
+            y (float): The y-coordinate of the pointer in widget coordinates.
+
+        Returns:
+            None
+        """
         pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
         canvas_x, canvas_y = self.device_to_model(x, y, pixels_per_inch)
         raw_point = (canvas_x, canvas_y)
+        # Only the previews change here: redraw their old and new extents, not the whole plan
+        damaged_before = self.interaction_extent()
         
         # Store last mouse position for dimension preview
         self._last_mouse_pos = (canvas_x, canvas_y)
         
         # Update dimension preview if in dimension drawing mode
-        if self.tool_mode == "add_dimension" and self.drawing_dimension:
-            if self.dimension_end:
-                # After second click - update offset preview
-                self.dimension_offset_preview = (canvas_x, canvas_y)
-                self.queue_draw()
-            # After first click, preview line is drawn using _last_mouse_pos
-            elif self.dimension_start:
-                self.queue_draw()
+        # (after the first click the preview line is drawn using _last_mouse_pos)
+        if self.tool_mode == "add_dimension" and self.drawing_dimension and self.dimension_end:
+            # After second click - update offset preview
+            self.dimension_offset_preview = (canvas_x, canvas_y)
 
         if self.tool_mode == "draw_walls" and self.drawing_wall and self.current_wall:
             last_wall = self.walls[-1] if self.walls else None
@@ -223,7 +237,6 @@ class CanvasEventsMixin:
             self.alignment_candidate = candidate
             
             self.current_wall.end = (snapped_x, snapped_y)
-            self.queue_draw()
         
         # Live preview for polylines
         if self.tool_mode == "add_polyline" and self.drawing_polyline:
@@ -241,7 +254,6 @@ class CanvasEventsMixin:
             )
             ax, ay, _ = self._apply_alignment_snapping(sx, sy)
             self.current_polyline_preview = (ax, ay)
-            self.queue_draw()
 
         elif self.tool_mode == "draw_rooms":
             base_x = self.current_room_points[-1][0] if self.current_room_points else canvas_x
@@ -261,8 +273,8 @@ class CanvasEventsMixin:
             snapped_x, snapped_y = aligned_x, aligned_y
             
             self.current_room_preview = (snapped_x, snapped_y)
-            self.queue_draw()
-            
+
+        self.queue_draw_extents(damaged_before, self.interaction_extent())
 
     def on_zoom_changed(self, controller: Gtk.GestureZoom, scale: float) -> None:
         """
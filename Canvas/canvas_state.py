@@ -1,5 +1,48 @@
 import copy
 
+from document import BULK_RELOAD, WALL_CHANGED, OPENING_CHANGED, ANNOTATION_CHANGED
+
+# Collections a PropertyEdit can address, and the change event an edit of each publishes
+_EDIT_EVENTS = {
+    "wall_sets": WALL_CHANGED,
+    "walls": WALL_CHANGED,
+    "doors": OPENING_CHANGED,
+    "windows": OPENING_CHANGED,
+    "texts": ANNOTATION_CHANGED,
+    "dimensions": ANNOTATION_CHANGED,
+}
+
+
+class PropertyEdit:
+    """
+    Compact undo record for setting the same properties on many objects.
+
+    Objects are addressed by their position in the document collections, e.g.
+    ("wall_sets", set_index, wall_index) or ("doors", index), so the record stays
+    valid after undo/redo has replaced the objects with restored copies. Only the
+    old values are stored per object; the new values are shared.
+    """
+
+    def __init__(self, refs, old_values, new_values):
+        self.refs = refs                # [(collection, index, ...)]
+        self.old_values = old_values    # [{attr: value}] parallel to refs
+        self.new_values = new_values    # {attr: value}
+
+
+def _edit_target(source, ref):
+    """Resolve a PropertyEdit ref against the canvas or an undo snapshot dict, or None if it is out of range."""
+    name = ref[0]
+    collection = source[name] if isinstance(source, dict) else getattr(source, name)
+    if ref[1] >= len(collection):
+        return None
+    if name == "wall_sets":
+        wall_set = collection[ref[1]]
+        return wall_set[ref[2]] if ref[2] < len(wall_set) else None
+    if name in ("doors", "windows"):
+        return collection[ref[1]][1]
+    return collection[ref[1]]
+
+
 class CanvasStateMixin:
     def save_state(self):
         state = {
@@ -17,15 +60,113 @@ class CanvasStateMixin:
             "dimensions": copy.deepcopy(self.dimensions)
         }
         self.undo_stack.append(state)
-        if len(self.undo_stack) > self.config.UNDO_REDO_LIMIT:
-            self.undo_stack.pop(0)
+        self._trim_undo_stack()
+        self._undo_version = self.document.version()
         import traceback
         stack = traceback.extract_stack()
         caller = stack[-2]
         print(f"save_state called from {caller.filename}:{caller.lineno} in {caller.name}")
         print(f"save_state: {len(state['wall_sets'])} wall sets, {len(state['walls'])} walls, {len(state['rooms'])} rooms")
 
-    def restore_state(self, state):
+    def _trim_undo_stack(self):
+        while len(self.undo_stack) > self.config.UNDO_REDO_LIMIT:
+            oldest = self.undo_stack.pop(0)
+            if self.undo_stack and isinstance(self.undo_stack[0], PropertyEdit):
+                # The stack must start with a full snapshot: fold the edit into the
+                # dropped one, which is a private copy, and keep that as the new base.
+                edit = self.undo_stack[0]
+                for ref in edit.refs:
+                    target = _edit_target(oldest, ref)
+                    if target is None:
+                        continue
+                    for attr, value in edit.new_values.items():
+                        setattr(target, attr, value)
+                self.undo_stack[0] = oldest
+
+    def edit_properties(self, objects, **values):
+        """
+        Set the given attributes on every object as one undoable edit.
+
+        Used by the Properties Dock for multi-selection edits: objects whose values
+        already match are left alone, and the rest get one change event per affected
+        event kind, one compact PropertyEdit undo record and a single redraw. Doors
+        and windows are passed as the Door/Window objects, not their (wall, obj, ratio)
+        tuples. Returns the number of objects changed.
+
+        The record addresses objects by collection index and is replayed on the
+        newest full snapshot, so a snapshot is taken first whenever the document
+        changed since the undo stack was last in step with it (adding a text or a
+        door, or nudging with the arrow keys, doesn't call save_state()).
+        """
+        refs_by_id = self._edit_refs()
+        refs = []
+        old_values = []
+        changed = []
+        for obj in objects:
+            ref = refs_by_id.get(id(obj))
+            if ref is None:
+                continue
+            old = {attr: getattr(obj, attr, None) for attr in values}
+            if all(old[attr] == value for attr, value in values.items()):
+                continue
+            refs.append(ref)
+            old_values.append(old)
+            changed.append(obj)
+        if not changed:
+            return 0
+
+        if (self._undo_version != self.document.version()
+                or not any(isinstance(state, dict) for state in self.undo_stack)):
+            # Undo needs a full snapshot of the current model to rebuild from.
+            self.save_state()
+        for obj in changed:
+            for attr, value in values.items():
+                setattr(obj, attr, value)
+        self.undo_stack.append(PropertyEdit(refs, old_values, dict(values)))
+        self._trim_undo_stack()
+        self._notify_property_edit(refs, changed)
+        self.emit('properties-edited', len(changed))
+        return len(changed)
+
+    def _edit_refs(self):
+        """Map id(object) -> PropertyEdit ref for everything edit_properties can change."""
+        refs = {}
+        for set_index, wall_set in enumerate(self.wall_sets):
+            for wall_index, wall in enumerate(wall_set):
+                refs[id(wall)] = ("wall_sets", set_index, wall_index)
+        for name in ("walls", "texts", "dimensions"):
+            for index, obj in enumerate(getattr(self, name)):
+                refs[id(obj)] = (name, index)
+        for name in ("doors", "windows"):
+            for index, (_, obj, _) in enumerate(getattr(self, name)):
+                refs[id(obj)] = (name, index)
+        return refs
+
+    def _apply_property_edit(self, edit, undo):
+        refs = []
+        objects = []
+        for ref, old in zip(edit.refs, edit.old_values):
+            target = _edit_target(self, ref)
+            if target is None:
+                continue
+            for attr, value in (old if undo else edit.new_values).items():
+                setattr(target, attr, value)
+            refs.append(ref)
+            objects.append(target)
+        self._notify_property_edit(refs, objects)
+
+    def _notify_property_edit(self, refs, objects):
+        by_kind = {}
+        for ref, obj in zip(refs, objects):
+            by_kind.setdefault(_EDIT_EVENTS[ref[0]], []).append(obj)
+        if ANNOTATION_CHANGED in by_kind:
+            self.text_layouts.invalidate(by_kind[ANNOTATION_CHANGED])
+        for kind, changed in by_kind.items():
+            self.document.notify(kind, changed)
+        self._undo_version = self.document.version()
+        self.queue_draw()
+
+    def restore_state(self, state, edits=()):
         self.wall_sets = copy.deepcopy(state["wall_sets"])
         self.walls = copy.deepcopy(state["walls"])
         self.current_wall = copy.deepcopy(state["current_wall"]) if state["current_wall"] else None
@@ -38,7 +179,17 @@ class CanvasStateMixin:
         self.windows = copy.deepcopy(state.get("windows", []))
         self.texts = copy.deepcopy(state.get("texts", []))
         self.dimensions = copy.deepcopy(state.get("dimensions", []))
+        # Property edits recorded on top of the snapshot
+        for edit in edits:
+            for ref in edit.refs:
+                target = _edit_target(self, ref)
+                if target is None:
+                    continue
+                for attr, value in edit.new_values.items():
+                    setattr(target, attr, value)
         self.snap_type = "none"
+        self.document.notify(BULK_RELOAD)
+        self._undo_version = self.document.version()
         self.queue_draw()
         print(f"restore_state: {len(self.wall_sets)} wall sets, {len(self.walls)} walls, {len(self.rooms)} rooms")
 
@@ -53,12 +204,20 @@ class CanvasStateMixin:
         
         # 2. Move it to the redo stack so we can go back
         self.redo_stack.append(current_state)
+
+        # A property edit is reverted in place
+        if isinstance(current_state, PropertyEdit):
+            self._apply_property_edit(current_state, undo=True)
+            return
         
-        # 3. Peek at the *new* top of the undo stack (the PREVIOUS state)
-        previous_state = self.undo_stack[-1]
+        # 3. Find the *new* top of the undo stack (the PREVIOUS state): the newest
+        #    full snapshot plus any property edits recorded after it
+        base = len(self.undo_stack) - 1
+        while isinstance(self.undo_stack[base], PropertyEdit):
+            base -= 1
         
         # 4. Restore that previous state
-        self.restore_state(previous_state)
+        self.restore_state(self.undo_stack[base], self.undo_stack[base + 1:])
 
     def redo(self):
         if not self.redo_stack:
@@ -72,4 +231,18 @@ class CanvasStateMixin:
         self.undo_stack.append(next_state)
         
         # 3. Restore it
-        self.restore_state(next_state)
+        if isinstance(next_state, PropertyEdit):
+            self._apply_property_edit(next_state, undo=False)
+        else:
+            self.restore_state(next_state)
+
+    def on_settings_changed(self, changed):
+        """Apply settings that canvas helpers copied at construction time, then redraw."""
+        if "SNAP_ENABLED" in changed:
+            self.snap_manager.snap_enabled = changed["SNAP_ENABLED"]
+        if "ENABLE_DIMENSION_AUTO_UPDATE" in changed:
+            self.dimension_links.enabled = changed["ENABLE_DIMENSION_AUTO_UPDATE"]
+        if "DEFAULT_WALL_WIDTH" in changed:
+            # Opening footprints in the box-selection index depend on the wall width.
+            self.box_query.invalidate()
+        self.queue_draw()
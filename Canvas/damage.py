@@ -0,0 +1,68 @@
+class DamageTracker:
+    """
+    Device-space rectangles invalidated since the last frame.
+
+    A full invalidation (queue_draw) overrides any rectangles; take() hands the
+    damage to on_draw and resets the tracker.
+    """
+
+    # Beyond this many rectangles they are merged into their bounding box.
+    MAX_RECTS = 16
+
+    def __init__(self):
+        self._rects = []
+        self._full = True
+
+    @property
+    def is_full(self):
+        return self._full
+
+    def add_all(self):
+        self._full = True
+        self._rects.clear()
+
+    def add(self, x, y, width, height):
+        if self._full or width <= 0 or height <= 0:
+            return
+        self._rects.append((x, y, width, height))
+        if len(self._rects) > self.MAX_RECTS:
+            rect = self._rects[0]
+            for other in self._rects[1:]:
+                rect = union_rects(rect, other)
+            self._rects = [rect]
+
+    def take(self):
+        """Return None for a full redraw, otherwise the list of damaged (x, y, w, h) rectangles."""
+        rects = None if self._full else self._rects
+        self._full = False
+        self._rects = []
+        return rects
+
+
+def union_rects(a, b):
+    """Bounding box of two (x, y, w, h) rectangles; either may be None."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    x1 = min(a[0], b[0])
+    y1 = min(a[1], b[1])
+    x2 = max(a[0] + a[2], b[0] + b[2])
+    y2 = max(a[1] + a[3], b[1] + b[3])
+    return (x1, y1, x2 - x1, y2 - y1)
+
+
+def extent_of(points):
+    """
+    Device rectangle covering (x, y, pad) points, each grown by its pad in pixels.
+
+    Returns (x, y, w, h) with whole-pixel edges, or None when there are no points.
+    """
+    rect = None
+    for x, y, pad in points:
+        rect = union_rects(rect, (x - pad, y - pad, 2 * pad, 2 * pad))
+    if rect is None:
+        return None
+    x1 = int(rect[0]) - 1
+    y1 = int(rect[1]) - 1
+    return (x1, y1, int(rect[0] + rect[2]) + 2 - x1, int(rect[1] + rect[3]) + 2 - y1)
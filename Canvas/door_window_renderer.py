@@ -1,9 +1,22 @@
 import math
 
+from Canvas.lod import LOD_SIMPLE, LOD_SKIP, lod_thresholds, level_of_detail
+
+def _outline_opening(cr, zoom_transform):
+    """Fill the current opening path white and outline it (the simplified LOD glyph)."""
+    cr.save()
+    cr.fill_preserve()
+    cr.set_source_rgb(0, 0, 0)
+    cr.set_line_width(1.0 / zoom_transform)
+    cr.stroke()
+    cr.restore()
+
+
 def draw_doors(self, cr, pixels_per_inch):
     # Draw doors
     cr.save()
     zoom_transform = self.zoom * pixels_per_inch
+    door_lod = lod_thresholds(self.config, "doors")
 
     for door_item in self.doors:
         wall, door, ratio = door_item
@@ -11,6 +24,11 @@ def draw_doors(self, cr, pixels_per_inch):
         # Skip invalid entries
         if wall is None:
             continue
+
+        # Level of detail from the door's on-screen width
+        lod = level_of_detail(door.width * zoom_transform, door_lod)
+        if lod == LOD_SKIP:
+            continue
             
         A = wall.start
         B = wall.end
@@ -50,6 +68,10 @@ def draw_doors(self, cr, pixels_per_inch):
         cr.line_to(*P3)
         cr.line_to(*P4)
         cr.close_path()
+        if lod == LOD_SIMPLE:
+            # Opening rectangle only: no leaf, swing or label
+            _outline_opening(cr, zoom_transform)
+            continue
         cr.fill()
 
         if door.door_type == "single":
@@ -558,6 +580,7 @@ def draw_doors(self, cr, pixels_per_inch):
 def draw_windows(self, cr, pixels_per_inch):
     cr.save()
     zoom_transform = self.zoom * pixels_per_inch
+    window_lod = lod_thresholds(self.config, "windows")
     # Draw windows
     for window_item in self.windows: # window_item = (wall, window, ratio)
         wall, window, ratio = window_item # wall is a Wall object, window is a Window object, ratio is a float
@@ -565,6 +588,11 @@ def draw_windows(self, cr, pixels_per_inch):
         # Skip invalid entries
         if wall is None:
             continue
+
+        # Level of detail from the window's on-screen width
+        lod = level_of_detail(window.width * zoom_transform, window_lod)
+        if lod == LOD_SKIP:
+            continue
             
         A = wall.start # wall.start and wall.end are tuples (x, y)
         B = wall.end
@@ -599,6 +627,10 @@ def draw_windows(self, cr, pixels_per_inch):
         cr.line_to(*P3)
         cr.line_to(*P4)
         cr.close_path()
+        if lod == LOD_SIMPLE:
+            # Opening rectangle only: no sashes or label
+            _outline_opening(cr, zoom_transform)
+            continue
         cr.fill() 
         
         if window.window_type == "sliding":
@@ -1,6 +1,8 @@
 import math
 from gi.repository import Gtk
 
+from document import WALL_ADDED, WALL_MOVED, WALL_CHANGED, WALL_REMOVED, OPENING_CHANGED, ANNOTATION_CHANGED
+
 class EditEventsMixin:
     def join_selected_walls(self, popover: Gtk.Popover) -> None:
             """
@@ -8,14 +10,12 @@ class EditEventsMixin:
             This merges the entire chains that the selected walls belong to.
             """
             # 1. Gather distinct wall sets containing selected walls
+            set_of_wall = {id(wall): ws for ws in self.wall_sets for wall in ws}
             sets_to_merge = []
-            for item in self.selected_items:
-                if item.get("type") == "wall":
-                    wall = item["object"]
-                    for ws in self.wall_sets:
-                        if wall in ws and ws not in sets_to_merge:
-                            sets_to_merge.append(ws)
-                            break
+            for wall in self.selected_items.objects("wall"):
+                ws = set_of_wall.get(id(wall))
+                if ws is not None and not any(ws is other for other in sets_to_merge):
+                    sets_to_merge.append(ws)
             
             if len(sets_to_merge) < 2:
                 print("Need at least 2 distinct wall sets selected to join.")
@@ -36,6 +36,7 @@ class EditEventsMixin:
             
             # 5. Add back
             self.wall_sets.append(new_set)
+            self.document.notify(WALL_CHANGED, new_set)
             
             # Cleanup
             self.selected_items = []
@@ -54,6 +55,7 @@ class EditEventsMixin:
         
         # 2. Rebuild sets based on connectivity
         self.wall_sets = self._group_walls_into_sets(all_walls)
+        self.document.notify(WALL_CHANGED, all_walls)
         
         self.selected_items = []
         self.queue_draw()
@@ -99,6 +101,7 @@ class EditEventsMixin:
         
         # Combine everything
         self.wall_sets = walls_to_keep_as_is + new_selected_sets + new_remaining_sets
+        self.document.notify(WALL_CHANGED, selected_walls + remaining_walls)
         
         # Clear selection and redraw
         self.selected_items = []
@@ -165,6 +168,8 @@ class EditEventsMixin:
                 break
         
         if found:
+            self.document.notify(WALL_REMOVED, [wall])
+            self.document.notify(WALL_ADDED, [w1, w2])
             self.selected_items = []
             self.queue_draw()
             
@@ -231,11 +236,14 @@ class EditEventsMixin:
                 else:
                     wall_obj.end = new_point
 
+            self.document.notify(WALL_MOVED, [w for w, _ in getattr(self, "connected_endpoints", [])])
             self.queue_draw()
             return
         
         # Handle text rotation
         if getattr(self, "rotating_text", None):
+            # Rotating about its anchor keeps the text inside the same bounding circle
+            damaged = self.text_extent(self.rotating_text)
             pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
             
             # Current mouse position in device coords
@@ -264,20 +272,22 @@ class EditEventsMixin:
                 new_rotation += 360
             
             self.rotating_text.rotation = new_rotation
+            self.document.notify(ANNOTATION_CHANGED, [self.rotating_text])
             
             # Update sidebar rotation spinner if properties dock is available
             if hasattr(self, "properties_dock") and self.properties_dock:
                 text_page = self.properties_dock.text_page
-                if text_page.current_text == self.rotating_text:
+                if self.rotating_text in text_page.current_texts:
                     # Block the handler to prevent feedback loop
                     text_page._block_updates = True
                     text_page.rotation_spin.set_value(new_rotation)
                     text_page._block_updates = False
             
-            self.queue_draw()
+            self.queue_draw_extents(damaged)
             return
         
         if getattr(self, "moving_text", None):
+            damaged_before = self.text_extent(self.moving_text)
             pixels_per_inch = getattr(self.config, "PIXELS_PER_INCH", 2.0)
             T = self.zoom * pixels_per_inch
             
@@ -288,8 +298,9 @@ class EditEventsMixin:
             start_x, start_y = self.moving_text_start_pos
             self.moving_text.x = start_x + dx
             self.moving_text.y = start_y + dy
+            self.document.notify(ANNOTATION_CHANGED, [self.moving_text])
             
-            self.queue_draw()
+            self.queue_draw_extents(damaged_before, self.text_extent(self.moving_text))
             return
             
         # Handle wall dragging
@@ -328,6 +339,10 @@ class EditEventsMixin:
                 else:
                     wall_obj.end = new_end
             
+            moved = [wall]
+            moved.extend(w for w, _ in getattr(self, "wall_drag_connected_start", []))
+            moved.extend(w for w, _ in getattr(self, "wall_drag_connected_end", []))
+            self.document.notify(WALL_MOVED, moved)
             self.queue_draw()
             return
             
@@ -350,6 +365,10 @@ class EditEventsMixin:
             
             item = self.dragging_door_window
             wall, obj, ratio = item["object"]
+            # Dimensions anchored to the opening's edges follow it and need repainting too.
+            dependents = self.dimension_links.dependents_of_openings([obj])
+            damaged_before = [self.opening_extent(wall, obj, ratio)]
+            damaged_before += [self.dimension_extent(dimension) for dimension in dependents]
             
             # Find nearest wall (could be current or different wall)
             best_wall = None
@@ -392,8 +411,8 @@ class EditEventsMixin:
                             self.doors[i] = new_tuple
                             item["object"] = new_tuple
                             # Update selected_items to reference new tuple
-                            for sel_item in self.selected_items:
-                                if sel_item["type"] == "door" and sel_item["object"][1] is obj:
+                            for sel_item in self.selected_items.of_type("door"):
+                                if sel_item["object"][1] is obj:
                                     sel_item["object"] = new_tuple
                             break
                 elif item["type"] == "window":
@@ -403,12 +422,14 @@ class EditEventsMixin:
                             self.windows[i] = new_tuple
                             item["object"] = new_tuple
                             # Update selected_items to reference new tuple
-                            for sel_item in self.selected_items:
-                                if sel_item["type"] == "window" and sel_item["object"][1] is obj:
+                            for sel_item in self.selected_items.of_type("window"):
+                                if sel_item["object"][1] is obj:
                                     sel_item["object"] = new_tuple
                             break
+                self.document.notify(OPENING_CHANGED, [obj])
             
-            self.queue_draw()
+            self.queue_draw_extents(*damaged_before, self.opening_extent(*item["object"]),
+                                    *(self.dimension_extent(dimension) for dimension in dependents))
             return
             
         if self.tool_mode == "panning":
@@ -416,11 +437,25 @@ class EditEventsMixin:
             self.offset_y = self.last_offset_y + offset_y
             self.queue_draw()
         elif self.tool_mode == "pointer" and self.box_selecting:
+            damaged_before = self.box_select_extent()
             current_x = self.box_select_start[0] + (offset_x / (self.zoom * pixels_per_inch))
             current_y = self.box_select_start[1] + (offset_y / (self.zoom * pixels_per_inch))
             self.box_select_end = (current_x, current_y)
-            self.queue_draw()
+            changed_extent = None
+            if getattr(self.config, "BOX_SELECT_PREVIEW", True):
+                rect = (min(self.box_select_start[0], current_x), min(self.box_select_start[1], current_y),
+                        max(self.box_select_start[0], current_x), max(self.box_select_start[1], current_y))
+                preview = self.box_query.query(rect)
+                # Only entries entering or leaving the box need their highlight repainted.
+                before = {entry[0] for entry in self.box_select_preview}
+                after = {entry[0] for entry in preview}
+                changed = [entry for entry in self.box_select_preview if entry[0] not in after]
+                changed.extend(entry for entry in preview if entry[0] not in before)
+                changed_extent = self.box_preview_extent(changed)
+                self.box_select_preview = preview
+            self.queue_draw_extents(damaged_before, self.box_select_extent(), changed_extent)
         elif self.tool_mode == "add_text" and hasattr(self, "drag_start_x"):
+            damaged_before = self.interaction_extent()
             self.drag_active = True # user is dragging
             # Calculate rect
             current_x = self.drag_start_x + offset_x
@@ -437,6 +472,6 @@ class EditEventsMixin:
             y = min(start_m_y, curr_m_y)
             
             self.current_text_preview = (x, y, w, h)
-            self.queue_draw()
+            self.queue_draw_extents(damaged_before, self.interaction_extent())
             
     
\ No newline at end of file
@@ -1,6 +1,8 @@
 import math
 from typing import List
 
+from Canvas.box_query import segment_intersects_rect
+
 class EventsHelpersMixin:
     def distance_point_to_segment(self, P: tuple[float, float], A: tuple[float, float], B: tuple[float, float]) -> float:
         """
@@ -49,61 +51,7 @@ class EventsHelpersMixin:
         Returns:
             bool: True if the segment intersects or is contained in the rectangle, False otherwise.
         """
-        rx1, ry1, rx2, ry2 = rect
-
-        def point_in_rect(pt):
-            x, y = pt
-            return rx1 <= x <= rx2 and ry1 <= y <= ry2
-
-        # If either endpoint is inside the rectangle, the segment intersects.
-        if point_in_rect(A) or point_in_rect(B):
-            return True
-
-        # Helper: Check if two segments (p,q) and (r,s) intersect.
-        def segments_intersect(p, q, r, s):
-            def orientation(a, b, c):
-                # Calculate the orientation of triplet (a,b,c)
-                val = (b[1]-a[1])*(c[0]-b[0]) - (b[0]-a[0])*(c[1]-b[1])
-                if abs(val) < 1e-6:
-                    return 0  # colinear
-                return 1 if val > 0 else 2  # 1: clockwise, 2: counterclockwise
-
-            def on_segment(a, b, c):
-                return (min(a[0], b[0]) <= c[0] <= max(a[0], b[0]) and
-                        min(a[1], b[1]) <= c[1] <= max(a[1], b[1]))
-
-            o1 = orientation(p, q, r)
-            o2 = orientation(p, q, s)
-            o3 = orientation(r, s, p)
-            o4 = orientation(r, s, q)
-
-            if o1 != o2 and o3 != o4:
-                return True
-
-            if o1 == 0 and on_segment(p, q, r):
-                return True
-            if o2 == 0 and on_segment(p, q, s):
-                return True
-            if o3 == 0 and on_segment(r, s, p):
-                return True
-            if o4 == 0 and on_segment(r, s, q):
-                return True
-
-            return False
-
-        # Define the rectangle's four edges:
-        edges = [
-            ((rx1, ry1), (rx2, ry1)),  # top edge
-            ((rx2, ry1), (rx2, ry2)),  # right edge
-            ((rx2, ry2), (rx1, ry2)),  # bottom edge
-            ((rx1, ry2), (rx1, ry1))   # left edge
-        ]
-
-        for edge in edges:
-            if segments_intersect(A, B, edge[0], edge[1]):
-                return True
-        return False
-            
+        return segment_intersects_rect(A[0], A[1], B[0], B[1], *rect)
 
     def _get_candidate_points(self) -> List[tuple[float, float]]:
         """
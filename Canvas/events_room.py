@@ -1,3 +1,5 @@
+from document import ROOM_CHANGED
+
 
 
 class CanvasRoomMixin:
@@ -49,6 +51,7 @@ class CanvasRoomMixin:
                     self.current_room_points.append(self.current_room_points[0])
                 new_room = self.Room(self.current_room_points)
                 self.rooms.append(new_room)
+                self.document.notify(ROOM_CHANGED, [new_room])
                 self.current_room_points = []
                 self.current_room_preview = None
                 room_created = True
@@ -60,6 +63,7 @@ class CanvasRoomMixin:
                     if self._point_in_polygon((snapped_x, snapped_y), poly):
                         new_room = self.Room(poly)
                         self.rooms.append(new_room)
+                        self.document.notify(ROOM_CHANGED, [new_room])
                         # Reset room drawing state after creating room from closed loop
                         self.current_room_points = []
                         self.current_room_preview = None
@@ -77,6 +81,7 @@ class CanvasRoomMixin:
                 self.current_room_points.append(self.current_room_points[0])
             new_room = self.Room(self.current_room_points)
             self.rooms.append(new_room)
+            self.document.notify(ROOM_CHANGED, [new_room])
             print(f"Finalized room with points: {self.current_room_points}")
         # Clear the temporary room points and preview
         self.current_room_points = []
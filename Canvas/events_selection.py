@@ -1,7 +1,32 @@
 import math
 from gi.repository import Gtk, Gdk
 
+from document import WALL_CHANGED, OPENING_CHANGED, POLYLINE_CHANGED, ANNOTATION_CHANGED
+from Canvas.selection import Selection
+
 class CanvasSelectionMixin:
+    @property
+    def selected_items(self):
+        """The current selection as a Selection (a list of {"type", "object"} dicts)."""
+        return self._selection
+
+    @selected_items.setter
+    def selected_items(self, items):
+        self._selection = items if isinstance(items, Selection) else Selection(items)
+
+    def select_all(self) -> None:
+        """Select every wall, door, window, polyline segment, text and dimension."""
+        items = [{"type": "wall", "object": wall} for wall_set in self.wall_sets for wall in wall_set]
+        items.extend({"type": "door", "object": door_item} for door_item in self.doors)
+        items.extend({"type": "window", "object": window_item} for window_item in self.windows)
+        items.extend({"type": "polyline", "object": segment, "identifier": segment.identifier}
+                     for polyline_set in self.polyline_sets for segment in polyline_set)
+        items.extend({"type": "text", "object": text} for text in self.texts)
+        items.extend({"type": "dimension", "object": dimension} for dimension in self.dimensions)
+        self.selected_items = items
+        self.emit('selection-changed', self.selected_items)
+        self.queue_draw()
+
     def _handle_pointer_click(self, gesture: Gtk.GestureClick, n_press: int, x: float, y: float) -> None:
         """
         Handle pointer-tool clicks to select canvas items or begin wall-handle editing.
@@ -41,21 +66,19 @@ class CanvasSelectionMixin:
         
         # Check for wall handle clicks (for editing)
         T = self.zoom * pixels_per_inch
-        for item in self.selected_items:
-            if item["type"] == "wall":
-                wall = item["object"]
-                for handle_name, pt in [("start", wall.start), ("end", wall.end)]:
-                    pt_widget = (
-                        (pt[0] * T) + self.offset_x,
-                        (pt[1] * T) + self.offset_y
-                    )
-                    dist = math.hypot(click_pt[0] - pt_widget[0], click_pt[1] - pt_widget[1])
-                    if dist < self.handle_radius:
-                        # Start editing this wall's handle
-                        self.editing_wall = wall
-                        self.editing_handle = handle_name
-                        selected_item = {"type": "wall_handle", "object": (wall, handle_name)}
-                        break
+        for wall in self.selected_items.objects("wall"):
+            for handle_name, pt in [("start", wall.start), ("end", wall.end)]:
+                pt_widget = (
+                    (pt[0] * T) + self.offset_x,
+                    (pt[1] * T) + self.offset_y
+                )
+                dist = math.hypot(click_pt[0] - pt_widget[0], click_pt[1] - pt_widget[1])
+                if dist < self.handle_radius:
+                    # Start editing this wall's handle
+                    self.editing_wall = wall
+                    self.editing_handle = handle_name
+                    selected_item = {"type": "wall_handle", "object": (wall, handle_name)}
+                    break
             if selected_item:
                 break
 
@@ -244,7 +267,7 @@ class CanvasSelectionMixin:
 
         if selected_item:
             if shift_pressed:
-                if not any(self.same_selection(existing["object"], selected_item["object"]) for existing in self.selected_items):
+                if selected_item not in self.selected_items:
                     self.selected_items.append(selected_item)
             else:
                 self.selected_items = [selected_item]
@@ -296,6 +319,9 @@ class CanvasSelectionMixin:
             event = gesture.get_current_event()
             state = event.get_modifier_state() if hasattr(event, "get_modifier_state") else event.state
             self.box_select_extend = bool(state & Gdk.ModifierType.SHIFT_MASK)
+            # Rebuild the box index once per drag; nothing changes while the box is dragged.
+            self.box_query.invalidate()
+            self.box_select_preview = []
             
             # If we are moving or rotating text, cancel box selection
             if getattr(self, "moving_text", None) or getattr(self, "rotating_text", None):
@@ -448,138 +474,18 @@ class CanvasSelectionMixin:
             y2 = max(self.box_select_start[1], self.box_select_end[1])
             rect = (x1, y1, x2, y2)
             
-            new_selection = []
-            
-            for wall_set in self.wall_sets:
-                for wall in wall_set:
-                    if self.line_intersects_rect(wall.start, wall.end, rect):
-                        new_selection.append({"type": "wall", "object": wall})
-            
-            for room in self.rooms:
-                for idx, pt in enumerate(room.points):
-                    if (x1 <= pt[0] <= x2) and (y1 <= pt[1] <= y2):
-                        new_selection.append({"type": "vertex", "object": (room, idx)})
-            
-            # Check doors
-            for door_item in self.doors:
-                wall, door, ratio = door_item
-                
-                # Skip doors without a wall
-                if wall is None:
-                    continue
-                
-                A = wall.start
-                B = wall.end
-                H = (A[0] + ratio * (B[0] - A[0]), A[1] + ratio * (B[1] - A[1]))
-                dx = B[0] - A[0]
-                dy = B[1] - A[1]
-                length = math.hypot(dx, dy)
-                if length == 0:
-                    continue
-                d = (dx / length, dy / length)
-                p = (-d[1], d[0])
-                n = (-p[0], -p[1]) if door.swing == "left" else (p[0], p[1])
-                w = door.width
-                t = self.config.DEFAULT_WALL_WIDTH
-                H_start = (H[0] - (w / 2) * d[0], H[1] - (w / 2) * d[1])
-                H_end = (H[0] + (w / 2) * d[0], H[1] + (w / 2) * d[1])
-                P1 = (H_start[0] - (t / 2) * p[0], H_start[1] - (t / 2) * p[1])
-                P2 = (H_start[0] + (t / 2) * p[0], H_start[1] + (t / 2) * p[1])
-                P3 = (H_end[0] + (t / 2) * p[0], H_end[1] + (t / 2) * p[1])
-                P4 = (H_end[0] - (t / 2) * p[0], H_end[1] - (t / 2) * p[1])
-                # Compute bounding box for the door polygon.
-                door_min_x = min(P1[0], P2[0], P3[0], P4[0])
-                door_max_x = max(P1[0], P2[0], P3[0], P4[0])
-                door_min_y = min(P1[1], P2[1], P3[1], P4[1])
-                door_max_y = max(P1[1], P2[1], P3[1], P4[1])
-                # If the door bounding box overlaps with the selection rectangle, add it.
-                if door_max_x >= x1 and door_min_x <= x2 and door_max_y >= y1 and door_min_y <= y2:
-                    new_selection.append({"type": "door", "object": door_item})
-
-            for window_item in self.windows:
-                wall, window, ratio = window_item
-                
-                # Skip windows without a wall
-                if wall is None:
-                    continue
-                
-                A = wall.start
-                B = wall.end
-                H = (A[0] + ratio * (B[0] - A[0]), A[1] + ratio * (B[1] - A[1]))
-                dx = B[0] - A[0]
-                dy = B[1] - A[1]
-                length = math.hypot(dx, dy)
-                if length == 0:
-                    continue
-                d = (dx / length, dy / length)
-                p = (-d[1], d[0])
-                w = window.width
-                t = self.config.DEFAULT_WALL_WIDTH
-                H_start = (H[0] - (w / 2) * d[0], H[1] - (w / 2) * d[1])
-                H_end = (H[0] + (w / 2) * d[0], H[1] + (w / 2) * d[1])
-                P1 = (H_start[0] - (t / 2) * p[0], H_start[1] - (t / 2) * p[1])
-                P2 = (H_start[0] + (t / 2) * p[0], H_start[1] + (t / 2) * p[1])
-                P3 = (H_end[0] + (t / 2) * p[0], H_end[1] + (t / 2) * p[1])
-                P4 = (H_end[0] - (t / 2) * p[0], H_end[1] - (t / 2) * p[1])
-                window_min_x = min(P1[0], P2[0], P3[0], P4[0])
-                window_max_x = max(P1[0], P2[0], P3[0], P4[0])
-                window_min_y = min(P1[1], P2[1], P3[1], P4[1])
-                window_max_y = max(P1[1], P2[1], P3[1], P4[1])
-                if window_max_x >= x1 and window_min_x <= x2 and window_max_y >= y1 and window_min_y <= y2:
-                    new_selection.append({"type": "window", "object": window_item})
-            
-            for poly_list in self.polyline_sets:
-                for pl in poly_list:
-                    if self.line_intersects_rect(pl.start, pl.end, rect):
-                        new_selection.append({"type": "polyline", "object": pl, "identifier": pl.identifier})
-            
-            for dimension in self.dimensions:
-                # Calculate dimension line position
-                start = dimension.start
-                end = dimension.end
-                offset = dimension.offset
-                
-                dx = end[0] - start[0]
-                dy = end[1] - start[1]
-                length = math.hypot(dx, dy)
-                
-                if length == 0:
-                    continue
-                
-                # Perpendicular unit vector
-                ux = dx / length
-                uy = dy / length
-                px = -uy
-                py = ux
-                
-                # Dimension line endpoints
-                dim_start = (start[0] + offset * px, start[1] + offset * py)
-                dim_end = (end[0] + offset * px, end[1] + offset * py)
-                
-                if self.line_intersects_rect(dim_start, dim_end, rect):
-                    new_selection.append({"type": "dimension", "object": dimension})
-
-            
-            for text in self.texts:
-                tx1 = text.x
-                ty1 = text.y
-                tx2 = text.x + text.width
-                ty2 = text.y + text.height
-                
-                # Check intersection (if NOT disjoint)
-                if not (tx2 < x1 or tx1 > x2 or ty2 < y1 or ty1 > y2):
-                    new_selection.append({"type": "text", "object": text})
+            new_selection = self.box_query.selection_items(self.box_query.query(rect))
 
             if hasattr(self, "box_select_extend") and self.box_select_extend:
                 for item in new_selection:
-                    if not any(existing["type"] == item["type"] and self.same_selection(existing["object"], item["object"])
-                            for existing in self.selected_items):
+                    if item not in self.selected_items:
                         self.selected_items.append(item)
             else:
                 self.selected_items = new_selection
             self.emit('selection-changed', self.selected_items)
             
             self.box_selecting = False
+            self.box_select_preview = []
             self.editing_wall = None
             self.editing_handle = None
             self.queue_draw()
@@ -592,6 +498,7 @@ class CanvasSelectionMixin:
                     new_text = self.Text(x, y, content="Text", width=w, height=h, identifier=text_id)
                     self.texts.append(new_text)
                     self.existing_ids.append(text_id)
+                    self.document.notify(ANNOTATION_CHANGED, [new_text])
                     self.selected_items = [{"type": "text", "object": new_text}]
                     self.emit('selection-changed', self.selected_items)
                 
@@ -648,11 +555,11 @@ class CanvasSelectionMixin:
             return
         
         # Filter selected items
-        selected_walls = [item for item in self.selected_items if item.get("type") == "wall"]
-        selected_doors = [item for item in self.selected_items if item.get("type") == "door"]
-        selected_windows = [item for item in self.selected_items if item.get("type") == "window"]
-        selected_polylines = [item for item in self.selected_items if item.get("type") == "polyline"]
-        selected_texts = [item for item in self.selected_items if item.get("type") == "text"]
+        selected_walls = self.selected_items.of_type("wall")
+        selected_doors = self.selected_items.of_type("door")
+        selected_windows = self.selected_items.of_type("window")
+        selected_polylines = self.selected_items.of_type("polyline")
+        selected_texts = self.selected_items.of_type("text")
 
         # Create a popover to serve as the context menu
         parent_popover = Gtk.Popover()
@@ -880,6 +787,7 @@ class CanvasSelectionMixin:
         for door_item in selected_doors:
             wall, door, ratio = door_item["object"]
             door.door_type = new_type
+        self.document.notify(OPENING_CHANGED, [item["object"][1] for item in selected_doors])
         self.queue_draw()
         popover.popdown()  # Hide the sub-menu popover
         parent_popover.popdown()  # Hide the parent right-click popover
@@ -966,6 +874,7 @@ class CanvasSelectionMixin:
         for window_item in selected_windows:
             wall, window, ratio = window_item["object"]
             window.window_type = new_type
+        self.document.notify(OPENING_CHANGED, [item["object"][1] for item in selected_windows])
         self.queue_draw()
         popover.popdown()  # Hide the sub-menu popover
         parent_popover.popdown()  # Hide the parent right-click popover
@@ -1001,6 +910,7 @@ class CanvasSelectionMixin:
                 polyline["object"].style = "dashed" if polyline["object"].style == "solid" else "solid"
             self.queue_draw()
             popover.popdown()
+        self.document.notify(POLYLINE_CHANGED, [item["object"] for item in selected_polylines])
             
     def set_ext_int(self, selected_walls: list, state: str, popover: Gtk.Popover) -> None:
         """
@@ -1019,6 +929,7 @@ class CanvasSelectionMixin:
         """
         for wall in selected_walls:
             wall["object"].exterior_wall = state
+        self.document.notify(WALL_CHANGED, [item["object"] for item in selected_walls])
         self.queue_draw()
         popover.popdown()
           
@@ -1039,6 +950,7 @@ class CanvasSelectionMixin:
         """
         for wall in selected_walls:
             wall["object"].footer = state
+        self.document.notify(WALL_CHANGED, [item["object"] for item in selected_walls])
         print(f"Footer state set to {state} for selected walls.")
         # TODO : Implement footer rendering logic
         self.queue_draw()
@@ -1069,6 +981,7 @@ class CanvasSelectionMixin:
                 door.orientation = "outswing"
             else:
                 door.orientation = "inswing" if door.orientation == "outswing" else "outswing"
+        self.document.notify(OPENING_CHANGED, [item["object"][1] for item in selected_doors])
         self.queue_draw()
         popover.popdown()
          
@@ -1089,5 +1002,6 @@ class CanvasSelectionMixin:
         for door_item in selected_doors:
             wall, door, ratio = door_item["object"]
             door.swing = "left" if door.swing == "right" else "right"
+        self.document.notify(OPENING_CHANGED, [item["object"][1] for item in selected_doors])
         self.queue_draw()
         popover.popdown()
@@ -1,6 +1,7 @@
 import math
 from gi.repository import Gtk
 from components import Door, Window, Polyline
+from document import OPENING_CHANGED, POLYLINE_CHANGED, ANNOTATION_CHANGED
 
 class CanvasToolsMixin:
     def _handle_door_click(self, n_press: int, x: float, y: float) -> None:
@@ -60,6 +61,7 @@ class CanvasToolsMixin:
             new_door = Door(door_type, 36.0, 80.0, "left", "inswing", identifier=door_identifier)
         self.existing_ids.append(door_identifier)
         self.doors.append((selected_wall, new_door, selected_ratio))
+        self.document.notify(OPENING_CHANGED, [new_door])
         self.queue_draw()
         
     
@@ -115,6 +117,7 @@ class CanvasToolsMixin:
         new_window = Window(48.0, 36.0, window_type, identifier=window_identifier)
         self.existing_ids.append(window_identifier)
         self.windows.append((selected_wall, new_window, selected_ratio))
+        self.document.notify(OPENING_CHANGED, [new_window])
         self.queue_draw()
     
 
@@ -170,6 +173,7 @@ class CanvasToolsMixin:
                 else:
                     seg.style = "solid" 
                 self.polylines.append(seg)
+                self.document.notify(POLYLINE_CHANGED, [seg])
                 self.current_polyline_start = snapped
             self.queue_draw()
             self.current_polyline_preview = None
@@ -179,6 +183,7 @@ class CanvasToolsMixin:
             self.save_state()
             if self.polylines:
                 self.polyline_sets.append(self.polylines.copy())
+                self.document.notify(POLYLINE_CHANGED, self.polylines)
             self.drawing_polyline = False
             self.current_polyline_start = None
             self.polylines = []
@@ -209,6 +214,7 @@ class CanvasToolsMixin:
         new_text = self.Text(canvas_x, canvas_y, content="Text", width=48.0, height=24.0, identifier=text_id)
         self.texts.append(new_text)
         self.existing_ids.append(text_id)
+        self.document.notify(ANNOTATION_CHANGED, [new_text])
         
         # Select it
         self.selected_items = [{"type": "text", "object": new_text}]
@@ -239,8 +245,10 @@ class CanvasToolsMixin:
         
         # Three-click workflow for manual dimensioning
         if not self.drawing_dimension:
-            # First click - set start point
-            self.dimension_start = (canvas_x, canvas_y)
+            # First click - set start point, bound to a nearby wall endpoint or opening edge
+            self.dimension_start_anchor, self.dimension_start = self._dimension_anchor_at(
+                (canvas_x, canvas_y), pixels_per_inch
+            )
             self.drawing_dimension = True
             self.dimension_end = None
             self.dimension_offset_preview = None
@@ -248,7 +256,9 @@ class CanvasToolsMixin:
             self.queue_draw()
         elif self.dimension_end is None:
             # Second click - set end point
-            self.dimension_end = (canvas_x, canvas_y)
+            self.dimension_end_anchor, self.dimension_end = self._dimension_anchor_at(
+                (canvas_x, canvas_y), pixels_per_inch
+            )
             print(f"Dimension end set at {self.dimension_end}")
             self.queue_draw()
         else:
@@ -265,16 +275,21 @@ class CanvasToolsMixin:
                 start=self.dimension_start,
                 end=self.dimension_end,
                 offset=offset,
-                identifier=dim_id
+                identifier=dim_id,
+                start_anchor=self.dimension_start_anchor,
+                end_anchor=self.dimension_end_anchor
             )
             self.dimensions.append(new_dimension)
             self.existing_ids.append(dim_id)
+            self.document.notify(ANNOTATION_CHANGED, [new_dimension])
             
             # Reset state
             self.drawing_dimension = False
             self.dimension_start = None
             self.dimension_end = None
             self.dimension_offset_preview = None
+            self.dimension_start_anchor = None
+            self.dimension_end_anchor = None
             
             print(f"Dimension created with offset {offset}")
             self.save_state()
@@ -290,6 +305,8 @@ class CanvasToolsMixin:
         self.dimension_start = None
         self.dimension_end = None
         self.dimension_offset_preview = None
+        self.dimension_start_anchor = None
+        self.dimension_end_anchor = None
         
         click_pt = (canvas_x, canvas_y)
         tolerance = 10 / (self.zoom * pixels_per_inch)
@@ -313,21 +330,40 @@ class CanvasToolsMixin:
         # Use 12 inches as default offset
         default_offset = 12.0 # TODO: Make this configurable
         
-        # Create dimension object
+        # Create dimension object, bound to the wall's endpoints so it follows the wall
+        start_anchor = end_anchor = None
+        if self.dimension_links.enabled:
+            start_anchor = self.dimension_links.wall_anchor(selected_wall, "start")
+            end_anchor = self.dimension_links.wall_anchor(selected_wall, "end")
         dim_id = self.generate_identifier("dimension", self.existing_ids)
         new_dimension = self.Dimension(
             start=selected_wall.start,
             end=selected_wall.end,
             offset=default_offset,
-            identifier=dim_id
+            identifier=dim_id,
+            start_anchor=start_anchor,
+            end_anchor=end_anchor
         )
         self.dimensions.append(new_dimension)
         self.existing_ids.append(dim_id)
+        self.document.notify(ANNOTATION_CHANGED, [new_dimension])
         
         print(f"Auto-dimension created for wall from {selected_wall.start} to {selected_wall.end}")
         self.save_state()
         self.queue_draw()
     
+    def _dimension_anchor_at(self, point: tuple, pixels_per_inch: float) -> tuple:
+        """
+        Bind a dimension click to a wall endpoint or opening edge within 10 pixels.
+
+        Returns (anchor, point) where point is snapped onto the anchor, or (None, point)
+        when nothing is close enough or associative dimensions are disabled.
+        """
+        if not self.dimension_links.enabled:
+            return None, point
+        tolerance = 10 / (self.zoom * pixels_per_inch)
+        return self.dimension_links.anchor_at(point, tolerance)
+
     def _calculate_dimension_offset(self, start: tuple, end: tuple, mouse_pos: tuple) -> float:
         """
         Calculate the perpendicular distance from the line (start to end) to mouse_pos.
@@ -381,15 +417,14 @@ class CanvasToolsMixin:
         def on_response(d, response):
             if response == Gtk.ResponseType.OK:
                 text_obj.content = entry.get_text()
+                self.text_layouts.invalidate(text_obj)
+                self.document.notify(ANNOTATION_CHANGED, [text_obj])
                 self.queue_draw()
                 # Update properties dock by emitting selection-changed
                 # Find this text in selected_items and re-emit the signal
-                if hasattr(self, 'selected_items'):
-                    for item in self.selected_items:
-                        if item.get("type") == "text" and item.get("object") == text_obj:
-                            # Re-emit selection-changed to update sidebar
-                            self.emit('selection-changed', self.selected_items)
-                            break
+                if hasattr(self, 'selected_items') and self.selected_items.has("text", text_obj):
+                    # Re-emit selection-changed to update sidebar
+                    self.emit('selection-changed', self.selected_items)
             d.destroy()
             
         dialog.connect("response", on_response)
@@ -2,6 +2,7 @@ import math
 from gi.repository import Gtk
 from typing import List
 from components import Wall
+from document import WALL_ADDED, WALL_CHANGED
 
 class CanvasWallMixin:
     def _handle_wall_click(self, n_press: int, x: float, y: float) -> None:
@@ -60,6 +61,7 @@ class CanvasWallMixin:
             if wall_instance:
                 self.existing_ids.append(wall_instance.identifier)
                 self.walls.append(wall_instance)
+                self.document.notify(WALL_ADDED, [wall_instance])
                 
                 # Update angle
                 dx = wall_instance.end[0] - wall_instance.start[0]
@@ -80,9 +82,11 @@ class CanvasWallMixin:
                     )
                     if not duplicate:
                         self.walls.append(self.current_wall)
+                        self.document.notify(WALL_ADDED, [self.current_wall])
                     
                 else:
                     self.wall_sets.append(self.walls.copy())
+                    self.document.notify(WALL_CHANGED, self.walls)
                     self.walls = []
                     self.current_wall = None
                     self.drawing_wall = False
@@ -109,6 +113,7 @@ class CanvasWallMixin:
                             self.existing_ids.append(wall_id)
                             new_wall_set.append(new_wall)
                         self.wall_sets.append(new_wall_set)
+                        self.document.notify(WALL_ADDED, new_wall_set)
                         wall_created = True
                         break
                 
@@ -186,6 +191,7 @@ class CanvasWallMixin:
         
         self.existing_ids.append(wall_instance.identifier)
         self.walls.append(wall_instance)
+        self.document.notify(WALL_ADDED, [wall_instance])
         
         # Update state for next segment
         self.current_wall.start = (end_x, end_y)
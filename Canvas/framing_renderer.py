@@ -0,0 +1,59 @@
+from Canvas.lod import LOD_FULL, LOD_SKIP, lod_thresholds, level_of_detail
+from Takeoff.framing_layout import STUD_KINDS, STUD_THICKNESS
+
+# Stud colour per kind, in STUD_KINDS order
+STUD_COLORS = (
+    (0.55, 0.35, 0.15),   # common
+    (0.35, 0.20, 0.05),   # king
+    (0.85, 0.50, 0.10),   # jack
+    (0.80, 0.68, 0.45),   # cripple
+    (0.20, 0.40, 0.80),   # backing
+)
+
+# Spacing used to judge how far apart studs land on screen
+_NOMINAL_SPACING = 16.0
+
+
+def draw_framing_layer(self, cr, zoom_transform):
+    """
+    Draw the stud layout of every wall over the walls.
+
+    Only walls whose box meets the current clip are drawn. At LOD_FULL each stud is a
+    1.5" bar across its wall, scaled like the wall itself, at LOD_SIMPLE a hairline, and once studs would land
+    closer together on screen than LOD_STUD_MIN_PX the layer is skipped. Studs of one
+    kind are stroked as a single path.
+    """
+    detail = level_of_detail(_NOMINAL_SPACING * zoom_transform, lod_thresholds(self.config, "studs"))
+    if detail == LOD_SKIP:
+        return
+    x0, y0, x1, y1 = cr.clip_extents()
+    layouts = self.framing_layout.visible(x0, y0, x1, y1)
+    if not layouts:
+        return
+
+    cr.save()
+    zoom = self.zoom
+    cr.set_line_cap(0)  # 0 = butt cap.
+    # Walls are stroked width / zoom wide (see draw_walls), so studs are STUD_THICKNESS / zoom
+    # thick and span half_width / zoom either side of the centerline, in proportion with them.
+    cr.set_line_width(STUD_THICKNESS / zoom if detail == LOD_FULL else 1.0 / zoom_transform)
+    for kind in range(len(STUD_KINDS)):
+        traced = False
+        for layout in layouts:
+            kinds = layout.kinds
+            if kind not in kinds:
+                continue
+            centers = layout.centers
+            nx, ny = layout.normal
+            reach = layout.half_width / zoom
+            dx, dy = nx * reach, ny * reach
+            for i, stud_kind in enumerate(kinds):
+                if stud_kind == kind:
+                    x, y = centers[2 * i], centers[2 * i + 1]
+                    cr.move_to(x - dx, y - dy)
+                    cr.line_to(x + dx, y + dy)
+                    traced = True
+        if traced:
+            cr.set_source_rgb(*STUD_COLORS[kind])
+            cr.stroke()
+    cr.restore()
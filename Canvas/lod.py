@@ -0,0 +1,36 @@
+LOD_FULL = "full"
+LOD_SIMPLE = "simplified"
+LOD_SKIP = "skip"
+
+# element class -> (config key prefix, default full-detail px, default minimum px)
+LOD_ELEMENTS = {
+    "doors": ("LOD_DOOR", 24.0, 4.0),
+    "windows": ("LOD_WINDOW", 24.0, 4.0),
+    "texts": ("LOD_TEXT", 5.0, 1.5),
+    "dimensions": ("LOD_DIMENSION", 40.0, 6.0),
+    "studs": ("LOD_STUD", 48.0, 6.0),
+}
+
+
+def lod_thresholds(config, element):
+    """
+    Return (full_px, min_px) for an element class ("doors", "windows", "texts", "dimensions", "studs").
+
+    Elements whose projected size is at least full_px are drawn in full, those between
+    min_px and full_px as a simplified glyph, and smaller ones are skipped. With
+    LOD_ENABLED off everything is drawn in full.
+    """
+    if not getattr(config, "LOD_ENABLED", True):
+        return (0.0, 0.0)
+    prefix, full_px, min_px = LOD_ELEMENTS[element]
+    return (getattr(config, f"{prefix}_FULL_PX", full_px), getattr(config, f"{prefix}_MIN_PX", min_px))
+
+
+def level_of_detail(projected_px, thresholds):
+    """Pick LOD_FULL, LOD_SIMPLE or LOD_SKIP for an element covering projected_px device pixels."""
+    full_px, min_px = thresholds
+    if projected_px >= full_px:
+        return LOD_FULL
+    if projected_px >= min_px:
+        return LOD_SIMPLE
+    return LOD_SKIP
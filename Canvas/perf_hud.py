@@ -0,0 +1,113 @@
+import pickle
+import time
+from collections import deque
+
+# Layers reported by on_draw, in drawing order
+HUD_LAYERS = ("grid", "rooms", "walls", "framing", "doors", "windows", "texts", "dimensions", "overlays")
+
+
+class PerfStats:
+    """
+    Rolling frame and hot-path timings for the on-canvas performance HUD.
+
+    on_draw calls begin_frame(), then lap(layer) after each drawing section and
+    end_frame() at the end. Snap queries are timed by wrapping the snapping
+    manager's snap_point while the HUD is on, so there is no cost when it is off.
+    """
+
+    def __init__(self, window=60):
+        self.frames = deque(maxlen=window)
+        self.layers = {name: deque(maxlen=window) for name in HUD_LAYERS}
+        self.snaps = deque(maxlen=window)
+        self._frame_start = 0.0
+        self._lap_start = 0.0
+        self._snap_manager = None
+        self._undo_size = (None, 0)   # (id of last undo snapshot, pickled size in bytes)
+
+    def begin_frame(self):
+        self._frame_start = self._lap_start = time.perf_counter()
+
+    def lap(self, layer):
+        now = time.perf_counter()
+        self.layers[layer].append(now - self._lap_start)
+        self._lap_start = now
+
+    def end_frame(self):
+        self.frames.append(time.perf_counter() - self._frame_start)
+
+    @staticmethod
+    def _average_ms(samples):
+        return 1000.0 * sum(samples) / len(samples) if samples else 0.0
+
+    def frame_ms(self):
+        return self._average_ms(self.frames)
+
+    def layer_ms(self, layer):
+        return self._average_ms(self.layers[layer])
+
+    def snap_ms(self):
+        return self._average_ms(self.snaps)
+
+    def attach_snap_timer(self, snap_manager):
+        """Time every snap_manager.snap_point call until detach_snap_timer()."""
+        if self._snap_manager is snap_manager:
+            return
+        self.detach_snap_timer()
+        snap_point = snap_manager.snap_point
+
+        def timed_snap_point(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return snap_point(*args, **kwargs)
+            finally:
+                self.snaps.append(time.perf_counter() - start)
+
+        snap_manager.snap_point = timed_snap_point
+        self._snap_manager = snap_manager
+
+    def detach_snap_timer(self):
+        if self._snap_manager is not None:
+            # Drop the instance attribute so the class method is used again.
+            self._snap_manager.__dict__.pop("snap_point", None)
+            self._snap_manager = None
+
+    def undo_snapshot_bytes(self, undo_stack):
+        """Pickled size of the newest undo snapshot, measured once per snapshot."""
+        if not undo_stack:
+            return 0
+        state = undo_stack[-1]
+        if self._undo_size[0] != id(state):
+            try:
+                size = len(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL))
+            except Exception:
+                size = 0
+            self._undo_size = (id(state), size)
+        return self._undo_size[1]
+
+
+def draw_perf_hud(self, cr, width, height):
+    """Draw the performance HUD in the top-right corner (device coordinates)."""
+    stats = self.perf_stats
+    frame_ms = stats.frame_ms()
+    lines = [f"frame  {frame_ms:6.2f} ms  ({1000.0 / frame_ms:5.1f} fps)" if frame_ms else "frame       -"]
+    lines.extend(f"{name:<10} {stats.layer_ms(name):6.2f} ms" for name in HUD_LAYERS)
+    lines.append(f"snap       {stats.snap_ms():6.2f} ms")
+    undo_kb = stats.undo_snapshot_bytes(self.undo_stack) / 1024.0
+    lines.append(f"undo snap {undo_kb:8.1f} KB x{len(self.undo_stack)}")
+
+    cr.save()
+    cr.select_font_face("Monospace")
+    cr.set_font_size(11)
+    line_height = 14
+    box_w = 220
+    box_h = line_height * len(lines) + 10
+    x = width - box_w - 10
+    y = getattr(self, "ruler_offset", 0) + 10
+    cr.set_source_rgba(0, 0, 0, 0.7)
+    cr.rectangle(x, y, box_w, box_h)
+    cr.fill()
+    cr.set_source_rgb(0.6, 1, 0.6)
+    for i, line in enumerate(lines):
+        cr.move_to(x + 8, y + 5 + line_height * (i + 1) - 3)
+        cr.show_text(line)
+    cr.restore()
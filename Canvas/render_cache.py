@@ -0,0 +1,54 @@
+class PathCache:
+    """
+    Cache of Cairo paths (from cr.copy_path()) grouped by style, rebuilt when the
+    model version they were built from or the zoom changes.
+
+    copy_path() returns user coordinates, but Cairo stores paths in 24.8 fixed-point
+    device coordinates, so a path recorded zoomed out is off by a visible fraction of
+    a pixel once replayed zoomed in. Each entry therefore remembers the scale of the
+    transform it was recorded under; panning keeps the scale and reuses the paths.
+    """
+
+    def __init__(self):
+        self._entries = {}  # name -> ((version, scale), {style_key: cairo.Path})
+
+    def get(self, name, version, cr, groups, trace):
+        """
+        Return the grouped paths for name, rebuilding them when version changed.
+
+        Args:
+            name (str): Cache slot, e.g. "rooms".
+            version: Model version the paths must correspond to.
+            cr (cairo.Context): Context used to record the paths (must be in model space);
+                its current scale is part of the cache key.
+            groups (callable): groups() -> {style_key: [items]}; only called on rebuild.
+            trace (callable): trace(cr, item) appends one item's geometry to the path.
+
+        Returns:
+            dict: {style_key: cairo.Path}
+        """
+        key = (version, cr.user_to_device_distance(1.0, 0.0))
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        paths = record_paths(cr, groups(), trace)
+        self._entries[name] = (key, paths)
+        return paths
+
+    def invalidate(self, name=None):
+        if name is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(name, None)
+
+
+def record_paths(cr, grouped_items, trace):
+    """Trace each group of items into its own Cairo path and return {style_key: path}."""
+    paths = {}
+    cr.new_path()
+    for key, items in grouped_items.items():
+        for item in items:
+            trace(cr, item)
+        paths[key] = cr.copy_path()
+        cr.new_path()
+    return paths
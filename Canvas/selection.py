@@ -0,0 +1,120 @@
+def selection_key(item_type, obj):
+    """
+    Identity key of a selected object.
+
+    Doors and windows are selected as (wall, obj, ratio) tuples that get replaced when
+    the opening slides along its wall, so they are keyed by the opening itself; room
+    vertices are (room, index) pairs.
+    """
+    if item_type in ("door", "window"):
+        return (item_type, id(obj[1]))
+    if item_type == "vertex":
+        return (item_type, id(obj[0]), obj[1])
+    return (item_type, id(obj))
+
+
+def _item_key(item):
+    return selection_key(item["type"], item["object"])
+
+
+class Selection(list):
+    """
+    The canvas selection: the familiar list of {"type": ..., "object": ...} dicts,
+    plus an identity index and per-type buckets kept in step with every list mutation.
+
+    Membership tests (`item in selection`, has()) are O(1) and of_type() returns one
+    type's items without scanning the rest, so rendering and hit-testing do not get
+    slower as the selection grows. The dock and the selection-changed signal keep
+    receiving a plain list.
+    """
+
+    def __init__(self, items=()):
+        super().__init__()
+        self._counts = {}    # key -> number of entries with that key
+        self._buckets = {}   # type -> {key: item}, in selection order
+        self.extend(items)
+
+    # ───── index maintenance ─────
+    def _index(self, item):
+        key = _item_key(item)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self._buckets.setdefault(item["type"], {})[key] = item
+
+    def _unindex(self, item):
+        key = _item_key(item)
+        count = self._counts.get(key, 0) - 1
+        if count > 0:
+            self._counts[key] = count
+            return
+        self._counts.pop(key, None)
+        bucket = self._buckets.get(item["type"])
+        if bucket is not None:
+            bucket.pop(key, None)
+
+    def _reindex(self):
+        self._counts.clear()
+        self._buckets.clear()
+        for item in self:
+            self._index(item)
+
+    # ───── queries ─────
+    def has(self, item_type, obj):
+        """True if obj is selected as item_type."""
+        return selection_key(item_type, obj) in self._counts
+
+    def __contains__(self, item):
+        return _item_key(item) in self._counts
+
+    def of_type(self, item_type):
+        """The selected items of one type, in selection order."""
+        return list(self._buckets.get(item_type, {}).values())
+
+    def objects(self, item_type):
+        """The selected objects of one type, in selection order."""
+        return [item["object"] for item in self._buckets.get(item_type, {}).values()]
+
+    # ───── list mutators ─────
+    def append(self, item):
+        super().append(item)
+        self._index(item)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        for item in items:
+            self._index(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def insert(self, index, item):
+        super().insert(index, item)
+        self._index(item)
+
+    def remove(self, item):
+        super().remove(item)
+        self._unindex(item)
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._unindex(item)
+        return item
+
+    def clear(self):
+        super().clear()
+        self._counts.clear()
+        self._buckets.clear()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._reindex()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._reindex()
+
+    def __imul__(self, n):
+        super().__imul__(n)
+        self._reindex()
+        return self
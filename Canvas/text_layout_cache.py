@@ -0,0 +1,124 @@
+import math
+from collections import OrderedDict
+
+from gi.repository import Pango, PangoCairo
+
+
+class TextLayoutCache:
+    """
+    LRU cache of laid-out Pango text shared by the canvas texts and dimension labels.
+
+    Entries are keyed by (content, font family, size, style flags, zoom bucket), so a
+    layout is built once and reused across frames until the text or its style changes
+    or the zoom moves into a different bucket. Each zoom bucket gets its own PangoContext
+    whose matrix matches that zoom, so glyph metrics stay accurate for the scale the
+    layout is drawn at.
+    """
+
+    # Zoom buckets per doubling of the zoom level
+    BUCKETS_PER_OCTAVE = 4
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()   # key -> (layout, width, height)
+        # id(obj) -> (obj, key), for invalidation by object. Holding obj keeps its id from
+        # being reused by another object; the map is an LRU bounded like _entries.
+        self._keys_by_object = OrderedDict()
+        self._contexts = {}             # zoom bucket -> Pango.Context
+        self.hits = 0
+        self.misses = 0
+
+    def zoom_bucket(self, zoom):
+        if zoom <= 0:
+            return 0
+        return round(math.log2(zoom) * self.BUCKETS_PER_OCTAVE)
+
+    def _context_for_bucket(self, bucket):
+        context = self._contexts.get(bucket)
+        if context is None:
+            context = PangoCairo.FontMap.get_default().create_context()
+            scale = 2.0 ** (bucket / self.BUCKETS_PER_OCTAVE)
+            matrix = Pango.Matrix()
+            matrix.xx = matrix.yy = scale
+            matrix.xy = matrix.yx = matrix.x0 = matrix.y0 = 0.0
+            context.set_matrix(matrix)
+            self._contexts[bucket] = context
+        return context
+
+    def get_layout(self, content, font_family="Sans", size=12.0, bold=False, italic=False,
+                   underline=False, zoom=1.0, absolute_size=False, owner=None):
+        """
+        Return (layout, width, height) for the given text, building it on a cache miss.
+
+        Args:
+            content (str): The text to lay out.
+            font_family (str): Pango font family name.
+            size (float): Font size in points, or in pixels when absolute_size is True.
+            bold, italic, underline (bool): Style flags.
+            zoom (float): Zoom level the layout is drawn at; selects the zoom bucket.
+            absolute_size (bool): Interpret size as device pixels instead of points.
+            owner: Optional model object (Text, Dimension) the layout belongs to, so
+                invalidate(owner) can drop it when the object is edited.
+
+        Returns:
+            tuple: (Pango.Layout, logical width, logical height) in layout units (pixels).
+        """
+        bucket = self.zoom_bucket(zoom)
+        key = (content, font_family, size, bold, italic, underline, absolute_size, bucket)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        else:
+            self.misses += 1
+            layout = Pango.Layout.new(self._context_for_bucket(bucket))
+            layout.set_text(content, -1)
+            desc = Pango.FontDescription.from_string(font_family)
+            if absolute_size:
+                desc.set_absolute_size(size * Pango.SCALE)
+            else:
+                desc.set_size(int(size * Pango.SCALE))
+            if bold:
+                desc.set_weight(Pango.Weight.BOLD)
+            if italic:
+                desc.set_style(Pango.Style.ITALIC)
+            layout.set_font_description(desc)
+            if underline:
+                attr_list = Pango.AttrList()
+                attr_list.insert(Pango.attr_underline_new(Pango.Underline.SINGLE))
+                layout.set_attributes(attr_list)
+            ink_rect, logical_rect = layout.get_extents()
+            entry = (layout, logical_rect.width / Pango.SCALE, logical_rect.height / Pango.SCALE)
+            self._entries[key] = entry
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        if owner is not None:
+            owners = self._keys_by_object
+            owners[id(owner)] = (owner, key)
+            owners.move_to_end(id(owner))
+            if len(owners) > self.max_entries:
+                owners.popitem(last=False)
+        return entry
+
+    def get_text_layout(self, text, zoom=1.0):
+        """Convenience wrapper returning the cached layout for a Text object."""
+        return self.get_layout(text.content, text.font_family, text.font_size,
+                               text.bold, text.italic, text.underline, zoom, owner=text)
+
+    def invalidate(self, objects):
+        """Drop the cached layouts of the given model objects (e.g. after a dock edit)."""
+        if not isinstance(objects, (list, tuple)):
+            objects = [objects]
+        for obj in objects:
+            owned = self._keys_by_object.get(id(obj))
+            if owned is not None and owned[0] is obj:
+                del self._keys_by_object[id(obj)]
+                self._entries.pop(owned[1], None)
+
+    def clear(self):
+        self._entries.clear()
+        self._keys_by_object.clear()
+        self._contexts.clear()
+
+    def __len__(self):
+        return len(self._entries)
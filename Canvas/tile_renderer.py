@@ -0,0 +1,182 @@
+import math
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import cairo
+
+from Canvas.wall_room_renderer import wall_strokes, stroke_walls, _room_style
+
+
+class GeometrySnapshot:
+    """
+    Immutable copy of the committed rooms and walls, safe to read from worker threads.
+
+    Every element keeps its model-space bounding box so a tile only traces what
+    overlaps it.
+    """
+
+    def __init__(self, wall_sets, rooms, version):
+        self.version = version
+        # (bbox of the centre line, (width, points, closed))
+        self.walls = tuple(
+            (_bbox(points, 0.0), (width, points, closed))
+            for width, points, closed in wall_strokes(wall_sets)
+        )
+        self.max_wall_width = max((stroke[0] for bbox, stroke in self.walls), default=0.0)
+        # (bbox, style, points), outlines oriented the same way as in wall_room_renderer
+        rooms_out = []
+        for room in rooms:
+            if not room.points:
+                continue
+            points = tuple(room.points)
+            signed_area = 0.0
+            for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+                signed_area += x1 * y2 - x2 * y1
+            if signed_area < 0:
+                points = points[::-1]
+            rooms_out.append((_bbox(points, 0.0), _room_style(room), points))
+        self.rooms = tuple(rooms_out)
+
+
+def _bbox(points, pad):
+    xs = [pt[0] for pt in points]
+    ys = [pt[1] for pt in points]
+    return (min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad)
+
+
+def _overlaps(bbox, rect):
+    return bbox[0] <= rect[2] and bbox[2] >= rect[0] and bbox[1] <= rect[3] and bbox[3] >= rect[1]
+
+
+class TileRenderer:
+    """
+    Rasterizes the committed rooms and walls into fixed-size device tiles on a thread pool.
+
+    Tiles are anchored to the model origin at the current zoom, so panning reuses every
+    tile that stays visible and only newly exposed tiles are rendered. Tiles are cached
+    by (zoom, tile x, tile y, geometry version); editing walls or rooms bumps the version
+    and the stale tiles are dropped. Cairo releases the GIL while it rasterizes, so the
+    tiles of one frame render in parallel.
+    """
+
+    def __init__(self, tile_size=256, max_tiles=512, workers=0):
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.workers = workers or os.cpu_count() or 2
+        self._executor = None
+        self._tiles = OrderedDict()   # (zoom, ix, iy, version) -> cairo.ImageSurface
+        self._snapshot = None
+        self.rendered = 0
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="canvas-tile")
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def invalidate(self):
+        self._tiles.clear()
+        self._snapshot = None
+
+    def snapshot(self, canvas):
+        """Return the geometry snapshot for the document's current wall/room versions."""
+        document = canvas.document
+        version = (document.version("walls"), document.version("rooms"))
+        if self._snapshot is None or self._snapshot.version != version:
+            self._snapshot = GeometrySnapshot(document.wall_sets, document.rooms, version)
+            # Tiles of older versions can never be hit again.
+            for key in [k for k in self._tiles if k[3] != version]:
+                del self._tiles[key]
+        return self._snapshot
+
+    def composite(self, canvas, cr, width, height):
+        """Paint the visible tiles onto cr (any transform), rendering the missing ones first."""
+        pixels_per_inch = getattr(canvas.config, "PIXELS_PER_INCH", 2.0)
+        zoom_transform = canvas.zoom * pixels_per_inch
+        snapshot = self.snapshot(canvas)
+        size = self.tile_size
+
+        ix0 = math.floor(-canvas.offset_x / size)
+        ix1 = math.floor((width - canvas.offset_x) / size)
+        iy0 = math.floor(-canvas.offset_y / size)
+        iy1 = math.floor((height - canvas.offset_y) / size)
+
+        visible = []
+        pending = {}
+        for iy in range(iy0, iy1 + 1):
+            for ix in range(ix0, ix1 + 1):
+                key = (canvas.zoom, ix, iy, snapshot.version)
+                visible.append(key)
+                if key in self._tiles:
+                    self._tiles.move_to_end(key)
+                else:
+                    pending[key] = self._pool().submit(
+                        self._render_tile, snapshot, ix, iy, zoom_transform, canvas.zoom
+                    )
+        if pending:
+            wait(pending.values())
+            for key, future in pending.items():
+                self._tiles[key] = future.result()
+                self.rendered += 1
+            while len(self._tiles) > max(self.max_tiles, len(visible)):
+                self._tiles.popitem(last=False)
+
+        # Tiles are placed on whole pixels so neighbouring tiles do not leave resampling seams.
+        origin_x = round(canvas.offset_x)
+        origin_y = round(canvas.offset_y)
+        cr.save()
+        cr.identity_matrix()
+        for key in visible:
+            surface = self._tiles.get(key)
+            if surface is None:
+                continue
+            _, ix, iy, _ = key
+            cr.set_source_surface(surface, ix * size + origin_x, iy * size + origin_y)
+            cr.paint()
+        cr.restore()
+
+    def _render_tile(self, snapshot, ix, iy, zoom_transform, zoom):
+        size = self.tile_size
+        surface = cairo.ImageSurface(cairo.FORMAT_ARGB32, size, size)
+        cr = cairo.Context(surface)
+        cr.translate(-ix * size, -iy * size)
+        cr.scale(zoom_transform, zoom_transform)
+        # Model-space rectangle covered by this tile
+        rect = (ix * size / zoom_transform, iy * size / zoom_transform,
+                (ix + 1) * size / zoom_transform, (iy + 1) * size / zoom_transform)
+
+        # Rooms: one fill and one stroke per style, as in draw_rooms
+        groups = {}
+        for bbox, style, points in snapshot.rooms:
+            if _overlaps(bbox, rect):
+                groups.setdefault(style, []).append(points)
+        cr.set_line_width(1.0 / zoom_transform)
+        for (fill_color, stroke_color), outlines in groups.items():
+            cr.new_path()
+            for points in outlines:
+                cr.move_to(points[0][0], points[0][1])
+                for pt in points[1:]:
+                    cr.line_to(pt[0], pt[1])
+                cr.close_path()
+            cr.set_source_rgb(*fill_color)
+            cr.fill_preserve()
+            cr.set_source_rgb(*stroke_color)
+            cr.stroke()
+
+        # Walls, as in draw_walls
+        cr.set_source_rgb(0, 0, 0)
+        cr.set_line_join(cairo.LINE_JOIN_MITER)
+        cr.set_line_cap(cairo.LINE_CAP_BUTT)
+        cr.set_miter_limit(10.0)
+        # Wall widths are drawn as width / zoom model units; pad by the miter limit
+        # (half width times 10) so joints reaching into this tile are included.
+        pad = 5.0 * snapshot.max_wall_width / zoom
+        wall_rect = (rect[0] - pad, rect[1] - pad, rect[2] + pad, rect[3] + pad)
+        stroke_walls(cr, (stroke for bbox, stroke in snapshot.walls if _overlaps(bbox, wall_rect)), zoom)
+        surface.flush()
+        return surface
@@ -1,57 +1,71 @@
+def wall_strokes(wall_sets, close_loops=True):
+    """
+    Split ordered wall chains into strokes that Cairo can miter as one path.
 
-
-def draw_walls(self, cr):
-    cr.set_source_rgb(0, 0, 0) # Black lines.
-    cr.set_line_join(0) # 0 = miter join.
-    cr.set_line_cap(0) # 0 = butt cap.
-    cr.set_miter_limit(10.0)
-    # Draw wall sets (connected components)
-    for wall_set in self.wall_sets:
+    Consecutive walls are bundled while they are connected and share a width.
+    Yields (width, points, closed) with points as a tuple of (x, y) vertices;
+    closed is set when the chain's last wall ends where its first one starts.
+    """
+    for wall_set in wall_sets:
         if not wall_set:
             continue
-        
-        # We need to act like a single path for mitering to work on connected segments.
-        # Assumptions: 
+        # Assumptions:
         # 1. Walls in a set are ordered (verified in canvas_events.py).
         # 2. We only bundle them into one stroke if they share the same width.
-        
-        # Start the first path
-        current_width_user = wall_set[0].width / self.zoom
-        cr.set_line_width(current_width_user)
-        cr.move_to(wall_set[0].start[0], wall_set[0].start[1])
-        cr.line_to(wall_set[0].end[0], wall_set[0].end[1])
-        
+        current_width = wall_set[0].width
+        points = [wall_set[0].start, wall_set[0].end]
         for i in range(1, len(wall_set)):
             wall = wall_set[i]
             prev_wall = wall_set[i-1]
-            
-            # Check if connected
             # We use a small epsilon for float comparison, though exact match is likely.
-            connected = (abs(prev_wall.end[0] - wall.start[0]) < 1e-6 and 
+            connected = (abs(prev_wall.end[0] - wall.start[0]) < 1e-6 and
                          abs(prev_wall.end[1] - wall.start[1]) < 1e-6)
-            
-            width_user = wall.width / self.zoom
-            
-            if connected and abs(width_user - current_width_user) < 1e-6:
+            if connected and abs(wall.width - current_width) < 1e-6:
                 # Continue the path
-                cr.line_to(wall.end[0], wall.end[1])
+                points.append(wall.end)
             else:
-                # Stroke what we have and start new
-                cr.stroke()
-                
-                # Setup next
-                current_width_user = width_user
-                cr.set_line_width(current_width_user)
-                cr.move_to(wall.start[0], wall.start[1])
-                cr.line_to(wall.end[0], wall.end[1])
-        
-        # Stroke the final sequence
+                # Emit what we have and start new
+                yield current_width, tuple(points), False
+                current_width = wall.width
+                points = [wall.start, wall.end]
         # Check if closed loop
-        if len(wall_set) > 1 and abs(wall_set[-1].end[0] - wall_set[0].start[0]) < 1e-6 and abs(wall_set[-1].end[1] - wall_set[0].start[1]) < 1e-6:
-             cr.close_path()
+        closed = (close_loops and len(wall_set) > 1 and
+                  abs(wall_set[-1].end[0] - wall_set[0].start[0]) < 1e-6 and
+                  abs(wall_set[-1].end[1] - wall_set[0].start[1]) < 1e-6)
+        yield current_width, tuple(points), closed
+
+
+def stroke_walls(cr, strokes, zoom):
+    """Stroke (width, points, closed) wall strokes; widths are divided by zoom like draw_walls."""
+    for width, points, closed in strokes:
+        cr.set_line_width(width / zoom)
+        cr.move_to(points[0][0], points[0][1])
+        for pt in points[1:]:
+            cr.line_to(pt[0], pt[1])
+        if closed:
+            cr.close_path()
         cr.stroke()
 
-    # Draw loose walls (temp/preview list usually empty or separate; just in case)
+
+# Walls are stroked with miter joins, limited to this ratio of miter length to width
+WALL_MITER_LIMIT = 10.0
+
+
+def _begin_walls(cr):
+    cr.set_source_rgb(0, 0, 0) # Black lines.
+    cr.set_line_join(0) # 0 = miter join.
+    cr.set_line_cap(0) # 0 = butt cap.
+    cr.set_miter_limit(WALL_MITER_LIMIT)
+
+
+def draw_walls(self, cr):
+    _begin_walls(cr)
+    # Draw wall sets (connected components); each chain is one mitered path
+    stroke_walls(cr, wall_strokes(self.wall_sets), self.zoom)
+    draw_active_wall_chain(self, cr)
+
+
+def draw_active_wall_chain(self, cr):
     # Draw active drawing chain (self.walls + current_wall)
     # We combine them temporarily to allow the rubber-band segment to miter with the last fixated segment.
     active_chain = []
@@ -61,48 +75,63 @@ def draw_walls(self, cr):
         active_chain.append(self.current_wall)
     
     if active_chain:
-        # Same logic as above for the active chain
-        current_width_user = active_chain[0].width / self.zoom
-        cr.set_line_width(current_width_user)
-        cr.move_to(active_chain[0].start[0], active_chain[0].start[1])
-        cr.line_to(active_chain[0].end[0], active_chain[0].end[1])
-        
-        for i in range(1, len(active_chain)):
-            wall = active_chain[i]
-            prev_wall = active_chain[i-1]
-            
-            connected = (abs(prev_wall.end[0] - wall.start[0]) < 1e-6 and 
-                         abs(prev_wall.end[1] - wall.start[1]) < 1e-6)
-            
-            width_user = wall.width / self.zoom
-            
-            if connected and abs(width_user - current_width_user) < 1e-6:
-                cr.line_to(wall.end[0], wall.end[1])
-            else:
-                cr.stroke()
-                current_width_user = width_user
-                cr.set_line_width(current_width_user)
-                cr.move_to(wall.start[0], wall.start[1])
-                cr.line_to(wall.end[0], wall.end[1])
-        
-        cr.stroke()
+        _begin_walls(cr)
+        stroke_walls(cr, wall_strokes([active_chain], close_loops=False), self.zoom)
+
+
+ROOM_FILL_COLOR = (0.9, 0.9, 1)   # light blue fill.
+ROOM_STROKE_COLOR = (0, 0, 0)
+
+
+def _room_style(room):
+    return (getattr(room, "fill_color", ROOM_FILL_COLOR), getattr(room, "stroke_color", ROOM_STROKE_COLOR))
+
+
+def _group_rooms_by_style(rooms):
+    groups = {}
+    for room in rooms:
+        if room.points:
+            groups.setdefault(_room_style(room), []).append(room)
+    return groups
+
+
+def _trace_room(cr, room):
+    points = room.points
+    # Trace every outline with the same orientation so overlapping rooms in one
+    # batched path still fill under the nonzero winding rule.
+    signed_area = 0.0
+    for (x1, y1), (x2, y2) in zip(points, points[1:] + points[:1]):
+        signed_area += x1 * y2 - x2 * y1
+    if signed_area < 0:
+        points = points[::-1]
+    cr.move_to(points[0][0], points[0][1])
+    for pt in points[1:]:
+        cr.line_to(pt[0], pt[1])
+    cr.close_path()
 
 
 def draw_rooms(self, cr, zoom_transform):
-    cr.set_source_rgb(0.9, 0.9, 1)  # light blue fill.
+    # One fill and one stroke per (fill, stroke) colour group; the grouped paths
+    # are cached in model space and rebuilt only when the rooms change.
+    paths = self.path_cache.get(
+        "rooms", self.document.version("rooms"), cr,
+        lambda: _group_rooms_by_style(self.rooms), _trace_room
+    )
+    cr.save()
     cr.set_line_width(1.0 / zoom_transform)
-    for room in self.rooms:
-        if room.points:
-            cr.save()
-            cr.move_to(room.points[0][0], room.points[0][1])
-            for pt in room.points[1:]:
-                cr.line_to(pt[0], pt[1])
-            cr.close_path()
-            cr.fill_preserve()
-            cr.set_source_rgb(0, 0, 0)
-            cr.stroke()
-            cr.restore()
+    for (fill_color, stroke_color), path in paths.items():
+        cr.new_path()
+        cr.append_path(path)
+        cr.set_source_rgb(*fill_color)
+        cr.fill_preserve()
+        cr.set_source_rgb(*stroke_color)
+        cr.stroke()
+    cr.restore()
+
+    draw_room_preview(self, cr, zoom_transform)
+
 
+def draw_room_preview(self, cr, zoom_transform):
     if self.tool_mode == "draw_rooms" and self.current_room_points:
         cr.save()
         cr.set_source_rgb(0, 0, 1)
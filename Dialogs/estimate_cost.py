@@ -1,26 +1,82 @@
 import gi
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk
+from Takeoff.cut_list import plate_cut_lists
+from Takeoff.cost_engine import finish_lines, framing_lines, sheet_lines
 
-def create_estimate_cost_dialog(parent):
+
+def _money(value):
+    return f"${value:,.2f}"
+
+
+def create_estimate_cost_dialog(parent, canvas):
+    """
+    Display the priced takeoff for the project.
+
+    Args:
+        parent: Parent window.
+        canvas: Reference to CanvasArea, whose takeoff and cost engines are reused
+            so only lines that changed since the last estimate are re-priced.
+    """
     dialog = Gtk.Dialog(
         title="Estimate Cost",
         transient_for=parent,
         modal=True
     )
-    dialog.set_default_size(400, 300)  # Same size as other dialogs for consistency
+    dialog.set_default_size(600, 400)
 
-    # Add a simple message
     content_area = dialog.get_content_area()
-    label = Gtk.Label(label="Estimate Cost - Coming Soon")
-    label.set_margin_top(20)
-    label.set_margin_bottom(20)
-    label.set_margin_start(20)
-    label.set_margin_end(20)
-    content_area.append(label)
+    content_area.set_margin_top(20)
+    content_area.set_margin_bottom(20)
+    content_area.set_margin_start(20)
+    content_area.set_margin_end(20)
+
+    framing = canvas.framing_takeoff.estimate()
+    plates = plate_cut_lists(framing, kerf=getattr(canvas.config, "SAW_KERF_INCHES", 0.125))
+    rooms = canvas.room_takeoff.estimate()
+    sheets = canvas.sheet_takeoff.estimate()
+    lines = framing_lines(framing, plates) + sheet_lines(sheets) + finish_lines(rooms, wall_sheets=True)
+    estimate = canvas.cost_engine.price(lines)
+
+    scrolled_window = Gtk.ScrolledWindow()
+    scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+    scrolled_window.set_min_content_height(260)
+    scrolled_window.set_vexpand(True)
+    content_area.append(scrolled_window)
+
+    grid = Gtk.Grid(column_spacing=16, row_spacing=4)
+    scrolled_window.set_child(grid)
+
+    for column, heading in enumerate(["Item", "Qty", "Unit", "Unit Price", "Cost"]):
+        label = Gtk.Label()
+        label.set_markup(f"<b>{heading}</b>")
+        label.set_xalign(0)
+        grid.attach(label, column, 0, 1, 1)
+
+    for row, (line, entry, cost) in enumerate(estimate.lines, start=1):
+        unit_price = _money(entry.unit_price) if entry is not None else "not in catalog"
+        for column, text in enumerate([line.description, str(line.quantity), line.unit, unit_price, _money(cost)]):
+            label = Gtk.Label(label=text)
+            label.set_xalign(0)
+            grid.attach(label, column, row, 1, 1)
+
+    labor_rate = float(getattr(canvas.config, "LABOR_COST_PER_HOUR", 50.0))
+    tax_rate = float(getattr(canvas.config, "TAX_RATE_PERCENTAGE", 8.0))
+    totals = (
+        f"\nMaterials: {_money(estimate.material)}"
+        f"\nLabor: {estimate.labor_hours:g} h @ {_money(labor_rate)}/h = {_money(estimate.labor)}"
+        f"\nTax ({tax_rate:g}%): {_money(estimate.tax)}"
+        f"\n<b>Total: {_money(estimate.total)}</b>"
+    )
+    if estimate.unpriced:
+        totals += f"\n{len(estimate.unpriced)} item(s) have no catalog price and are not included."
+    totals_label = Gtk.Label()
+    totals_label.set_markup(totals)
+    totals_label.set_halign(Gtk.Align.START)
+    content_area.append(totals_label)
 
     # Add an OK button to close the dialog
     dialog.add_button("OK", Gtk.ResponseType.OK)
     dialog.connect("response", lambda d, r: d.destroy())
 
-    return dialog
\ No newline at end of file
+    return dialog
@@ -1,7 +1,7 @@
 import gi
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk
-from Takeoff.framing_takeoff import FramingEstimator
+from Takeoff.cut_list import plate_cut_lists
 
 
 def create_estimate_materials_dialog(parent, canvas):
@@ -25,51 +25,38 @@ def create_estimate_materials_dialog(parent, canvas):
     content_area.set_margin_start(20)
     content_area.set_margin_end(20)
 
-    # Build walls_with_openings map from canvas doors/windows
-    walls_with_openings = {}
-    for door_item in canvas.doors:
-        wall, door, ratio = door_item
-        wall_id = wall.identifier
-        if wall_id not in walls_with_openings:
-            walls_with_openings[wall_id] = {"doors": [], "windows": []}
-        walls_with_openings[wall_id]["doors"].append(door)
-
-    for window_item in canvas.windows:
-        wall, window, ratio = window_item
-        wall_id = wall.identifier
-        if wall_id not in walls_with_openings:
-            walls_with_openings[wall_id] = {"doors": [], "windows": []}
-        walls_with_openings[wall_id]["windows"].append(window)
-
-    # Calculate estimates
-    estimates = FramingEstimator.estimate_all_walls(canvas.wall_sets, walls_with_openings)
+    # Only walls that changed since the last estimate are recomputed
+    estimates = canvas.framing_takeoff.estimate()
+    
+    # Plates are ordered per board from the optimized cut list, not from the summed length
+    cut_lists = plate_cut_lists(estimates, kerf=getattr(canvas.config, "SAW_KERF_INCHES", 0.125))
     
     label_string = """<b>Framing Material Estimate</b>"""
     
     for key, value in estimates.items():
         if not value:
             continue
-        if key in ["wall_details", "wall_plates_length"]:
-            continue
         if "studs" in key:
-            label_string = f"{key}: {value}\n"
-        elif "top_plates" in key or "bottom_plates" in key:
-            if "2x4" in key:
-                nominal_width = 4
-            elif "2x6" in key:
-                nominal_width = 6
-            elif "2x8" in key:
-                nominal_width = 8
-            else:
-                nominal_width = 4  # Default to 2x4 if unknown
-            
-            pieces = int(value // estimates['wall_plates_length']) + 1
-            plate_length_feet = int(estimates['wall_plates_length'] / 12)
-            
+            label_string += f"\n{key}: {value}"
+    
+    for size, plan in cut_lists.items():
+        nominal_width = size.split("x")[1]
+        for stock_length, pieces in plan.counts().items():
             label_string += (
-            f"\n{key}: {pieces} --- 2 x {nominal_width}"
-            f" x {plate_length_feet}"
-        )
+                f"\n{size} plates: {pieces} --- 2 x {nominal_width}"
+                f" x {int(stock_length / 12)}"
+            )
+        label_string += f"\n{size} plate offcuts: {plan.waste / 12:.1f} ft"
+
+    # Drywall and sheathing panels, laid out per wall face with offcuts reused across walls
+    sheets = canvas.sheet_takeoff.estimate()
+    label_string += "\n\n<b>Sheet Goods Estimate</b>"
+    for kind, title in (("interior", "Drywall"), ("exterior", "Sheathing")):
+        plan = sheets[kind]
+        for (width, height), count in plan.counts.items():
+            label_string += f"\n{title} {int(width / 12)}x{int(height / 12)}: {count}"
+        if plan.panels:
+            label_string += f"\n{title} waste: {plan.waste / 144:.0f} sq ft ({plan.waste_pct:.1f}%)"
 
     # Display results
     label = Gtk.Label()
@@ -1,13 +1,198 @@
 import gi
+from collections import OrderedDict
 
 gi.require_version('Gtk', '4.0')
-from gi.repository import Gtk
+from gi.repository import Gtk, Gio, GObject
+from material_library import get_material_library
+from Takeoff.cut_list import STOCK_LENGTHS
+from Takeoff.cost_engine import PriceEntry, get_price_catalog
+
+
+class MaterialItem(GObject.Object):
+    """A library Material wrapped for Gtk list models."""
+
+    def __init__(self, material):
+        super().__init__()
+        self.material = material
+
+
+class MaterialListModel(GObject.Object, Gio.ListModel):
+    """
+    Gio.ListModel over the material library that loads rows a page at a time.
+
+    Only the row count is queried up front; get_item() fetches the page holding the
+    requested position and keeps the most recently used pages, so a ListView over
+    tens of thousands of SKUs only ever materializes the rows near the viewport.
+    """
+
+    PAGE_SIZE = 200
+    MAX_PAGES = 16
+
+    def __init__(self, library):
+        super().__init__()
+        self.library = library
+        self.category = None
+        self.search = None
+        self._pages = OrderedDict()
+        self._count = library.count()
+
+    def do_get_item_type(self):
+        return MaterialItem.__gtype__
+
+    def do_get_n_items(self):
+        return self._count
+
+    def do_get_item(self, position):
+        if position >= self._count:
+            return None
+        index, offset = divmod(position, self.PAGE_SIZE)
+        page = self._pages.get(index)
+        if page is None:
+            page = [MaterialItem(material) for material in
+                    self.library.page(index * self.PAGE_SIZE, self.PAGE_SIZE, self.category, self.search)]
+            self._pages[index] = page
+            if len(self._pages) > self.MAX_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(index)
+        return page[offset] if offset < len(page) else None
+
+    def set_filter(self, category=None, search=None):
+        removed = self._count
+        self.category = category or None
+        self.search = search or None
+        self._pages.clear()
+        self._count = self.library.count(self.category, self.search)
+        self.items_changed(0, removed, self._count)
+
+    def replace(self, material):
+        """Show an edited material in place if its page is loaded."""
+        for index, page in self._pages.items():
+            for offset, item in enumerate(page):
+                if item.material.sku == material.sku:
+                    page[offset] = MaterialItem(material)
+                    self.items_changed(index * self.PAGE_SIZE + offset, 1, 1)
+                    return
+
+
+def _format_dimension(value):
+    return "" if value is None else f"{value:g}\""
+
+
+# (title, text of a Material) for the library columns
+_LIBRARY_COLUMNS = (
+    ("SKU", lambda m: m.sku),
+    ("Name", lambda m: m.name),
+    ("Category", lambda m: m.category),
+    ("Size", lambda m: " x ".join(_format_dimension(v) for v in (m.thickness, m.width, m.length) if v is not None)),
+    ("Unit", lambda m: m.unit),
+    ("Price", lambda m: f"${m.unit_price:,.2f}"),
+)
+
+
+def _library_column(title, text_of):
+    factory = Gtk.SignalListItemFactory()
+
+    def on_setup(factory, list_item):
+        label = Gtk.Label()
+        label.set_xalign(0)
+        list_item.set_child(label)
+
+    def on_bind(factory, list_item):
+        item = list_item.get_item()
+        list_item.get_child().set_text(text_of(item.material) if item is not None else "")
+
+    factory.connect("setup", on_setup)
+    factory.connect("bind", on_bind)
+    column = Gtk.ColumnViewColumn(title=title, factory=factory)
+    column.set_resizable(True)
+    return column
+
+
+def _create_library_section(library, pending):
+    """Search, category filter, the paged material list and a price editor for the selected row."""
+    box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+    box.set_margin_start(10)
+    box.set_margin_end(10)
+
+    title = Gtk.Label()
+    title.set_markup("<b>Material Library</b>")
+    title.set_xalign(0)
+    box.append(title)
+
+    filter_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+    search_entry = Gtk.SearchEntry()
+    search_entry.set_hexpand(True)
+    filter_row.append(search_entry)
+    category_combo = Gtk.ComboBoxText()
+    category_combo.append("", "All categories")
+    for category in library.categories():
+        category_combo.append(category, category.title())
+    category_combo.set_active_id("")
+    filter_row.append(category_combo)
+    box.append(filter_row)
+
+    model = MaterialListModel(library)
+    selection = Gtk.SingleSelection(model=model)
+    column_view = Gtk.ColumnView(model=selection)
+    for column_title, text_of in _LIBRARY_COLUMNS:
+        column_view.append_column(_library_column(column_title, text_of))
+
+    list_window = Gtk.ScrolledWindow()
+    list_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
+    list_window.set_min_content_height(280)
+    list_window.set_vexpand(True)
+    list_window.set_child(column_view)
+    box.append(list_window)
+
+    def on_filter_changed(*args):
+        model.set_filter(category_combo.get_active_id(), search_entry.get_text().strip())
+
+    search_entry.connect("search-changed", on_filter_changed)
+    category_combo.connect("changed", on_filter_changed)
+
+    # Price editor for the selected material; edits are saved when the dialog is confirmed
+    edit_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
+    edit_row.append(Gtk.Label(label="Unit price ($):"))
+    price_entry = Gtk.Entry()
+    price_entry.set_width_chars(8)
+    edit_row.append(price_entry)
+    edit_row.append(Gtk.Label(label="Labor (h/unit):"))
+    labor_entry = Gtk.Entry()
+    labor_entry.set_width_chars(6)
+    edit_row.append(labor_entry)
+    apply_button = Gtk.Button(label="Set")
+    edit_row.append(apply_button)
+    box.append(edit_row)
+
+    def on_selection_changed(selection, *args):
+        item = selection.get_selected_item()
+        if item is not None:
+            price_entry.set_text(f"{item.material.unit_price:g}")
+            labor_entry.set_text(f"{item.material.labor_hours:g}")
+
+    def on_apply(button):
+        item = selection.get_selected_item()
+        if item is None:
+            return
+        try:
+            edited = item.material._replace(unit_price=float(price_entry.get_text()),
+                                            labor_hours=float(labor_entry.get_text()))
+        except ValueError:
+            return
+        pending[edited.sku] = edited
+        model.replace(edited)
+
+    selection.connect("selection-changed", on_selection_changed)
+    apply_button.connect("clicked", on_apply)
+    return box
+
 
 def create_manage_materials_dialog(parent, config_constants, canvas):
     dialog = Gtk.Dialog(title=config_constants.MANAGE_MATERIALS_TITLE,
                         transient_for=parent,
                         modal=True)
-    dialog.set_default_size(420, 180)  # Set a reasonable default size
+    dialog.set_default_size(640, 560)  # Room for the material library list
     dialog.add_buttons(config_constants.OK_LABEL, Gtk.ResponseType.OK,
                        config_constants.CANCEL_LABEL, Gtk.ResponseType.CANCEL)
     
@@ -16,7 +201,7 @@ def create_manage_materials_dialog(parent, config_constants, canvas):
     # Add scrolling capability with a larger viewport
     scrolled_window = Gtk.ScrolledWindow()
     scrolled_window.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.AUTOMATIC)
-    scrolled_window.set_min_content_height(400)  # Make sure the viewport is large
+    scrolled_window.set_min_content_height(120)
     scrolled_window.set_min_content_width(580)
     content_area.append(scrolled_window)
     
@@ -48,7 +233,7 @@ def create_manage_materials_dialog(parent, config_constants, canvas):
     
     # Group 2: Dropdown Menus
     dropdowns = [
-        ("Max wall plate length (inches)", "MAX_WALL_PLATE_INCHES", ["96", "120", "144", "168", "192", "240"]),
+        ("Max wall plate length (inches)", "MAX_WALL_PLATE_INCHES", [str(length) for length in STOCK_LENGTHS]),
     ]
     
     dropdown_widgets = {}
@@ -82,22 +267,37 @@ def create_manage_materials_dialog(parent, config_constants, canvas):
         grid.attach(switch, 1, row, 1, 1)
         row += 1
     
+    # Material library browser; price edits wait in pending until OK
+    library = get_material_library(config_constants)
+    pending = {}
+    content_area.append(_create_library_section(library, pending))
+    
     # Apply changes: update the config and also force a redraw of the canvas
     def update_config():
+        if pending:
+            library.upsert(pending.values())
+            # The cost engines re-price only the lines that use these items
+            catalog = get_price_catalog(config_constants)
+            for material in pending.values():
+                catalog.set_price(PriceEntry(material.sku, material.name, material.unit,
+                                             material.unit_price, material.labor_hours))
+        values = {}
         for key, entry in numeric_entries.items():
             try:
-                setattr(config_constants, key, float(entry.get_text()))
+                values[key] = float(entry.get_text())
             except ValueError:
                 pass
         
         for key, combo in dropdown_widgets.items():
             try:
-                setattr(config_constants, key, int(combo.get_active_id()))
+                values[key] = int(combo.get_active_id())
             except Exception:
-                setattr(config_constants, key, combo.get_active_id())
+                values[key] = combo.get_active_id()
         
         for key, switch in switches.items():
-            setattr(config_constants, key, switch.get_active())
+            values[key] = switch.get_active()
+        # One update, so listeners hear about all changed settings at once
+        config_constants.update(values)
         canvas.queue_draw()
     
     dialog.connect("response", lambda d, response: update_config() if response == Gtk.ResponseType.OK else None)
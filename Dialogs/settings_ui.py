@@ -3,6 +3,9 @@ import gi
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk
 
+import config
+
+
 def create_settings_dialog(parent, config_constants, canvas):
     dialog = Gtk.Dialog(title=config_constants.SETTINGS_TITLE,
                         transient_for=parent,
@@ -87,7 +90,9 @@ def create_settings_dialog(parent, config_constants, canvas):
         ("Enable Snapping", "SNAP_ENABLED"),
         ("Show Grid", "SHOW_GRID"),
         ("Show Properties Panel", "SHOW_PROPERTIES_PANEL"),
+        ("Show Estimate Panel", "SHOW_ESTIMATE_PANEL"),
         ("Show Rulers", "SHOW_RULERS"),
+        ("Show Framing Layer", "SHOW_FRAMING_LAYER"),
         ("Enable Auto Save", "ENABLE_AUTO_SAVE"),
         ("Show Measurement Hints", "SHOW_MEASUREMENT_HINTS"),
         ("Enable Centerline Snapping", "ENABLE_CENTERLINE_SNAPPING"),
@@ -101,7 +106,7 @@ def create_settings_dialog(parent, config_constants, canvas):
         lbl.set_xalign(0)
         grid.attach(lbl, 0, row, 1, 1)
         switch = Gtk.Switch()
-        switch.set_active(getattr(config_constants, key, False))
+        switch.set_active(getattr(config_constants, key, config.DEFAULT_SETTINGS.get(key, False)))
         switch.set_halign(Gtk.Align.END)
         switches[key] = switch
         grid.attach(switch, 1, row, 1, 1)
@@ -109,17 +114,20 @@ def create_settings_dialog(parent, config_constants, canvas):
     
     # Apply changes: update the config and also force a redraw of the canvas
     def update_config():
+        values = {}
         for key, entry in numeric_entries.items():
             try:
-                setattr(config_constants, key, float(entry.get_text()))
+                values[key] = float(entry.get_text())
             except ValueError:
                 pass
         
         for key, combo in dropdown_widgets.items():
-            setattr(config_constants, key, combo.get_active_id())
+            values[key] = combo.get_active_id()
         
         for key, switch in switches.items():
-            setattr(config_constants, key, switch.get_active())
+            values[key] = switch.get_active()
+        # One update, so listeners hear about all changed settings at once
+        config_constants.update(values)
         canvas.queue_draw()
     
     dialog.connect("response", lambda d, response: update_config() if response == Gtk.ResponseType.OK else None)
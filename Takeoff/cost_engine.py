@@ -0,0 +1,360 @@
+import json
+import math
+import sqlite3
+from bisect import bisect_right
+from collections import namedtuple
+
+# One priced item in the catalog. labor_hours is installation time per unit.
+PriceEntry = namedtuple("PriceEntry", "key description unit unit_price labor_hours")
+
+# One quantity of a catalog item needed by the project. key identifies the line
+# itself (e.g. "framing:2x6:studs"), item is the catalog key it is priced against.
+TakeoffLine = namedtuple("TakeoffLine", "key item description quantity unit")
+
+# SQLite rows are fetched in chunks of this many keys (below SQLITE_MAX_VARIABLE_NUMBER)
+_SQL_CHUNK = 500
+
+
+class PriceCatalog:
+    """
+    Material prices indexed by item key, held in memory.
+
+    The catalog is read once, from the material library, a JSON file or an SQLite
+    database (a "prices" table), and every lookup afterwards is a dict access; lookup_many() prices a
+    whole takeoff in one pass. Edits through set_price() bump the catalog version
+    and are logged, so cost engines can ask changes_since(version) and re-price
+    only the lines that use the edited items; listeners added with add_listener()
+    are told the key of each edit. save() writes the catalog back to where it was
+    loaded from.
+    """
+
+    def __init__(self, entries=(), path=None, currency="USD"):
+        self.path = path
+        self.currency = currency
+        self._entries = {entry.key: entry for entry in entries}
+        self.version = 0
+        # Change log: the catalog version each edit produced, and the key it touched
+        self._change_versions = []
+        self._change_keys = []
+        self._listeners = []
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        return self._entries.get(key, default)
+
+    def entries(self):
+        return list(self._entries.values())
+
+    def lookup_many(self, keys):
+        """{key: PriceEntry} for the keys that are in the catalog."""
+        entries = self._entries
+        return {key: entries[key] for key in set(keys) if key in entries}
+
+    # ───── edits ─────
+    def set_price(self, entry):
+        """Add or replace an entry and record the change."""
+        if self._entries.get(entry.key) == entry:
+            return
+        self._entries[entry.key] = entry
+        self._log_change(entry.key)
+
+    def remove(self, key):
+        if self._entries.pop(key, None) is not None:
+            self._log_change(key)
+
+    def _log_change(self, key):
+        self.version += 1
+        self._change_versions.append(self.version)
+        self._change_keys.append(key)
+        for callback in list(self._listeners):
+            callback(key)
+
+    def add_listener(self, callback):
+        """Register callback(key) to be called after an entry is added, edited or removed."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def changes_since(self, version):
+        """Keys added, edited or removed after version."""
+        return set(self._change_keys[bisect_right(self._change_versions, version):])
+
+    # ───── persistence ─────
+    @classmethod
+    def from_library(cls, library):
+        """Catalog of every material in a MaterialLibrary, keyed by SKU."""
+        return cls(PriceEntry(material.sku, material.name, material.unit, material.unit_price, material.labor_hours)
+                   for material in library.all())
+
+    @classmethod
+    def load(cls, path):
+        """Load a catalog from a .json file or an SQLite database (any other extension)."""
+        if path.endswith(".json"):
+            return cls._load_json(path)
+        return cls._load_sqlite(path)
+
+    @classmethod
+    def _load_json(cls, path):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (json.JSONDecodeError, IOError) as e:
+            print(f"Could not read price catalog {path}: {e}")
+            return cls(path=path)
+        entries = [
+            PriceEntry(item["key"], item.get("description", item["key"]), item.get("unit", "each"),
+                       float(item.get("unit_price", 0.0)), float(item.get("labor_hours", 0.0)))
+            for item in data.get("items", [])
+        ]
+        return cls(entries, path=path, currency=data.get("currency", "USD"))
+
+    @classmethod
+    def _load_sqlite(cls, path):
+        connection = sqlite3.connect(path)
+        try:
+            _create_price_table(connection)
+            rows = connection.execute(
+                "SELECT key, description, unit, unit_price, labor_hours FROM prices"
+            ).fetchall()
+        finally:
+            connection.close()
+        return cls((PriceEntry(*row) for row in rows), path=path)
+
+    def save(self, path=None):
+        path = path or self.path
+        if path is None:
+            return  # Library catalogs are saved through MaterialLibrary.upsert()
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"currency": self.currency,
+                           "items": [entry._asdict() for entry in self._entries.values()]}, f, indent=4)
+            return
+        connection = sqlite3.connect(path)
+        try:
+            with connection:
+                _create_price_table(connection)
+                connection.execute("DELETE FROM prices")
+                connection.executemany(
+                    "INSERT INTO prices (key, description, unit, unit_price, labor_hours) VALUES (?, ?, ?, ?, ?)",
+                    self._entries.values(),
+                )
+        finally:
+            connection.close()
+
+
+def _create_price_table(connection):
+    connection.execute(
+        "CREATE TABLE IF NOT EXISTS prices ("
+        " key TEXT PRIMARY KEY, description TEXT, unit TEXT,"
+        " unit_price REAL NOT NULL DEFAULT 0, labor_hours REAL NOT NULL DEFAULT 0)"
+    )
+
+
+def lookup_sqlite(path, keys):
+    """
+    Batched lookup of keys straight from an SQLite price table, without loading the catalog.
+
+    Keys are fetched with one prepared IN query per chunk rather than one query per key.
+    """
+    keys = list(set(keys))
+    found = {}
+    connection = sqlite3.connect(path)
+    try:
+        for start in range(0, len(keys), _SQL_CHUNK):
+            chunk = keys[start:start + _SQL_CHUNK]
+            rows = connection.execute(
+                "SELECT key, description, unit, unit_price, labor_hours FROM prices"
+                f" WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for row in rows:
+                found[row[0]] = PriceEntry(*row)
+    finally:
+        connection.close()
+    return found
+
+
+_catalog = None
+
+
+def get_price_catalog(config=None):
+    """The process-wide PriceCatalog, loaded from PRICE_CATALOG_PATH (or the material library) on first use."""
+    global _catalog
+    if _catalog is None:
+        path = getattr(config, "PRICE_CATALOG_PATH", "")
+        if path:
+            _catalog = PriceCatalog.load(path)
+        else:
+            from material_library import get_material_library
+            _catalog = PriceCatalog.from_library(get_material_library(config))
+    return _catalog
+
+
+def framing_lines(framing, plates=None):
+    """
+    Takeoff lines for a framing estimate: studs per lumber size, and plate boards per
+    size and stock length from the plate cut lists (Takeoff.cut_list.plate_cut_lists).
+    """
+    lines = []
+    for key, value in framing.items():
+        if key.startswith("total_") and key.endswith("_studs") and value:
+            size = key[len("total_"):-len("_studs")]
+            lines.append(TakeoffLine(f"framing:{size}:studs", f"stud:{size}", f"{size} studs", value, "each"))
+    for size, plan in (plates or {}).items():
+        for length, count in plan.counts().items():
+            lines.append(TakeoffLine(f"framing:{size}:plates:{length}", f"lumber:{size}:{length}",
+                                     f"{size} x {int(length / 12)}' plates", count, "each"))
+    return lines
+
+
+def finish_lines(rooms, sheet_area=32.0, wall_sheets=False):
+    """
+    Takeoff lines for a room estimate (Takeoff.room_takeoff.RoomTakeoff): flooring per
+    floor type, drywall sheets for the net walls and ceilings, paint for the same
+    surface, and baseboard along the room perimeters less the door openings.
+
+    Args:
+        rooms (dict): RoomTakeoff.estimate() result.
+        sheet_area (float): Square feet per drywall sheet (4x8 = 32).
+        wall_sheets (bool): Wall drywall is priced from a panel layout (sheet_lines()),
+            so the drywall line only covers the ceilings.
+    """
+    lines = []
+    for floor_type, area in sorted(rooms["floor_by_type"].items()):
+        if area > 0:
+            lines.append(TakeoffLine(f"finish:floor:{floor_type}", f"flooring:{floor_type}",
+                                     f"{floor_type.title()} flooring", round(area, 2), "sq ft"))
+    surface = rooms["net_wall_area"] + rooms["ceiling_area"]
+    drywall = rooms["ceiling_area"] if wall_sheets else surface
+    if drywall > 0:
+        lines.append(TakeoffLine("finish:drywall", "drywall:sheet",
+                                 "Drywall sheets (ceilings)" if wall_sheets else "Drywall sheets (walls and ceilings)",
+                                 math.ceil(drywall / sheet_area), "each"))
+    if surface > 0:
+        lines.append(TakeoffLine("finish:paint", "paint:wall", "Paint (walls and ceilings)",
+                                 round(surface, 2), "sq ft"))
+    if rooms["baseboard_length"] > 0:
+        lines.append(TakeoffLine("finish:baseboard", "baseboard:default", "Baseboard",
+                                 round(rooms["baseboard_length"], 2), "lin ft"))
+    return lines
+
+
+def sheet_lines(sheets):
+    """
+    Takeoff lines for a sheet goods estimate (Takeoff.sheet_goods.sheet_takeoff): drywall
+    and sheathing panels per sheet size.
+    """
+    lines = []
+    for kind, item, title in (("interior", "drywall", "Drywall"), ("exterior", "sheathing", "Sheathing")):
+        for (width, height), count in sheets[kind].counts.items():
+            size = f"{int(width)}x{int(height)}"
+            lines.append(TakeoffLine(f"sheets:{kind}:{size}", f"{item}:{size}",
+                                     f"{title} {int(width / 12)}x{int(height / 12)} panels", count, "each"))
+    return lines
+
+
+class CostEstimate:
+    """Totals of a priced takeoff plus the priced lines, in takeoff order."""
+
+    def __init__(self, lines, material, labor_hours, labor, tax, unpriced):
+        self.lines = lines            # [(TakeoffLine, PriceEntry or None, material cost)]
+        self.material = material
+        self.labor_hours = labor_hours
+        self.labor = labor
+        self.tax = tax
+        self.unpriced = unpriced      # TakeoffLines with no catalog entry
+
+    @property
+    def total(self):
+        return round(self.material + self.labor + self.tax, 2)
+
+
+class CostEngine:
+    """
+    Prices takeoff lines against a PriceCatalog, incrementally.
+
+    The engine remembers every line it priced, and which lines use each catalog
+    item. price() only re-prices lines that are new or whose quantity changed, and
+    lines whose catalog item was edited since the last call; material and labor
+    totals are kept current by delta. Labor is the lines' labor hours at
+    LABOR_COST_PER_HOUR, and tax is TAX_RATE_PERCENTAGE of the material total.
+    """
+
+    def __init__(self, catalog, config=None):
+        self.catalog = catalog
+        self.config = config
+        self._lines = {}        # line key -> (TakeoffLine, PriceEntry or None, cost, hours)
+        self._by_item = {}      # catalog key -> {line key}
+        self._catalog_version = catalog.version
+        self._material = 0.0
+        self._hours = 0.0
+        self.repriced = 0       # lines priced over the lifetime of the engine
+
+    def _add(self, line, entry):
+        cost = line.quantity * entry.unit_price if entry is not None else 0.0
+        hours = line.quantity * entry.labor_hours if entry is not None else 0.0
+        self._lines[line.key] = (line, entry, cost, hours)
+        self._by_item.setdefault(line.item, set()).add(line.key)
+        self._material += cost
+        self._hours += hours
+
+    def _drop(self, key):
+        line, entry, cost, hours = self._lines.pop(key)
+        users = self._by_item.get(line.item)
+        if users is not None:
+            users.discard(key)
+            if not users:
+                del self._by_item[line.item]
+        self._material -= cost
+        self._hours -= hours
+
+    def price(self, lines):
+        """
+        Price the project's current takeoff lines.
+
+        Args:
+            lines (iterable): Every TakeoffLine of the project; lines priced before
+                but missing now are dropped from the totals.
+
+        Returns:
+            CostEstimate
+        """
+        lines = list(lines)
+        current = {line.key for line in lines}
+        for key in [key for key in self._lines if key not in current]:
+            self._drop(key)
+
+        # Lines that are new or changed, plus the users of edited catalog items
+        stale = {line.key: line for line in lines
+                 if line.key not in self._lines or self._lines[line.key][0] != line}
+        if self.catalog.version != self._catalog_version:
+            for item in self.catalog.changes_since(self._catalog_version):
+                for key in self._by_item.get(item, ()):
+                    stale.setdefault(key, self._lines[key][0])
+            self._catalog_version = self.catalog.version
+
+        entries = self.catalog.lookup_many(line.item for line in stale.values())
+        for key, line in stale.items():
+            if key in self._lines:
+                self._drop(key)
+            self._add(line, entries.get(line.item))
+        self.repriced += len(stale)
+        return self.estimate(lines)
+
+    def estimate(self, lines):
+        priced = [self._lines[line.key] for line in lines]
+        material = round(self._material, 2)
+        labor = round(self._hours * float(getattr(self.config, "LABOR_COST_PER_HOUR", 50.0)), 2)
+        tax = round(material * float(getattr(self.config, "TAX_RATE_PERCENTAGE", 8.0)) / 100.0, 2)
+        return CostEstimate(
+            [(line, entry, cost) for line, entry, cost, hours in priced],
+            material, round(self._hours, 2), labor, tax,
+            [line for line, entry, cost, hours in priced if entry is None],
+        )
@@ -0,0 +1,211 @@
+from collections import namedtuple
+
+from Takeoff.framing_takeoff import LUMBER_SIZES
+
+# Stock lumber lengths offered in Manage Materials (inches)
+STOCK_LENGTHS = (96, 120, 144, 168, 192, 240)
+
+# A board bought at one stock length and the cut lengths taken from it
+StockBoard = namedtuple("StockBoard", "length cuts")
+
+_EPS = 1e-9
+
+
+class CutPlan:
+    """
+    Boards to buy for a list of cuts, and how each board is cut.
+
+    Every cut takes its length plus one saw kerf out of a board, except that the
+    last cut on a board needs no kerf.
+    """
+
+    def __init__(self, boards, kerf):
+        self.boards = boards
+        self.kerf = kerf
+
+    def board_waste(self, board):
+        return board.length - sum(board.cuts) - self.kerf * (len(board.cuts) - 1)
+
+    @property
+    def stock_length(self):
+        """Total length of the boards bought."""
+        return sum(board.length for board in self.boards)
+
+    @property
+    def waste(self):
+        """Offcut length left over, kerf excluded."""
+        return sum(self.board_waste(board) for board in self.boards)
+
+    def counts(self):
+        """{stock length: number of boards}, shortest stock first."""
+        counts = {}
+        for board in self.boards:
+            counts[board.length] = counts.get(board.length, 0) + 1
+        return dict(sorted(counts.items()))
+
+
+def _smallest_stock(used, stock_lengths, kerf):
+    """Shortest stock length a board with used (kerf included) inches of cuts fits on."""
+    for length in stock_lengths:
+        if used <= length + kerf + _EPS:
+            return length
+    return None
+
+
+def _first_fit_decreasing(lengths, capacity):
+    """
+    Pack lengths (sorted longest first) into bins of one capacity, first fit.
+
+    A max segment tree over the bins' remaining space finds the first bin a length
+    fits in with one walk from the root, so packing n lengths is O(n log n) rather
+    than a scan of every open bin per length. Bins that have not been opened yet
+    hold the full capacity, so the first fit of a length that fits nowhere else is
+    the next new bin.
+    """
+    size = 1
+    while size < len(lengths):
+        size *= 2
+    tree = [capacity] * (2 * size)
+    bins = []
+    for length in lengths:
+        node = 1
+        while node < size:
+            node *= 2
+            if tree[node] < length - _EPS:
+                node += 1
+        index = node - size
+        if index == len(bins):
+            bins.append([])
+        bins[index].append(length)
+        tree[node] -= length
+        node //= 2
+        while node:
+            left = tree[2 * node]
+            right = tree[2 * node + 1]
+            tree[node] = left if left > right else right
+            node //= 2
+    return bins
+
+
+def _exact(lengths, stock_lengths, kerf):
+    """
+    Cheapest split of a few kerfed lengths into boards, by total stock length bought.
+
+    Dynamic programming over subsets: cost[s] is the shortest stock that holds the
+    cuts in s, and best[mask] the cheapest partition of mask, always placing the
+    lowest remaining cut so every partition is visited once. O(3^n), so only used
+    for small sets.
+    """
+    n = len(lengths)
+    full = (1 << n) - 1
+    used = [0.0] * (full + 1)
+    cost = [None] * (full + 1)
+    for mask in range(1, full + 1):
+        low = mask & -mask
+        used[mask] = used[mask ^ low] + lengths[low.bit_length() - 1]
+        cost[mask] = _smallest_stock(used[mask], stock_lengths, kerf)
+    best = [0] + [None] * full
+    choice = [0] * (full + 1)
+    for mask in range(1, full + 1):
+        low = mask & -mask
+        rest = mask ^ low
+        sub = rest
+        while True:
+            group = sub | low
+            if cost[group] is not None and best[mask ^ group] is not None:
+                total = best[mask ^ group] + cost[group]
+                if best[mask] is None or total < best[mask]:
+                    best[mask] = total
+                    choice[mask] = group
+            if sub == 0:
+                break
+            sub = (sub - 1) & rest
+    bins = []
+    mask = full
+    while mask:
+        group = choice[mask]
+        bins.append([lengths[i] for i in range(n) if group >> i & 1])
+        mask ^= group
+    return bins
+
+
+def optimize_cuts(cuts, stock_lengths=STOCK_LENGTHS, kerf=0.125, exact_limit=10):
+    """
+    Plan which stock boards to buy for a list of cut lengths, minimizing waste.
+
+    Cuts are packed first-fit-decreasing into boards of the longest stock length, then
+    each board is bought at the shortest stock length its cuts fit on. Sets of at most
+    exact_limit cuts are solved exactly instead.
+
+    Args:
+        cuts (list): Cut lengths in inches.
+        stock_lengths (iterable): Available stock lengths in inches.
+        kerf (float): Saw kerf in inches, taken out of the board for every cut but the last.
+        exact_limit (int): Largest number of cuts solved exactly (0 disables the exact solver).
+
+    Returns:
+        CutPlan: The boards with the cuts taken from each.
+
+    Raises:
+        ValueError: If a cut is longer than the longest stock length.
+    """
+    stock_lengths = sorted(stock_lengths)
+    if not cuts:
+        return CutPlan([], kerf)
+    longest = stock_lengths[-1]
+    if max(cuts) > longest + _EPS:
+        raise ValueError(f"Cut of {max(cuts):.2f}\" is longer than the longest stock length ({longest}\")")
+
+    lengths = sorted((cut + kerf for cut in cuts), reverse=True)
+    if len(lengths) <= exact_limit:
+        bins = _exact(lengths, stock_lengths, kerf)
+    else:
+        bins = _first_fit_decreasing(lengths, longest + kerf)
+    boards = [
+        StockBoard(_smallest_stock(sum(group), stock_lengths, kerf), tuple(length - kerf for length in group))
+        for group in bins
+    ]
+    return CutPlan(boards, kerf)
+
+
+def plate_cuts(wall_details, max_length):
+    """
+    Plate cuts per lumber size from a framing estimate's wall_details.
+
+    Each framed wall needs two top plate runs and one bottom plate run of its length.
+    Runs longer than max_length are spliced from full max_length pieces plus the remainder.
+
+    Returns:
+        dict: {lumber size: [cut lengths in inches]}
+    """
+    cuts = {}
+    for detail in wall_details:
+        materials = detail["materials"]
+        size = LUMBER_SIZES.get(materials.get("wall_width"))
+        run = materials.get("wall_length_inches", 0)
+        if size is None or run <= 0:
+            continue
+        full, remainder = divmod(run, max_length)
+        pieces = [max_length] * int(full)
+        if remainder > _EPS:
+            pieces.append(remainder)
+        cuts.setdefault(size, []).extend(pieces * 3)
+    return cuts
+
+
+def plate_cut_lists(estimate, kerf=0.125, exact_limit=10):
+    """
+    Optimized plate cut lists for a framing estimate.
+
+    Stock lengths are the STOCK_LENGTHS up to the estimate's wall_plates_length
+    (MAX_WALL_PLATE_INCHES).
+
+    Returns:
+        dict: {lumber size: CutPlan}
+    """
+    max_length = estimate["wall_plates_length"]
+    stock_lengths = [length for length in STOCK_LENGTHS if length <= max_length] or [max_length]
+    return {
+        size: optimize_cuts(cuts, stock_lengths, kerf, exact_limit)
+        for size, cuts in plate_cuts(estimate["wall_details"], stock_lengths[-1]).items()
+    }
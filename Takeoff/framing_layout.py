@@ -0,0 +1,325 @@
+import math
+from array import array
+from collections import namedtuple
+
+from Resources.framing import roughOpeningExtraStuds
+from Takeoff.framing_takeoff import host_key, wall_slot
+
+STUD_THICKNESS = 1.5
+
+# Stud kinds, stored as one byte per stud
+COMMON, KING, JACK, CRIPPLE, BACKING = range(5)
+STUD_KINDS = ("common", "king", "jack", "cripple", "backing")
+
+# Uniform grid cell (inches) of the junction index
+JUNCTION_CELL = 96.0
+
+# Studs of one wall. centers holds x, y pairs in model inches, kinds one stud kind
+# per stud; normal is the unit vector across the wall and half_width half its width,
+# so stud i spans centers[i] +/- normal * half_width. bbox is (x0, y0, x1, y1).
+WallLayout = namedtuple("WallLayout", "centers kinds normal half_width bbox")
+
+
+def _layout_offsets(length, spacing):
+    """Common stud offsets along a wall: an end stud at each end and one every spacing in between."""
+    half = STUD_THICKNESS / 2.0
+    if length <= STUD_THICKNESS:
+        return [length / 2.0]
+    offsets = [half]
+    position = spacing
+    while position < length - STUD_THICKNESS:
+        offsets.append(position)
+        position += spacing
+    offsets.append(length - half)
+    return offsets
+
+
+def stud_offsets(length, spacing, openings=(), junctions=()):
+    """
+    Stud offsets along a wall and their kinds.
+
+    Common studs fall on the spacing layout; the ones inside a rough opening become
+    cripples. Each opening then gets the extra studs roughOpeningExtraStuds lists for
+    its width, placed jack left, jack right, king left, king right and so on outwards.
+    A wall butting into this one at an end adds one backing stud there (a corner), and
+    in the middle two backing studs, one either side of it (a T-junction).
+
+    Args:
+        length (float): Wall length in inches.
+        spacing (float): Stud spacing on center in inches.
+        openings (iterable): (center offset, width) of each door or window.
+        junctions (iterable): (offset, other wall width, at_end) of each wall butting in.
+
+    Returns:
+        list: (offset, kind) pairs, ordered by offset.
+    """
+    half = STUD_THICKNESS / 2.0
+    openings = list(openings)
+    studs = []
+    for offset in _layout_offsets(length, max(spacing, STUD_THICKNESS)):
+        inside = any(abs(offset - center) < width / 2.0 for center, width in openings)
+        studs.append((offset, CRIPPLE if inside else COMMON))
+
+    low, high = half, max(length - half, half)
+    for center, width in openings:
+        extra = roughOpeningExtraStuds.get(int(width), 0)
+        for n in range(extra):
+            side = -1 if n % 2 == 0 else 1
+            depth = n // 2      # 0 = jack, 1 = king, 2... = doubled kings
+            offset = center + side * (width / 2.0 + half + depth * STUD_THICKNESS)
+            studs.append((min(max(offset, low), high), JACK if depth == 0 else KING))
+
+    for offset, other_width, at_end in junctions:
+        if at_end:
+            inward = STUD_THICKNESS * 1.5
+            studs.append((inward if offset < length / 2.0 else length - inward, BACKING))
+        else:
+            reach = other_width / 2.0 + half
+            studs.append((min(max(offset - reach, low), high), BACKING))
+            studs.append((min(max(offset + reach, low), high), BACKING))
+
+    studs.sort()
+    return studs
+
+
+def layout_wall(wall, openings=(), junctions=()):
+    """WallLayout of a wall (see stud_offsets() for the arguments)."""
+    (sx, sy), (ex, ey) = wall.start, wall.end
+    length = math.hypot(ex - sx, ey - sy)
+    if length == 0:
+        return None
+    ux, uy = (ex - sx) / length, (ey - sy) / length
+    centers = array("d")
+    kinds = array("B")
+    for offset, kind in stud_offsets(length, getattr(wall, "stud_spacing", 16), openings, junctions):
+        centers.append(sx + ux * offset)
+        centers.append(sy + uy * offset)
+        kinds.append(kind)
+    half_width = getattr(wall, "width", 3.5) / 2.0
+    return WallLayout(
+        centers, kinds, (-uy, ux), half_width,
+        (min(sx, ex) - half_width, min(sy, ey) - half_width, max(sx, ex) + half_width, max(sy, ey) + half_width),
+    )
+
+
+def _geometry(wall):
+    return tuple(wall.start), tuple(wall.end), getattr(wall, "width", 3.5)
+
+
+def _cells(geometry, cell=JUNCTION_CELL):
+    """Grid cells a wall's centerline, widened by half its width plus an inch, passes over."""
+    (sx, sy), (ex, ey), width = geometry
+    reach = width / 2.0 + 1.0
+    return [(cx, cy)
+            for cx in range(int((min(sx, ex) - reach) // cell), int((max(sx, ex) + reach) // cell) + 1)
+            for cy in range(int((min(sy, ey) - reach) // cell), int((max(sy, ey) + reach) // cell) + 1)]
+
+
+def _endpoint_cells(geometry, cell=JUNCTION_CELL):
+    return {(int(x // cell), int(y // cell)) for x, y in geometry[:2]}
+
+
+def _butting(host, other):
+    """
+    (offset, other width, at_end) of each end of other that butts into host.
+
+    An endpoint within half a wall width of host's centerline (and not past its ends
+    by more than that) is a junction, unless the two walls are parallel. Near host's
+    end it is a corner, which only the wall that sorts first by (start, end) backs,
+    so a corner is never backed twice whatever order the walls are listed in.
+    """
+    (sx, sy), (ex, ey), half_width = host[0], host[1], host[2] / 2.0
+    (ox, oy), (qx, qy), other_width = other
+    length = math.hypot(ex - sx, ey - sy)
+    other_length = math.hypot(qx - ox, qy - oy)
+    if length == 0 or other_length == 0:
+        return []
+    ux, uy = (ex - sx) / length, (ey - sy) / length
+    if abs(ux * (qy - oy) - uy * (qx - ox)) < 1e-3 * other_length:
+        return []   # a collinear continuation or an overlapping wall, not a junction
+    found = []
+    for px, py in (other[0], other[1]):
+        offset = (px - sx) * ux + (py - sy) * uy
+        if offset < -half_width or offset > length + half_width:
+            continue
+        if abs((px - sx) * uy - (py - sy) * ux) > half_width + 1.0:
+            continue
+        at_end = offset <= half_width + STUD_THICKNESS or offset >= length - half_width - STUD_THICKNESS
+        if at_end and host[:2] > other[:2]:
+            continue
+        found.append((round(offset, 4), other_width, at_end))
+    return found
+
+
+class JunctionIndex:
+    """
+    Walls butting into each wall, kept up to date wall by wall.
+
+    Two uniform grids are kept, one of the cells each wall's centerline passes over
+    and one of the cells holding its endpoints. update() compares every wall's
+    geometry with the last call and recomputes the junctions only of the walls whose
+    geometry changed and of the walls next to their old or new endpoints, so moving
+    one wall costs a few grid lookups instead of a pass over the plan.
+    """
+
+    def __init__(self, cell=JUNCTION_CELL):
+        self.cell = cell
+        self._geometry = {}     # wall_slot(wall) -> (start, end, width)
+        self._segments = {}     # cell -> {slot}: walls passing over the cell
+        self._endpoints = {}    # cell -> {slot}: walls with an end in the cell
+        self.junctions = {}     # slot -> sorted tuple of (offset, other width, at_end)
+
+    def _index(self, slot, geometry, add):
+        for cells, grid in ((_cells(geometry, self.cell), self._segments),
+                            (_endpoint_cells(geometry, self.cell), self._endpoints)):
+            for key in cells:
+                if add:
+                    grid.setdefault(key, set()).add(slot)
+                else:
+                    bucket = grid.get(key)
+                    if bucket is not None:
+                        bucket.discard(slot)
+                        if not bucket:
+                            del grid[key]
+
+    def _neighbours(self, geometry):
+        """Walls whose junctions can change when a wall with geometry appears or goes."""
+        near = set()
+        for key in _endpoint_cells(geometry, self.cell):
+            near.update(self._segments.get(key, ()))
+        for key in _cells(geometry, self.cell):
+            near.update(self._endpoints.get(key, ()))
+        return near
+
+    def _junctions_of(self, slot):
+        host = self._geometry[slot]
+        candidates = set()
+        for key in _cells(host, self.cell):
+            candidates.update(self._endpoints.get(key, ()))
+        candidates.discard(slot)
+        found = []
+        for other in candidates:
+            found.extend(_butting(host, self._geometry[other]))
+        return tuple(sorted(found))
+
+    def update(self, walls):
+        """
+        Bring the index in line with walls.
+
+        Returns:
+            set: Slots of the walls whose junctions were recomputed.
+        """
+        current = {wall_slot(wall): _geometry(wall) for wall in walls}
+        dirty = set()
+        # Walls that moved or went: drop them, and revisit the walls around where they were.
+        for slot, geometry in list(self._geometry.items()):
+            if current.get(slot) != geometry:
+                self._index(slot, geometry, add=False)
+                del self._geometry[slot]
+                self.junctions.pop(slot, None)
+                dirty.update(self._neighbours(geometry))
+        # Walls that moved or are new: index them, and revisit the walls around where they are.
+        added = [slot for slot in current if slot not in self._geometry]
+        for slot in added:
+            self._geometry[slot] = current[slot]
+            self._index(slot, current[slot], add=True)
+        for slot in added:
+            dirty.add(slot)
+            dirty.update(self._neighbours(current[slot]))
+        dirty = {slot for slot in dirty if slot in self._geometry}
+        for slot in dirty:
+            self.junctions[slot] = self._junctions_of(slot)
+        return dirty
+
+
+def wall_junctions(walls):
+    """Walls butting into each wall: {wall_slot(wall): [(offset, other width, at_end)]} (see JunctionIndex)."""
+    index = JunctionIndex()
+    index.update(walls)
+    return {slot: list(found) for slot, found in index.junctions.items() if found}
+
+
+class FramingLayout:
+    """
+    Stud-by-stud framing layout of a Document, kept per wall.
+
+    Each wood wall's layout is memoized under a key of its geometry, stud spacing,
+    hosted openings and the walls butting into it. update() rescans only when the
+    walls or openings version moved, and then regenerates just the walls whose key
+    changed: moving one wall re-lays that wall and the walls it touches, not the
+    whole plan. Junctions come from a JunctionIndex, which likewise only revisits
+    the walls around the ones that moved.
+    """
+
+    def __init__(self, document, config=None):
+        self.document = document
+        self.config = config
+        self._layouts = {}      # wall_slot(wall) -> (key, WallLayout)
+        self._junctions = JunctionIndex()
+        self._version = None
+        self.regenerated = 0    # walls laid out over the lifetime of the engine
+
+    def invalidate(self):
+        self._layouts.clear()
+        self._junctions = JunctionIndex()
+        self._version = None
+
+    def update(self):
+        """
+        Bring the layouts in line with the document.
+
+        Returns:
+            list: The walls that were laid out again (empty if nothing changed).
+        """
+        document = self.document
+        version = (document.version("walls"), document.version("openings"))
+        if version == self._version:
+            return []
+        self._version = version
+
+        walls = [wall for wall_set in document.wall_sets for wall in wall_set if wall.material == "wood"]
+        openings = {}
+        for items in (document.doors, document.windows):
+            for wall, opening, ratio in items:
+                if wall is not None:
+                    openings.setdefault(host_key(wall), []).append((ratio, float(opening.width)))
+        self._junctions.update(walls)
+        junctions = self._junctions.junctions
+
+        changed = []
+        seen = set()
+        for wall in walls:
+            slot = wall_slot(wall)
+            seen.add(slot)
+            hosted = tuple(sorted(openings.get(host_key(wall), ())))
+            butting = junctions.get(slot, ())
+            key = (tuple(wall.start), tuple(wall.end), wall.width, getattr(wall, "stud_spacing", 16), hosted, butting)
+            cached = self._layouts.get(slot)
+            if cached is not None and cached[0] == key:
+                continue
+            length = math.hypot(wall.end[0] - wall.start[0], wall.end[1] - wall.start[1])
+            self._layouts[slot] = (key, layout_wall(wall, ((ratio * length, width) for ratio, width in hosted),
+                                                    butting))
+            changed.append(wall)
+        for slot in [slot for slot in self._layouts if slot not in seen]:
+            del self._layouts[slot]
+        self.regenerated += len(changed)
+        return changed
+
+    def layouts(self):
+        """Every WallLayout, after bringing them up to date."""
+        self.update()
+        return [layout for key, layout in self._layouts.values() if layout is not None]
+
+    def visible(self, x0, y0, x1, y1):
+        """WallLayouts whose bounding box meets the model rectangle (x0, y0)-(x1, y1)."""
+        return [layout for layout in self.layouts()
+                if layout.bbox[0] <= x1 and layout.bbox[2] >= x0 and layout.bbox[1] <= y1 and layout.bbox[3] >= y0]
+
+    def counts(self):
+        """{stud kind name: count} over the whole plan."""
+        totals = [0] * len(STUD_KINDS)
+        for layout in self.layouts():
+            for kind in layout.kinds:
+                totals[kind] += 1
+        return dict(zip(STUD_KINDS, totals))
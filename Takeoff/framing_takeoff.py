@@ -1,5 +1,9 @@
+import config
 from Resources.framing import roughOpeningExtraStuds
 
+# Nominal lumber size for each framed wall width (inches)
+LUMBER_SIZES = {3.5: "2x4", 5.5: "2x6", 7.25: "2x8"}
+
 
 class FramingEstimator:
     """
@@ -32,8 +36,6 @@ class FramingEstimator:
         dx = wall.end[0] - wall.start[0]
         dy = wall.end[1] - wall.start[1]
         wall_length_inches = ((dx ** 2 + dy ** 2) ** 0.5)
-        print(f"Wall length (inches): {wall_length_inches}")
-        print(f"Wall length (feet): {wall_length_inches / 12}")
 
         # Get stud spacing (default to 16 if not specified)
         stud_spacing = getattr(wall, "stud_spacing", 16)
@@ -94,23 +96,24 @@ class FramingEstimator:
         }
 
     @staticmethod
-    def estimate_all_walls(wall_sets: list, walls_with_openings: dict = None) -> dict:
+    def estimate_all_walls(wall_sets: list, walls_with_openings: dict = None, settings=None) -> dict:
         """
         Estimate framing materials for all walls in the project.
 
         Args:
             wall_sets (list): List of wall sets (each set is a list of connected walls).
             walls_with_openings (dict, optional): Dict mapping wall identifier to {"doors": [...], "windows": [...]}
+            settings (optional): Settings to read MAX_WALL_PLATE_INCHES from; defaults to the
+                shared in-memory settings, re-read only if settings.json changed on disk.
 
         Returns:
             dict: Aggregated material counts.
         """
-        import config
+        if settings is None:
+            settings = config.get_settings()
+            settings.reload_if_changed()
+        MAX_WALL_PLATE_INCHES = getattr(settings, "MAX_WALL_PLATE_INCHES", 192)
 
-        # Read runtime config (falls back to DEFAULT_SETTINGS if settings file missing)
-        _cfg = config.load_config() if hasattr(config, "load_config") else getattr(config, "DEFAULT_SETTINGS", {})
-        MAX_WALL_PLATE_INCHES = _cfg.get("MAX_WALL_PLATE_INCHES", getattr(config, "DEFAULT_SETTINGS", {}).get("MAX_WALL_PLATE_INCHES", 192))
-        
         
         if walls_with_openings is None:
             walls_with_openings = {}
@@ -174,4 +177,160 @@ class FramingEstimator:
             "total_2x8_bottom_plates": total_2x8_bottom_plates,
             "wall_details": wall_details,
             "wall_plates_length": int(MAX_WALL_PLATE_INCHES)
-        }
\ No newline at end of file
+        }
+
+
+def openings_by_wall(doors, windows):
+    """Map host_key(wall) to ([doors], [windows]) for the openings hosted on each wall."""
+    hosted = {}
+    for wall, door, ratio in doors:
+        if wall is not None:
+            hosted.setdefault(host_key(wall), ([], []))[0].append(door)
+    for wall, window, ratio in windows:
+        if wall is not None:
+            hosted.setdefault(host_key(wall), ([], []))[1].append(window)
+    return hosted
+
+
+def host_key(wall):
+    """
+    Key matching a wall to the doors and windows it hosts: the wall's identifier,
+    or wall_slot(wall) if it has none. Undo restores the walls and the openings'
+    host references as separate copies, so identity can't tell which wall it is.
+    """
+    return getattr(wall, "identifier", None) or wall_slot(wall)
+
+
+def wall_slot(wall):
+    """
+    Stable cache slot of a wall: the wall's identity, or for the frozen copies in a
+    TakeoffSnapshot, the identity of the live wall they were taken from.
+    """
+    return getattr(wall, "source_id", None) or id(wall)
+
+
+def wall_takeoff_key(wall, doors, windows, connected_walls):
+    """
+    Content key of everything estimate_wall_materials() reads from a wall.
+
+    Two walls with equal keys have identical takeoffs, so a cached result stays
+    valid for as long as the key does.
+    """
+    return (
+        wall.material,
+        tuple(wall.start),
+        tuple(wall.end),
+        getattr(wall, "width", 5.5),
+        getattr(wall, "stud_spacing", 16),
+        connected_walls,
+        tuple(int(getattr(door, "width", 36)) for door in doors),
+        tuple(int(getattr(window, "width", 36)) for window in windows),
+    )
+
+
+class FramingTakeoff:
+    """
+    Incremental framing takeoff for a Document.
+
+    Each wall's materials are memoized under its content key (geometry, framing
+    properties, connected wall count and hosted opening widths). estimate() only
+    re-runs estimate_wall_materials() for walls whose key changed, and keeps the
+    per-lumber-size totals up to date by subtracting the old result and adding the
+    new one. When neither the walls nor the openings version moved since the last
+    call (and the plate length setting is the same), the previous estimate is
+    returned as is.
+
+    The result has the same shape as FramingEstimator.estimate_all_walls().
+    """
+
+    def __init__(self, document, config=None):
+        self.document = document
+        self.config = config
+        self._walls = {}      # wall_slot(wall) -> (wall, key, materials)
+        self._totals = {}     # lumber size -> [studs, top plate inches, bottom plate inches]
+        self._version = None
+        self._result = None
+        self.recomputed = 0   # walls re-estimated over the lifetime of the engine
+
+    def invalidate(self):
+        """Forget every cached wall so the next estimate() starts from scratch."""
+        self._walls.clear()
+        self._totals.clear()
+        self._version = None
+        self._result = None
+
+    def _apply(self, materials, sign):
+        size = LUMBER_SIZES.get(materials["wall_width"])
+        if size is None:
+            return
+        totals = self._totals.setdefault(size, [0, 0.0, 0.0])
+        totals[0] += sign * materials["studs"]
+        totals[1] += sign * materials["top_plates"]
+        totals[2] += sign * materials["bottom_plates"]
+
+    def update(self):
+        """
+        Bring the cached takeoff in line with the document.
+
+        Returns:
+            list: The walls whose materials were recomputed.
+        """
+        hosted = openings_by_wall(self.document.doors, self.document.windows)
+        no_openings = ((), ())
+        seen = set()
+        changed = []
+        for wall_set in self.document.wall_sets:
+            connected_count = len(wall_set) - 1
+            for wall in wall_set:
+                if wall.material != "wood":
+                    continue
+                wall_key = wall_slot(wall)
+                seen.add(wall_key)
+                doors, windows = hosted.get(host_key(wall), no_openings)
+                key = wall_takeoff_key(wall, doors, windows, connected_count)
+                cached = self._walls.get(wall_key)
+                if cached is not None and cached[1] == key:
+                    if cached[0] is not wall:
+                        self._walls[wall_key] = (wall, key, cached[2])
+                    continue
+                if cached is not None:
+                    self._apply(cached[2], -1)
+                materials = FramingEstimator.estimate_wall_materials(wall, doors, windows, connected_count)
+                self._apply(materials, 1)
+                self._walls[wall_key] = (wall, key, materials)
+                changed.append(wall)
+        # Walls that were deleted (or stopped being wood) drop out of the totals.
+        for wall_key in [k for k in self._walls if k not in seen]:
+            self._apply(self._walls.pop(wall_key)[2], -1)
+        self.recomputed += len(changed)
+        return changed
+
+    def estimate(self, force=False):
+        """
+        Current framing estimate, in the format of FramingEstimator.estimate_all_walls().
+
+        Args:
+            force (bool): Rescan the walls even if the document versions did not change.
+        """
+        plate_length = int(getattr(self.config, "MAX_WALL_PLATE_INCHES", 192))
+        version = (self.document.version("walls"), self.document.version("openings"), plate_length)
+        if not force and self._result is not None and version == self._version:
+            return self._result
+        self.update()
+        self._version = version
+
+        # Same keys, in the same order, as estimate_all_walls()
+        result = {}
+        for index, part in enumerate(("studs", "top_plates", "bottom_plates")):
+            for size in LUMBER_SIZES.values():
+                value = self._totals.get(size, (0, 0.0, 0.0))[index]
+                # Plate lengths accumulate rounding noise from the deltas.
+                result[f"total_{size}_{part}"] = value if index == 0 else round(value, 6)
+        result["wall_details"] = [
+            {"wall_id": wall.identifier, "materials": self._walls[wall_slot(wall)][2]}
+            for wall_set in self.document.wall_sets for wall in wall_set
+            if wall_slot(wall) in self._walls
+        ]
+        result["wall_plates_length"] = plate_length
+        self._result = result
+        return result
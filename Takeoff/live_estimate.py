@@ -0,0 +1,156 @@
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from Takeoff.cost_engine import CostEngine, finish_lines, framing_lines, get_price_catalog, sheet_lines
+from Takeoff.cut_list import plate_cut_lists
+from Takeoff.framing_takeoff import FramingTakeoff, host_key
+from Takeoff.room_takeoff import RoomTakeoff
+from Takeoff.sheet_goods import SheetTakeoff
+
+
+# Frozen copies of the fields the takeoffs read. source_id is the id() of the live
+# object, which keeps the per-wall caches stable from one snapshot to the next.
+FrozenWall = namedtuple(
+    "FrozenWall", "identifier start end width height material stud_spacing exterior_wall interior_finish source_id"
+)
+FrozenOpening = namedtuple("FrozenOpening", "identifier width height elevation")
+FrozenRoom = namedtuple("FrozenRoom", "identifier points height floor_type wall_finish name source_id")
+
+
+class TakeoffSnapshot:
+    """
+    Immutable copy of the walls and openings of a Document, safe to read from a worker thread.
+
+    It quacks like a Document as far as the takeoff engines are concerned: wall_sets,
+    rooms, doors, windows and version().
+    """
+
+    def __init__(self, document):
+        self.versions = dict(document.versions)
+        self._version = document.version()
+        frozen = {}     # host_key(live wall) -> FrozenWall
+        wall_sets = []
+        for wall_set in document.wall_sets:
+            frozen_set = []
+            for wall in wall_set:
+                record = FrozenWall(
+                    wall.identifier, tuple(wall.start), tuple(wall.end), wall.width, wall.height,
+                    wall.material, getattr(wall, "stud_spacing", 16), wall.exterior_wall, wall.interior_finish,
+                    id(wall),
+                )
+                frozen[host_key(wall)] = record
+                frozen_set.append(record)
+            wall_sets.append(tuple(frozen_set))
+        self.wall_sets = tuple(wall_sets)
+        self.doors = self._freeze_openings(document.doors, frozen)
+        self.windows = self._freeze_openings(document.windows, frozen)
+        self.rooms = tuple(
+            FrozenRoom(room.identifier, tuple(tuple(point) for point in room.points), room.height,
+                       room.floor_type, room.wall_finish, room.name, id(room))
+            for room in document.rooms
+        )
+
+    @staticmethod
+    def _freeze_openings(items, frozen_walls):
+        openings = []
+        for wall, opening, ratio in items:
+            record = FrozenOpening(opening.identifier, opening.width, getattr(opening, "height", 0),
+                                   getattr(opening, "elevation", None))
+            # Hosts are matched by identifier: after undo they are copies of the walls in wall_sets.
+            openings.append((frozen_walls.get(host_key(wall)) if wall is not None else None, record, ratio))
+        return tuple(openings)
+
+    def version(self, collection=None):
+        if collection is None:
+            return self._version
+        return self.versions[collection]
+
+
+class LiveEstimator:
+    """
+    Recomputes the project estimate on a worker thread.
+
+    request() snapshots the document on the calling (UI) thread and hands the snapshot
+    to a single worker; the result is passed back through post(callback, *args), e.g.
+    GLib.idle_add, and delivered to on_result(result) on the UI thread; a takeoff that
+    raises is reported to on_error(message) the same way. Every request
+    or cancel() starts a new generation; a result from an older generation is dropped
+    instead of delivered, so an estimate that was overtaken by a newer edit never
+    reaches the UI. Jobs that are already stale when the worker picks them up are
+    skipped.
+
+    The worker owns its own takeoff engines, so their per-wall caches carry over from
+    one request to the next without being shared with the UI thread.
+    """
+
+    def __init__(self, document, config, on_result, post, on_error=None):
+        self.document = document
+        self.config = config
+        self.on_result = on_result
+        self.on_error = on_error
+        self.post = post
+        self.framing = FramingTakeoff(None, config)
+        self.rooms = RoomTakeoff(None, config)
+        self.sheets = SheetTakeoff(None, config)
+        self.cost = CostEngine(get_price_catalog(config), config)
+        self._executor = None
+        self._generation = 0
+        self.discarded = 0
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-estimate")
+        return self._executor
+
+    def shutdown(self):
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def cancel(self):
+        """Discard the result of any estimate that is queued or running."""
+        self._generation += 1
+
+    def request(self):
+        """Estimate the document as it is now; the result arrives later through on_result."""
+        self._generation += 1
+        self._pool().submit(self._run, TakeoffSnapshot(self.document), self._generation)
+
+    def compute(self, snapshot):
+        """Run the takeoffs on a snapshot (worker thread)."""
+        self.framing.document = snapshot
+        self.rooms.document = snapshot
+        self.sheets.document = snapshot
+        framing = self.framing.estimate()
+        plates = plate_cut_lists(framing, kerf=getattr(self.config, "SAW_KERF_INCHES", 0.125))
+        rooms = self.rooms.estimate()
+        sheets = self.sheets.estimate()
+        lines = framing_lines(framing, plates) + sheet_lines(sheets) + finish_lines(rooms, wall_sheets=True)
+        return {
+            "version": snapshot.version(),
+            "framing": framing,
+            "plates": plates,
+            "rooms": rooms,
+            "sheets": sheets,
+            "cost": self.cost.price(lines),
+        }
+
+    def _run(self, snapshot, generation):
+        if generation != self._generation:
+            return
+        try:
+            result = self.compute(snapshot)
+        except Exception as e:
+            print(f"Live estimate failed: {e}")
+            if self.on_error is not None:
+                self.post(self._deliver, generation, f"{type(e).__name__}: {e}", self.on_error)
+            return
+        self.post(self._deliver, generation, result, self.on_result)
+
+    def _deliver(self, generation, result, callback):
+        if generation != self._generation:
+            self.discarded += 1
+        else:
+            callback(result)
+        return False  # GLib.SOURCE_REMOVE when posted with GLib.idle_add
@@ -0,0 +1,268 @@
+import math
+from collections import namedtuple
+
+SQ_IN_PER_SQ_FT = 144.0
+
+# Uniform grid cell (inches) of the opening index; about one room across
+OPENING_CELL = 120.0
+
+# Quantities of one room, in square feet and feet. wall_area is the gross area of
+# the room outline at ceiling height; net_wall_area deducts the door and window
+# openings on the walls bounding the room, and baseboard_length the door widths.
+RoomQuantities = namedtuple(
+    "RoomQuantities",
+    "floor_area perimeter wall_area opening_area net_wall_area ceiling_area baseboard_length",
+)
+
+
+def room_slot(room):
+    """Stable cache slot of a room: its identity, or that of the live room a frozen copy was taken from."""
+    return getattr(room, "source_id", None) or id(room)
+
+
+def room_key(room):
+    """Content key of the room geometry the takeoff reads."""
+    return tuple(tuple(point) for point in room.points), room.height
+
+
+def measure_rooms(point_lists):
+    """
+    Shoelace area (square inches) and perimeter (inches) of many polygons in one pass.
+
+    The vertices of every polygon are laid out in two flat coordinate lists with the
+    offset where each polygon starts, and area and perimeter are accumulated in a
+    single loop over all edges. A closing vertex equal to the first is harmless: it
+    only adds a zero-length edge.
+
+    Returns:
+        list: (area, perimeter) per polygon, in input order.
+    """
+    xs = []
+    ys = []
+    starts = []
+    for points in point_lists:
+        starts.append(len(xs))
+        for x, y in points:
+            xs.append(x)
+            ys.append(y)
+    starts.append(len(xs))
+
+    hypot = math.hypot
+    results = []
+    for index in range(len(starts) - 1):
+        start, end = starts[index], starts[index + 1]
+        if end - start < 3:
+            results.append((0.0, 0.0))
+            continue
+        twice_area = 0.0
+        perimeter = 0.0
+        px, py = xs[end - 1], ys[end - 1]
+        for i in range(start, end):
+            x, y = xs[i], ys[i]
+            twice_area += px * y - x * py
+            perimeter += hypot(x - px, y - py)
+            px, py = x, y
+        results.append((abs(twice_area) / 2.0, perimeter))
+    return results
+
+
+class OpeningIndex:
+    """
+    Door and window openings on walls, bucketed on a uniform grid by their center.
+
+    on_edge() finds the openings whose wall runs along a room edge: parallel to it,
+    centered within half the wall width (plus a small tolerance) of the edge line,
+    and with the center between the edge endpoints. Rooms are outlined on the wall
+    centerlines, so this picks the walls that bound the room on either side.
+    """
+
+    TOLERANCE = 1.0
+
+    def __init__(self, doors, windows, cell=OPENING_CELL):
+        self.cell = cell
+        self._cells = {}
+        self.count = 0
+        for is_door, items in ((True, doors), (False, windows)):
+            for wall, opening, ratio in items:
+                if wall is None:
+                    continue
+                (sx, sy), (ex, ey) = wall.start, wall.end
+                length = math.hypot(ex - sx, ey - sy)
+                if length == 0:
+                    continue
+                x = sx + ratio * (ex - sx)
+                y = sy + ratio * (ey - sy)
+                record = (
+                    x, y, (ex - sx) / length, (ey - sy) / length, getattr(wall, "width", 0.0) / 2.0,
+                    float(opening.width), float(getattr(opening, "height", 0.0) or 0.0), is_door, id(opening),
+                )
+                self._cells.setdefault((int(x // cell), int(y // cell)), []).append(record)
+                self.count += 1
+
+    def on_edge(self, a, b):
+        """Opening records along the room edge a-b."""
+        (ax, ay), (bx, by) = a, b
+        length = math.hypot(bx - ax, by - ay)
+        if length == 0 or not self._cells:
+            return []
+        dx, dy = (bx - ax) / length, (by - ay) / length
+        cell = self.cell
+        reach = self.TOLERANCE + 12.0  # covers any half wall width
+        found = []
+        for cx in range(int((min(ax, bx) - reach) // cell), int((max(ax, bx) + reach) // cell) + 1):
+            for cy in range(int((min(ay, by) - reach) // cell), int((max(ay, by) + reach) // cell) + 1):
+                for record in self._cells.get((cx, cy), ()):
+                    x, y, ux, uy, half_width = record[:5]
+                    if abs(ux * dy - uy * dx) > 1e-3:
+                        continue
+                    ox, oy = x - ax, y - ay
+                    if abs(ox * dy - oy * dx) > half_width + self.TOLERANCE:
+                        continue
+                    if 0.0 <= ox * dx + oy * dy <= length:
+                        found.append(record)
+        return found
+
+    def deductions(self, points):
+        """(opening area in square inches, door width in inches) on the edges of a room outline."""
+        if not self.count or len(points) < 2:
+            return 0.0, 0.0
+        seen = set()
+        area = 0.0
+        door_width = 0.0
+        previous = points[-1]
+        for point in points:
+            for record in self.on_edge(previous, point):
+                if record[8] in seen:
+                    continue
+                seen.add(record[8])
+                area += record[5] * record[6]
+                if record[7]:
+                    door_width += record[5]
+            previous = point
+        return area, door_width
+
+
+def room_quantities(key, measures, deductions):
+    """RoomQuantities from a room's key, its (area, perimeter) and its (opening area, door width)."""
+    height = key[1]
+    area, perimeter = measures
+    opening_area, door_width = deductions
+    wall_area = perimeter * height
+    return RoomQuantities(
+        floor_area=area / SQ_IN_PER_SQ_FT,
+        perimeter=perimeter / 12.0,
+        wall_area=wall_area / SQ_IN_PER_SQ_FT,
+        opening_area=min(opening_area, wall_area) / SQ_IN_PER_SQ_FT,
+        net_wall_area=max(wall_area - opening_area, 0.0) / SQ_IN_PER_SQ_FT,
+        ceiling_area=area / SQ_IN_PER_SQ_FT,
+        baseboard_length=max(perimeter - door_width, 0.0) / 12.0,
+    )
+
+
+class RoomTakeoff:
+    """
+    Finish takeoff for the rooms of a Document: floor, ceiling and wall areas and perimeters.
+
+    Shoelace area and perimeter are memoized per room under its geometry key, and
+    rooms that are new or reshaped are measured together in one measure_rooms()
+    batch. Opening deductions depend on walls and openings too, so they are redone
+    for every room only when the walls or openings version moved, and otherwise just
+    for the rooms that changed. When none of the rooms, walls and openings versions
+    moved, the previous estimate is returned as is.
+    """
+
+    def __init__(self, document, config=None):
+        self.document = document
+        self.config = config
+        self._rooms = {}      # room_slot(room) -> (key, (area, perimeter), RoomQuantities)
+        self._openings_version = None
+        self._version = None
+        self._result = None
+        self.recomputed = 0   # rooms re-measured over the lifetime of the engine
+
+    def invalidate(self):
+        self._rooms.clear()
+        self._openings_version = None
+        self._version = None
+        self._result = None
+
+    def update(self):
+        """
+        Bring the cached room measures in line with the document.
+
+        Returns:
+            list: The rooms that were re-measured.
+        """
+        document = self.document
+        openings_version = (document.version("walls"), document.version("openings"))
+        rescan_openings = openings_version != self._openings_version
+        index = None
+
+        changed = []
+        keys = []
+        seen = set()
+        for room in document.rooms:
+            slot = room_slot(room)
+            seen.add(slot)
+            key = room_key(room)
+            cached = self._rooms.get(slot)
+            if cached is None or cached[0] != key:
+                changed.append(room)
+                keys.append(key)
+            elif rescan_openings:
+                if index is None:
+                    index = OpeningIndex(document.doors, document.windows)
+                self._rooms[slot] = (key, cached[1], room_quantities(key, cached[1], index.deductions(key[0])))
+
+        if changed:
+            if index is None:
+                index = OpeningIndex(document.doors, document.windows)
+            for room, key, measures in zip(changed, keys, measure_rooms(key[0] for key in keys)):
+                self._rooms[room_slot(room)] = (key, measures, room_quantities(key, measures, index.deductions(key[0])))
+        for slot in [slot for slot in self._rooms if slot not in seen]:
+            del self._rooms[slot]
+        self._openings_version = openings_version
+        self.recomputed += len(changed)
+        return changed
+
+    def quantities(self, room):
+        """RoomQuantities of a room the last update() measured."""
+        return self._rooms[room_slot(room)][2]
+
+    def estimate(self, force=False):
+        """
+        Current room takeoff.
+
+        Returns:
+            dict: Totals over all rooms (square feet / feet), "floor_by_type" (floor area
+            per floor_type) and "rooms", a list of {"room_id", "name", "floor_type",
+            "wall_finish", "quantities": RoomQuantities} in document order.
+        """
+        document = self.document
+        version = (document.version("rooms"), document.version("walls"), document.version("openings"))
+        if not force and self._result is not None and version == self._version:
+            return self._result
+        self.update()
+        self._version = version
+
+        totals = dict.fromkeys(RoomQuantities._fields, 0.0)
+        floor_by_type = {}
+        rooms = []
+        for room in document.rooms:
+            quantities = self.quantities(room)
+            for field, value in zip(RoomQuantities._fields, quantities):
+                totals[field] += value
+            floor_type = getattr(room, "floor_type", "default") or "default"
+            floor_by_type[floor_type] = floor_by_type.get(floor_type, 0.0) + quantities.floor_area
+            rooms.append({
+                "room_id": room.identifier,
+                "name": getattr(room, "name", ""),
+                "floor_type": floor_type,
+                "wall_finish": getattr(room, "wall_finish", "default") or "default",
+                "quantities": quantities,
+            })
+        result = {field: round(value, 4) for field, value in totals.items()}
+        result["floor_by_type"] = {floor_type: round(area, 4) for floor_type, area in floor_by_type.items()}
+        result["rooms"] = rooms
+        self._result = result
+        return result
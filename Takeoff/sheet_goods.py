@@ -0,0 +1,300 @@
+import math
+from bisect import bisect_left
+from collections import Counter, namedtuple
+
+from Takeoff.framing_takeoff import host_key
+
+# Panel sizes offered, (width, height) in inches: 4x8, 4x10 and 4x12
+SHEET_SIZES = ((48, 96), (48, 120), (48, 144))
+
+# Windows without an elevation (sill height) are placed with their head at door height
+WINDOW_HEAD_HEIGHT = 80.0
+
+# Offcuts narrower than this (inches) are scrap, not kept for reuse
+MIN_OFFCUT = 12.0
+
+# Free rectangles examined per piece before a new panel is opened
+_SCAN_LIMIT = 64
+
+_EPS = 1e-6
+
+# One side of a wall to be covered: length and height in inches, and the openings
+# in it as (left, right, bottom, top) inches from the face's lower left corner.
+WallFace = namedtuple("WallFace", "wall_id length height openings")
+
+
+class SheetPlan:
+    """Panels bought to cover a set of wall faces, and how much of them is waste."""
+
+    def __init__(self, counts, covered_area):
+        self.counts = dict(sorted(counts.items()))   # {(width, height): panels}
+        self.covered_area = covered_area             # square inches of face actually covered
+
+    @property
+    def panels(self):
+        return sum(self.counts.values())
+
+    @property
+    def sheet_area(self):
+        """Square inches of panel bought."""
+        return sum(width * height * count for (width, height), count in self.counts.items())
+
+    @property
+    def waste(self):
+        """Square inches bought but not covering any face."""
+        return max(self.sheet_area - self.covered_area, 0.0)
+
+    @property
+    def waste_pct(self):
+        area = self.sheet_area
+        return 100.0 * self.waste / area if area else 0.0
+
+
+def wall_faces(wall_sets, doors, windows):
+    """
+    Faces of the wood-framed walls, split into interior finish and exterior sheathing.
+
+    Exterior walls have one drywall face and one sheathed face; interior walls are
+    drywalled on both sides. Walls whose interior finish is not drywall get no
+    interior faces.
+
+    Returns:
+        tuple: ([interior WallFace], [exterior WallFace])
+    """
+    hosted = {}
+    for is_door, items in ((True, doors), (False, windows)):
+        for wall, opening, ratio in items:
+            if wall is not None:
+                hosted.setdefault(host_key(wall), []).append((is_door, opening, ratio))
+
+    interior = []
+    exterior = []
+    for wall_set in wall_sets:
+        for wall in wall_set:
+            if wall.material != "wood":
+                continue
+            length = math.hypot(wall.end[0] - wall.start[0], wall.end[1] - wall.start[1])
+            if length <= _EPS or wall.height <= _EPS:
+                continue
+            openings = []
+            for is_door, opening, ratio in hosted.get(host_key(wall), ()):
+                center = ratio * length
+                height = float(getattr(opening, "height", 0) or 0)
+                elevation = getattr(opening, "elevation", None)
+                if is_door:
+                    bottom = 0.0
+                elif elevation is not None:
+                    bottom = max(float(elevation), 0.0)
+                else:
+                    bottom = max(WINDOW_HEAD_HEIGHT - height, 0.0)
+                openings.append((max(center - opening.width / 2.0, 0.0), min(center + opening.width / 2.0, length),
+                                 bottom, min(bottom + height, wall.height)))
+            face = WallFace(wall.identifier, length, float(wall.height), tuple(openings))
+            exterior_wall = getattr(wall, "exterior_wall", False)
+            if str(getattr(wall, "interior_finish", "drywall")).lower() == "drywall":
+                interior.extend([face] if exterior_wall else [face, face])
+            if exterior_wall:
+                exterior.append(face)
+    return interior, exterior
+
+
+def _rows(height, sheet_heights):
+    """[(row height, sheet height)]: full rows of the tallest sheet, then the shortest sheet that finishes the wall."""
+    tallest = sheet_heights[-1]
+    rows = [(tallest, tallest)] * int(height // tallest)
+    rest = height - tallest * len(rows)
+    if rest > _EPS:
+        rows.append((rest, next(h for h in sheet_heights if h >= rest - _EPS)))
+    return rows
+
+
+class GuillotinePacker:
+    """
+    Packs rectangular pieces onto panels and offcuts with guillotine cuts.
+
+    Free rectangles (offcuts from any wall, and the remainders of opened panels) are
+    kept sorted by area. A piece takes the smallest free rectangle it fits in,
+    either way round, among the next few larger ones; the rectangle is split along
+    its shorter leftover side and the two remainders go back into the pool if they
+    are at least min_offcut across. Only when nothing fits is a new panel opened, the
+    shortest sheet the piece fits on.
+    """
+
+    def __init__(self, sheet_sizes=SHEET_SIZES, min_offcut=MIN_OFFCUT):
+        self.sheet_sizes = sorted(sheet_sizes, key=lambda size: size[0] * size[1])
+        self.min_offcut = min_offcut
+        self.free = []        # sorted (area, width, height)
+        self.counts = Counter()
+
+    def add_offcut(self, width, height, count=1):
+        if min(width, height) >= self.min_offcut - _EPS:
+            entry = (width * height, width, height)
+            index = bisect_left(self.free, entry)
+            self.free[index:index] = [entry] * count
+
+    def _split(self, free_w, free_h, w, h):
+        right = free_w - w
+        top = free_h - h
+        if right < top:
+            self.add_offcut(right, h)
+            self.add_offcut(free_w, top)
+        else:
+            self.add_offcut(right, free_h)
+            self.add_offcut(w, top)
+
+    def _take_free(self, w, h):
+        free = self.free
+        start = bisect_left(free, (w * h - _EPS,))
+        for index in range(start, min(start + _SCAN_LIMIT, len(free))):
+            area, free_w, free_h = free[index]
+            if w <= free_w + _EPS and h <= free_h + _EPS:
+                del free[index]
+                return free_w, free_h, w, h
+            if h <= free_w + _EPS and w <= free_h + _EPS:
+                del free[index]
+                return free_w, free_h, h, w
+        return None
+
+    def place(self, w, h):
+        """Cut a w x h piece from an offcut or a new panel."""
+        taken = self._take_free(w, h)
+        if taken is None:
+            for sheet_w, sheet_h in self.sheet_sizes:
+                if w <= sheet_w + _EPS and h <= sheet_h + _EPS:
+                    taken = (sheet_w, sheet_h, w, h)
+                    break
+                if h <= sheet_w + _EPS and w <= sheet_h + _EPS:
+                    taken = (sheet_w, sheet_h, h, w)
+                    break
+            else:
+                raise ValueError(f"Piece {w:.1f}\" x {h:.1f}\" is larger than every sheet size")
+            self.counts[taken[:2]] += 1
+        self._split(*taken)
+
+    def pack(self, pieces):
+        """Place pieces, largest first."""
+        for w, h in sorted(pieces, key=lambda piece: piece[0] * piece[1], reverse=True):
+            self.place(w, h)
+
+
+def _layout_face(face, sheet_width, sheet_heights, counts, packer, pieces):
+    """
+    Lay a face with openings out in sheet-wide columns and sheet-high rows.
+
+    Cells an opening crosses full-width are split into the pieces above and below
+    it; an opening that only notches a cell leaves the cell whole and its cutout
+    goes to the offcut pool. Full cells are whole panels; everything else is a
+    piece for the packer. Returns the area covered.
+    """
+    covered = face.length * face.height
+    for left, right, bottom, top in face.openings:
+        covered -= max(right - left, 0.0) * max(top - bottom, 0.0)
+
+    y0 = 0.0
+    for row_height, sheet_height in _rows(face.height, sheet_heights):
+        y1 = y0 + row_height
+        x0 = 0.0
+        while x0 < face.length - _EPS:
+            x1 = min(x0 + sheet_width, face.length)
+            spans = [(y0, y1)]
+            notches = []
+            for left, right, bottom, top in face.openings:
+                if right <= x0 + _EPS or left >= x1 - _EPS or top <= y0 + _EPS or bottom >= y1 - _EPS:
+                    continue
+                cut_bottom, cut_top = max(bottom, y0), min(top, y1)
+                if left <= x0 + _EPS and right >= x1 - _EPS:
+                    spans = [part for lo, hi in spans
+                             for part in ((lo, min(hi, cut_bottom)), (max(lo, cut_top), hi)) if part[1] - part[0] > _EPS]
+                else:
+                    notches.append((min(right, x1) - max(left, x0), cut_top - cut_bottom))
+            width = x1 - x0
+            for lo, hi in spans:
+                if width >= sheet_width - _EPS and lo <= y0 + _EPS and hi >= y1 - _EPS:
+                    counts[(sheet_width, sheet_height)] += 1
+                    if sheet_height - row_height > _EPS:
+                        packer.add_offcut(sheet_width, sheet_height - row_height)
+                else:
+                    pieces.append((width, hi - lo))
+            for notch in notches:
+                packer.add_offcut(*notch)
+            x0 = x1
+        y0 = y1
+    return covered
+
+
+def plan_sheets(faces, sheet_sizes=SHEET_SIZES, min_offcut=MIN_OFFCUT, group_plain=True):
+    """
+    Sheet panels to cover wall faces, reusing offcuts across walls.
+
+    Faces without openings take the rectangular fast path: identical faces are
+    grouped by (length, height), and each group's whole panels, offcuts and edge
+    pieces are counted once and multiplied instead of being laid out face by face.
+    Faces with openings are laid out cell by cell. All partial pieces are then
+    guillotine-packed together onto the offcut pool and new panels. group_plain=False
+    sends every face through the cell-by-cell layout (for comparison).
+
+    Returns:
+        SheetPlan
+    """
+    sheet_width = max(width for width, height in sheet_sizes)
+    sheet_heights = sorted(height for width, height in sheet_sizes if width == sheet_width)
+    packer = GuillotinePacker(sheet_sizes, min_offcut)
+    counts = Counter()
+    pieces = []
+    covered = 0.0
+
+    plain = Counter()
+    for face in faces:
+        if face.openings or not group_plain:
+            covered += _layout_face(face, sheet_width, sheet_heights, counts, packer, pieces)
+        else:
+            plain[(face.length, face.height)] += 1
+
+    for (length, height), n in plain.items():
+        covered += n * length * height
+        columns = int((length + _EPS) // sheet_width)
+        edge = length - columns * sheet_width
+        for row_height, sheet_height in _rows(height, sheet_heights):
+            if columns:
+                counts[(sheet_width, sheet_height)] += n * columns
+                if sheet_height - row_height > _EPS:
+                    packer.add_offcut(sheet_width, sheet_height - row_height, n * columns)
+            if edge > _EPS:
+                pieces.extend([(edge, row_height)] * n)
+
+    packer.pack(pieces)
+    counts.update(packer.counts)
+    return SheetPlan(counts, covered)
+
+
+def sheet_takeoff(wall_sets, doors, windows, sheet_sizes=SHEET_SIZES):
+    """
+    Sheet goods for every wall: {"interior": SheetPlan (drywall), "exterior": SheetPlan (sheathing)}.
+
+    Offcuts are reused within each kind, never between drywall and sheathing.
+    """
+    interior, exterior = wall_faces(wall_sets, doors, windows)
+    return {"interior": plan_sheets(interior, sheet_sizes), "exterior": plan_sheets(exterior, sheet_sizes)}
+
+
+class SheetTakeoff:
+    """Sheet goods takeoff for a Document, recomputed only when its walls or openings change."""
+
+    def __init__(self, document, config=None):
+        self.document = document
+        self.config = config
+        self._version = None
+        self._result = None
+
+    def invalidate(self):
+        self._version = None
+        self._result = None
+
+    def estimate(self, force=False):
+        document = self.document
+        version = (document.version("walls"), document.version("openings"))
+        if not force and self._result is not None and version == self._version:
+            return self._result
+        self._result = sheet_takeoff(document.wall_sets, document.doors, document.windows)
+        self._version = version
+        return self._result
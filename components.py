@@ -1,7 +1,6 @@
 from dataclasses import dataclass
 from typing import List, Tuple
 import math
-from gi.repository import Pango
 
 @dataclass(eq=False)
 class Wall:
@@ -100,4 +99,6 @@ class Dimension:
     text_size: float = 12.0  # Font size for dimension text
     show_arrows: bool = True  # Whether to show extension arrows
     line_style: str = "solid"  # "solid" or "dashed"
-    color: tuple = (0.0, 0.0, 0.0)  # RGB color (r, g, b) where each value is 0.0-1.0
\ No newline at end of file
+    color: tuple = (0.0, 0.0, 0.0)  # RGB color (r, g, b) where each value is 0.0-1.0
+    start_anchor: tuple = None  # Optional ("wall", id, "start"/"end") or ("opening", id, "left"/"right")
+    end_anchor: tuple = None  # Same for the end point; anchored ends follow their wall or opening
\ No newline at end of file
@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 
@@ -59,6 +60,8 @@ DEFAULT_SETTINGS = {
     "DEFAULT_MATERIAL_COST_UNIT": "per sq ft",
     "LABOR_COST_PER_HOUR": 50.0,
     "TAX_RATE_PERCENTAGE": 8.0,
+    "PRICE_CATALOG_PATH": "",
+    "MATERIAL_LIBRARY_PATH": "",
     "ALLOW_CURVED_WALLS": False,
     "DEFAULT_INTERIOR_WALL_MATERIAL": "Drywall",
     "DEFAULT_EXTERIOR_WALL_MATERIAL": "Brick",
@@ -67,14 +70,37 @@ DEFAULT_SETTINGS = {
     "MAX_RECENT_FILES": 6,
     "POLYLINE_TYPE": "solid",
     "SHOW_PROPERTIES_PANEL": False,
+    "SHOW_ESTIMATE_PANEL": True,
+    "LIVE_ESTIMATE_DELAY_MS": 400,
     "JOINT_SNAP_TOLERANCE": 1,
-    "MAX_WALL_PLATE_INCHES": 192
+    "MAX_WALL_PLATE_INCHES": 192,
+    "SAW_KERF_INCHES": 0.125,
+    "SHOW_PERF_HUD": False,
+    "PARTIAL_REDRAW": True,
+    "TILED_RENDERING": False,
+    "TILE_SIZE": 256,
+    "TILE_CACHE_SIZE": 512,
+    "TILE_RENDER_THREADS": 0,
+    "BOX_SELECT_PREVIEW": True,
+    "LOD_ENABLED": True,
+    "LOD_DOOR_FULL_PX": 24.0,
+    "LOD_DOOR_MIN_PX": 4.0,
+    "LOD_WINDOW_FULL_PX": 24.0,
+    "LOD_WINDOW_MIN_PX": 4.0,
+    "LOD_TEXT_FULL_PX": 5.0,
+    "LOD_TEXT_MIN_PX": 1.5,
+    "LOD_DIMENSION_FULL_PX": 40.0,
+    "LOD_DIMENSION_MIN_PX": 6.0,
+    "LOD_STUD_FULL_PX": 48.0,
+    "LOD_STUD_MIN_PX": 6.0,
+    "SHOW_FRAMING_LAYER": False,
+    "PROFILE_OUTPUT_DIR": ""
 }
 
-def load_config():
-    if os.path.exists(CONFIG_FILE):
+def load_config(path=CONFIG_FILE):
+    if os.path.exists(path):
         try:
-            with open(CONFIG_FILE, "r") as f:
+            with open(path, "r") as f:
                 contents = f.read().strip()
                 if not contents:
                     return DEFAULT_SETTINGS.copy()
@@ -85,7 +111,112 @@ def load_config():
         settings = DEFAULT_SETTINGS.copy()
     return settings
 
-def save_config(settings):
-    os.makedirs(os.path.dirname(CONFIG_FILE), exist_ok=True)
-    with open(CONFIG_FILE, "w") as f:
+def save_config(settings, path=CONFIG_FILE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
         json.dump(settings, f, indent=4)
+
+
+_MISSING = object()
+
+
+class Settings:
+    """
+    The application's runtime settings: the single in-memory source of truth.
+
+    Settings are plain attributes (config.SHOW_GRID), so code written against the old
+    SimpleNamespace keeps working. Assigning a setting, or update() for several at
+    once, notifies listeners with a {key: new value} dict of what actually changed.
+    reload_if_changed() re-reads the settings file only when its mtime moved, which
+    makes it cheap enough to call before every batch job. copy.copy() and
+    copy.deepcopy() give settings with the same values and no listeners.
+    """
+
+    __slots__ = ("_path", "_mtime", "_listeners", "__dict__")
+
+    def __init__(self, path=CONFIG_FILE, **values):
+        object.__setattr__(self, "_path", path)
+        object.__setattr__(self, "_mtime", None)
+        object.__setattr__(self, "_listeners", [])
+        self.__dict__.update(values)
+
+    def __setattr__(self, key, value):
+        if key in Settings.__slots__:
+            object.__setattr__(self, key, value)
+        else:
+            self.update({key: value})
+
+    def __copy__(self):
+        return Settings(self._path, **self.__dict__)
+
+    def __deepcopy__(self, memo):
+        return Settings(self._path, **copy.deepcopy(self.__dict__, memo))
+
+    def __repr__(self):
+        return f"Settings({self._path!r}, {len(self.__dict__)} keys)"
+
+    def get(self, key, default=None):
+        return self.__dict__.get(key, default)
+
+    def as_dict(self):
+        return dict(self.__dict__)
+
+    # ───── change notification ─────
+    def add_listener(self, callback):
+        """Register callback(changed) to be called with {key: new value} after settings change."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def update(self, values):
+        """Set several settings at once; listeners are told once, about the keys that changed."""
+        changed = {}
+        for key, value in values.items():
+            if self.__dict__.get(key, _MISSING) != value:
+                self.__dict__[key] = value
+                changed[key] = value
+        if changed:
+            for callback in list(self._listeners):
+                callback(changed)
+        return changed
+
+    # ───── persistence ─────
+    def _file_mtime(self):
+        try:
+            return os.stat(self._path).st_mtime_ns
+        except OSError:
+            return None
+
+    def load(self):
+        """Replace the in-memory settings with the contents of the settings file, over DEFAULT_SETTINGS."""
+        mtime = self._file_mtime()
+        values = dict(DEFAULT_SETTINGS)
+        values.update(load_config(self._path))
+        object.__setattr__(self, "_mtime", mtime)
+        return self.update(values)
+
+    def reload_if_changed(self):
+        """Re-read the settings file if it was modified since it was last loaded or saved."""
+        if self._file_mtime() == self._mtime:
+            return False
+        self.load()
+        return True
+
+    def save(self):
+        save_config(self.as_dict(), self._path)
+        object.__setattr__(self, "_mtime", self._file_mtime())
+
+
+_settings = None
+
+
+def get_settings():
+    """The process-wide Settings, loaded from settings.json on first use."""
+    global _settings
+    if _settings is None:
+        _settings = Settings()
+        _settings.load()
+    return _settings
@@ -0,0 +1,255 @@
+import math
+
+from document import (
+    WALL_ADDED, WALL_MOVED, WALL_CHANGED, WALL_REMOVED, OPENING_CHANGED,
+    ANNOTATION_CHANGED, BULK_RELOAD,
+)
+
+# Dimension anchors are plain tuples so they survive deepcopy (undo) and are easy to persist:
+#   ("wall", wall_identifier, "start" | "end")
+#   ("opening", door_or_window_identifier, "left" | "right")
+WALL_ANCHOR = "wall"
+OPENING_ANCHOR = "opening"
+
+
+def format_anchor(anchor):
+    """Serialize an anchor tuple as "kind:identifier:side" (empty string for None)."""
+    return ":".join(anchor) if anchor else ""
+
+
+def parse_anchor(text):
+    """Inverse of format_anchor(); returns None for empty or malformed text."""
+    if not text:
+        return None
+    parts = text.split(":")
+    if len(parts) != 3 or parts[0] not in (WALL_ANCHOR, OPENING_ANCHOR):
+        return None
+    return tuple(parts)
+
+
+def opening_edge(wall, opening, ratio, side):
+    """Model point of the left (towards wall.start) or right edge of an opening on its wall."""
+    dx = wall.end[0] - wall.start[0]
+    dy = wall.end[1] - wall.start[1]
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return wall.start
+    along = ratio * length + (-opening.width / 2 if side == "left" else opening.width / 2)
+    return (wall.start[0] + dx * along / length, wall.start[1] + dy * along / length)
+
+
+class DimensionLinks:
+    """
+    Keeps associative dimensions attached to the wall endpoints and opening edges they measure.
+
+    A dimension is associative when its start_anchor and/or end_anchor is set. The
+    links keep reverse indexes from wall and opening identifiers to their dependent
+    dimensions, so a WALL_MOVED event only touches the dimensions of the walls that
+    moved. Adding or removing walls or dimensions just marks the indexes stale; they
+    are rebuilt on the next lookup. Openings are indexed by their position in the
+    document's doors/windows list, which a drag keeps, so moving one never triggers
+    a rebuild; a position that no longer holds the opening does. Openings with
+    dependent dimensions are also indexed by their host wall's identifier, so a wall
+    move only visits the openings on the walls that moved.
+
+    Dimensions are updated in place from inside the document listener without
+    publishing another event; the canvas redraws after every wall move anyway.
+    """
+
+    def __init__(self, document, enabled=True):
+        self.document = document
+        self.enabled = enabled
+        self._by_wall = {}      # wall identifier -> [Dimension]
+        self._by_opening = {}   # opening identifier -> [Dimension]
+        self._walls = {}        # wall identifier -> Wall
+        self._openings = {}     # opening identifier -> ("doors" | "windows", index)
+        self._by_host = {}      # wall identifier -> {anchored opening identifier}
+        self._host_of = {}      # anchored opening identifier -> host wall identifier
+        self._dirty = True
+        document.add_listener(self.on_document_changed)
+
+    # ───── indexes ─────
+    def invalidate(self):
+        self._dirty = True
+
+    def _rebuild(self):
+        document = self.document
+        self._walls = {}
+        for wall_set in document.wall_sets:
+            for wall in wall_set:
+                if wall.identifier:
+                    self._walls[wall.identifier] = wall
+        self._openings = {}
+        for name in ("doors", "windows"):
+            for index, (wall, opening, ratio) in enumerate(getattr(document, name)):
+                if wall is not None and opening.identifier:
+                    self._openings[opening.identifier] = (name, index)
+        self._by_wall = {}
+        self._by_opening = {}
+        for dimension in document.dimensions:
+            for anchor in (dimension.start_anchor, dimension.end_anchor):
+                if not anchor:
+                    continue
+                index = self._by_wall if anchor[0] == WALL_ANCHOR else self._by_opening
+                dependents = index.setdefault(anchor[1], [])
+                if not dependents or dependents[-1] is not dimension:
+                    dependents.append(dimension)
+        self._by_host = {}
+        self._host_of = {}
+        for opening_id in self._by_opening:
+            entry = self._openings.get(opening_id)
+            if entry is not None:
+                self._set_host(opening_id, getattr(document, entry[0])[entry[1]][0].identifier)
+        self._dirty = False
+
+    def _set_host(self, opening_id, host_id):
+        """Record that an anchored opening is now on the wall host_id (None if it has no host)."""
+        old = self._host_of.pop(opening_id, None)
+        if old is not None:
+            hosted = self._by_host.get(old)
+            if hosted is not None:
+                hosted.discard(opening_id)
+                if not hosted:
+                    del self._by_host[old]
+        if host_id:
+            self._host_of[opening_id] = host_id
+            self._by_host.setdefault(host_id, set()).add(opening_id)
+
+    def _opening(self, identifier):
+        """The current (wall, opening, ratio) of an opening identifier, or None."""
+        for attempt in range(2):
+            if self._dirty:
+                self._rebuild()
+            entry = self._openings.get(identifier)
+            if entry is None:
+                return None
+            items = getattr(self.document, entry[0])
+            if entry[1] < len(items) and items[entry[1]][1].identifier == identifier:
+                item = items[entry[1]]
+                return item if item[0] is not None else None
+            # Openings were added or removed in front of this one.
+            self._dirty = True
+        return None
+
+    def dependents_of_walls(self, walls):
+        """Dimensions anchored to any of walls, directly or through an opening on them."""
+        if self._dirty:
+            self._rebuild()
+        found = {}
+        for wall in walls:
+            for dimension in self._by_wall.get(wall.identifier, ()):
+                found[id(dimension)] = dimension
+            # By identifier: after undo an opening's host is a copy of the wall in wall_sets.
+            for opening_id in self._by_host.get(wall.identifier, ()) if wall.identifier else ():
+                for dimension in self._by_opening.get(opening_id, ()):
+                    found[id(dimension)] = dimension
+        return list(found.values())
+
+    def dependents_of_openings(self, openings):
+        if self._dirty:
+            self._rebuild()
+        found = {}
+        for opening in openings:
+            for dimension in self._by_opening.get(opening.identifier, ()):
+                found[id(dimension)] = dimension
+        return list(found.values())
+
+    # ───── resolution ─────
+    def resolve(self, anchor):
+        """Current model point of an anchor, or None when its wall/opening no longer exists."""
+        if self._dirty:
+            self._rebuild()
+        kind, identifier, side = anchor
+        if kind == WALL_ANCHOR:
+            wall = self._walls.get(identifier)
+            if wall is None:
+                return None
+            return wall.start if side == "start" else wall.end
+        item = self._opening(identifier)
+        if item is None:
+            return None
+        return opening_edge(item[0], item[1], item[2], side)
+
+    def update(self, dimensions):
+        """Move the anchored ends of dimensions onto their anchors; returns the ones that changed."""
+        changed = []
+        for dimension in dimensions:
+            start = self.resolve(dimension.start_anchor) if dimension.start_anchor else None
+            end = self.resolve(dimension.end_anchor) if dimension.end_anchor else None
+            start = start or dimension.start
+            end = end or dimension.end
+            if start != dimension.start or end != dimension.end:
+                dimension.start = start
+                dimension.end = end
+                changed.append(dimension)
+        return changed
+
+    def on_document_changed(self, event):
+        kind = event.kind
+        if kind in (BULK_RELOAD, WALL_ADDED, WALL_REMOVED, ANNOTATION_CHANGED):
+            self._dirty = True
+            return
+        if kind == OPENING_CHANGED:
+            # Added or removed openings are caught by _opening()'s position check; an
+            # anchored opening dragged onto another wall moves to that wall's entry.
+            for opening in event.objects:
+                if opening.identifier in self._host_of or opening.identifier in self._by_opening:
+                    item = self._opening(opening.identifier)
+                    host_id = item[0].identifier if item is not None else None
+                    if self._host_of.get(opening.identifier) != host_id:
+                        self._set_host(opening.identifier, host_id)
+            if self.enabled:
+                self.update(self.dependents_of_openings(event.objects))
+        elif kind in (WALL_MOVED, WALL_CHANGED):
+            if kind == WALL_CHANGED and not self._dirty:
+                # Joins and separations regroup walls without removing any; just
+                # refresh the entries of the walls named in the event.
+                for wall in event.objects:
+                    if wall.identifier:
+                        self._walls[wall.identifier] = wall
+            if self.enabled:
+                self.update(self.dependents_of_walls(event.objects))
+
+    # ───── binding ─────
+    def _identify(self, obj, component_type):
+        """Give obj an identifier if it was loaded without one, so it can be anchored to."""
+        if not obj.identifier:
+            obj.identifier = self.document.new_identifier(component_type)
+            self._dirty = True
+        return obj.identifier
+
+    def wall_anchor(self, wall, side):
+        return (WALL_ANCHOR, self._identify(wall, "wall"), side)
+
+    def anchor_at(self, point, tolerance):
+        """
+        Return (anchor, snapped point) for the wall endpoint or opening edge nearest
+        point within tolerance model inches, or (None, point) if there is none.
+        """
+        best = None
+        best_dist = tolerance
+        for wall_set in self.document.wall_sets:
+            for wall in wall_set:
+                for side in ("start", "end"):
+                    candidate = getattr(wall, side)
+                    dist = math.hypot(candidate[0] - point[0], candidate[1] - point[1])
+                    if dist <= best_dist:
+                        best_dist = dist
+                        best = (wall, "wall", side, candidate)
+        for item in self.document.doors + self.document.windows:
+            wall, opening, ratio = item
+            if wall is None:
+                continue
+            for side in ("left", "right"):
+                candidate = opening_edge(wall, opening, ratio, side)
+                dist = math.hypot(candidate[0] - point[0], candidate[1] - point[1])
+                if dist < best_dist:
+                    best_dist = dist
+                    best = (opening, "opening", side, candidate)
+        if best is None:
+            return None, point
+        obj, kind, side, candidate = best
+        if kind == WALL_ANCHOR:
+            return self.wall_anchor(obj, side), candidate
+        component_type = "door" if any(obj is door for _, door, _ in self.document.doors) else "window"
+        return (OPENING_ANCHOR, self._identify(obj, component_type), side), candidate
@@ -0,0 +1,165 @@
+import random
+import string
+from dataclasses import dataclass
+from typing import Callable, List
+
+
+# Change event kinds published by Document.notify()
+WALL_ADDED = "wall-added"
+WALL_MOVED = "wall-moved"
+WALL_CHANGED = "wall-changed"        # non-geometric property or wall set membership
+WALL_REMOVED = "wall-removed"
+OPENING_CHANGED = "opening-changed"  # door or window added, moved, edited or removed
+ROOM_CHANGED = "room-changed"
+POLYLINE_CHANGED = "polyline-changed"
+ANNOTATION_CHANGED = "annotation-changed"  # texts and dimensions
+BULK_RELOAD = "bulk-reload"          # everything may have changed (open, import, undo)
+
+# Collections that carry their own version counter
+COLLECTIONS = ("walls", "openings", "rooms", "polylines", "annotations")
+
+_EVENT_COLLECTIONS = {
+    WALL_ADDED: ("walls",),
+    WALL_MOVED: ("walls",),
+    WALL_CHANGED: ("walls",),
+    WALL_REMOVED: ("walls",),
+    OPENING_CHANGED: ("openings",),
+    ROOM_CHANGED: ("rooms",),
+    POLYLINE_CHANGED: ("polylines",),
+    ANNOTATION_CHANGED: ("annotations",),
+    BULK_RELOAD: COLLECTIONS,
+}
+
+
+@dataclass(frozen=True)
+class ChangeEvent:
+    """A single model change as delivered to Document listeners."""
+    kind: str                 # one of the event kinds above
+    objects: tuple = ()       # affected model objects, if known
+    collections: tuple = ()   # collections whose version was bumped
+    version: int = 0          # document-wide version after the change
+
+
+def generate_identifier(component_type: str, existing_ids: List[str]) -> str:
+    ''' Generate a unique identifier for a component.
+
+     The identifier format is: {component_type}-{8 chars}-{4 chars}-{4 chars}-{4 chars}-{12 chars}
+
+     Example: wall-A1B2C3D4-E5F6-G7H8-I9J0-K1L2M3N4O5P6
+
+     Parameters:
+         component_type (str): The type of component (e.g., "wall", "door").
+         existing_ids (List[str]): List of existing identifiers to ensure uniqueness.'''
+    characters = string.ascii_letters + string.digits
+    while True:
+        pt1 = ''.join(random.choices(characters, k=8))
+        pt2 = ''.join(random.choices(characters, k=4))
+        pt3 = ''.join(random.choices(characters, k=4))
+        pt4 = ''.join(random.choices(characters, k=4))
+        pt5 = ''.join(random.choices(characters, k=12))
+        identifier = f"{component_type}-{pt1}-{pt2}-{pt3}-{pt4}-{pt5}".lower()
+        if identifier not in existing_ids:
+            return identifier
+
+
+class Document:
+    """
+    Headless container for everything that makes up a project.
+
+    The Document owns the model collections (walls, rooms, openings and
+    annotations) together with the identifier registry, and never touches
+    GTK. CanvasArea wraps one of these for interactive editing, while
+    project_io, sh3d_importer and the takeoff code can work on a Document
+    directly in scripts and batch jobs.
+    """
+
+    def __init__(self):
+        # Walls: finished chains plus the chain currently being drawn
+        self.wall_sets = []   # list of lists of Wall
+        self.walls = []       # in-progress chain (list of Wall)
+
+        # Polylines: finished sets plus the segments currently being drawn
+        self.polyline_sets = []
+        self.polylines = []
+
+        self.rooms = []       # Finalized Room objects
+
+        # Openings; each item is a tuple: (wall, door_or_window, position_ratio)
+        self.doors = []
+        self.windows = []
+
+        # Annotations
+        self.texts = []
+        self.dimensions = []
+
+        # Identifier registry
+        self.existing_ids = []
+
+        # Change bus: monotonically increasing version per collection
+        self.versions = dict.fromkeys(COLLECTIONS, 0)
+        self._version = 0
+        self._listeners = []
+
+    # ───── change events ─────
+    def add_listener(self, callback: Callable) -> None:
+        """Register callback(event) to be called with a ChangeEvent after each change."""
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable) -> None:
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def version(self, collection: str = None) -> int:
+        """Return the version of one collection, or of the whole document.
+
+        Caches store the version they were built against and compare it with
+        the current one to find out cheaply whether they are stale.
+        """
+        if collection is None:
+            return self._version
+        return self.versions[collection]
+
+    def notify(self, kind: str, objects=()) -> ChangeEvent:
+        """Bump the affected version counters and tell every listener.
+
+        Args:
+            kind (str): One of the change event kinds, e.g. WALL_MOVED.
+            objects: The model objects affected by the change, if known.
+
+        Returns:
+            ChangeEvent: The event that was delivered.
+        """
+        collections = _EVENT_COLLECTIONS[kind]
+        for name in collections:
+            self.versions[name] += 1
+        self._version += 1
+        event = ChangeEvent(kind, tuple(objects or ()), collections, self._version)
+        for callback in list(self._listeners):
+            callback(event)
+        return event
+
+    # ───── helpers ─────
+    def clear(self) -> None:
+        """Remove every element from the document."""
+        self.wall_sets.clear()
+        self.walls.clear()
+        self.polyline_sets.clear()
+        self.polylines.clear()
+        self.rooms.clear()
+        self.doors.clear()
+        self.windows.clear()
+        self.texts.clear()
+        self.dimensions.clear()
+        self.existing_ids.clear()
+        self.notify(BULK_RELOAD)
+
+    def all_walls(self) -> list:
+        """Return every finished wall as a flat list."""
+        return [wall for wall_set in self.wall_sets for wall in wall_set]
+
+    def new_identifier(self, component_type: str) -> str:
+        """Generate a unique identifier and register it with the document."""
+        identifier = generate_identifier(component_type, self.existing_ids)
+        self.existing_ids.append(identifier)
+        return identifier
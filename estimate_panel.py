@@ -0,0 +1,190 @@
+import gi
+gi.require_version('Gtk', '4.0')
+from gi.repository import Gtk, GLib
+
+from Takeoff.cost_engine import get_price_catalog
+from Takeoff.framing_takeoff import LUMBER_SIZES
+from Takeoff.live_estimate import LiveEstimator
+
+
+class EstimatePanel(Gtk.Box):
+    """
+    Side panel showing the project estimate, kept current while the plan is edited.
+
+    Document changes are debounced; once edits pause for LIVE_ESTIMATE_DELAY_MS the
+    takeoff runs on a worker thread (LiveEstimator) and the labels are updated from
+    GLib.idle_add. A newer edit cancels the pending result, so the panel never shows
+    an estimate older than the one it replaces.
+    """
+
+    def __init__(self, canvas):
+        super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=6)
+        self.canvas = canvas
+        self.config = canvas.config
+        self.set_margin_top(6)
+        self.set_margin_bottom(6)
+        self.set_margin_start(6)
+        self.set_margin_end(6)
+        self.set_size_request(220, -1)
+
+        title = Gtk.Label()
+        title.set_markup("<b>Live Estimate</b>")
+        title.set_halign(Gtk.Align.START)
+        self.append(title)
+
+        self.status_label = Gtk.Label(label="Estimating…")
+        self.status_label.set_halign(Gtk.Align.START)
+        self.append(self.status_label)
+
+        # ─────────── Framing ───────────
+        framing_frame = Gtk.Frame(label="Framing")
+        self.framing_grid = Gtk.Grid(column_spacing=12, row_spacing=4)
+        self.framing_grid.set_margin_top(6)
+        self.framing_grid.set_margin_bottom(6)
+        self.framing_grid.set_margin_start(6)
+        self.framing_grid.set_margin_end(6)
+        framing_frame.set_child(self.framing_grid)
+        self.append(framing_frame)
+
+        self.framing_labels = {}
+        for row, size in enumerate(LUMBER_SIZES.values()):
+            name = Gtk.Label(label=size)
+            name.set_halign(Gtk.Align.START)
+            self.framing_grid.attach(name, 0, row, 1, 1)
+            value = Gtk.Label(label="—")
+            value.set_halign(Gtk.Align.START)
+            self.framing_grid.attach(value, 1, row, 1, 1)
+            self.framing_labels[size] = value
+
+        # ─────────── Finishes ───────────
+        finish_frame = Gtk.Frame(label="Finishes")
+        finish_grid = Gtk.Grid(column_spacing=12, row_spacing=4)
+        finish_grid.set_margin_top(6)
+        finish_grid.set_margin_bottom(6)
+        finish_grid.set_margin_start(6)
+        finish_grid.set_margin_end(6)
+        finish_frame.set_child(finish_grid)
+        self.append(finish_frame)
+
+        # (estimate key, title, unit)
+        self.finish_labels = {}
+        for row, (key, title, unit) in enumerate([("floor_area", "Floor", "sq ft"),
+                                                  ("net_wall_area", "Walls (net)", "sq ft"),
+                                                  ("ceiling_area", "Ceilings", "sq ft"),
+                                                  ("baseboard_length", "Baseboard", "ft")]):
+            name = Gtk.Label(label=title)
+            name.set_halign(Gtk.Align.START)
+            finish_grid.attach(name, 0, row, 1, 1)
+            value = Gtk.Label(label="—")
+            value.set_halign(Gtk.Align.END)
+            value.set_hexpand(True)
+            finish_grid.attach(value, 1, row, 1, 1)
+            self.finish_labels[key] = (value, unit)
+
+        # Panel counts and waste from the sheet goods layout
+        self.sheet_labels = {}
+        for row, (kind, title) in enumerate([("interior", "Drywall"), ("exterior", "Sheathing")],
+                                            start=len(self.finish_labels)):
+            name = Gtk.Label(label=title)
+            name.set_halign(Gtk.Align.START)
+            finish_grid.attach(name, 0, row, 1, 1)
+            value = Gtk.Label(label="—")
+            value.set_halign(Gtk.Align.END)
+            value.set_hexpand(True)
+            finish_grid.attach(value, 1, row, 1, 1)
+            self.sheet_labels[kind] = value
+
+        # ─────────── Cost ───────────
+        cost_frame = Gtk.Frame(label="Cost")
+        cost_grid = Gtk.Grid(column_spacing=12, row_spacing=4)
+        cost_grid.set_margin_top(6)
+        cost_grid.set_margin_bottom(6)
+        cost_grid.set_margin_start(6)
+        cost_grid.set_margin_end(6)
+        cost_frame.set_child(cost_grid)
+        self.append(cost_frame)
+
+        self.cost_labels = {}
+        for row, (key, title) in enumerate([("material", "Materials"), ("labor", "Labor"),
+                                            ("tax", "Tax"), ("total", "Total")]):
+            name = Gtk.Label(label=title)
+            name.set_halign(Gtk.Align.START)
+            cost_grid.attach(name, 0, row, 1, 1)
+            value = Gtk.Label(label="—")
+            value.set_halign(Gtk.Align.END)
+            value.set_hexpand(True)
+            cost_grid.attach(value, 1, row, 1, 1)
+            self.cost_labels[key] = value
+
+        self._debounce_id = None
+        self.estimator = LiveEstimator(canvas.document, self.config, self.on_estimate, GLib.idle_add,
+                                       on_error=self.on_estimate_failed)
+        canvas.document.add_listener(self.on_document_changed)
+        if hasattr(self.config, "add_listener"):
+            # Plate length and similar settings change the estimate too
+            self.config.add_listener(self.on_settings_changed)
+        # So do price edits made in Manage Materials
+        get_price_catalog(self.config).add_listener(self.on_catalog_changed)
+        self.connect("destroy", lambda widget: self.shutdown())
+        self.estimator.request()
+
+    def shutdown(self):
+        if self._debounce_id is not None:
+            GLib.source_remove(self._debounce_id)
+            self._debounce_id = None
+        self.canvas.document.remove_listener(self.on_document_changed)
+        if hasattr(self.config, "remove_listener"):
+            self.config.remove_listener(self.on_settings_changed)
+        get_price_catalog(self.config).remove_listener(self.on_catalog_changed)
+        self.estimator.shutdown()
+
+    def on_document_changed(self, event):
+        # Whatever is being computed now is already out of date.
+        self.estimator.cancel()
+        self.status_label.set_text("Estimating…")
+        if self._debounce_id is not None:
+            GLib.source_remove(self._debounce_id)
+        delay = int(getattr(self.config, "LIVE_ESTIMATE_DELAY_MS", 400))
+        self._debounce_id = GLib.timeout_add(delay, self._on_debounce_elapsed)
+
+    def on_settings_changed(self, changed):
+        self.on_document_changed(None)
+
+    def on_catalog_changed(self, key):
+        self.on_document_changed(None)
+
+    def _on_debounce_elapsed(self):
+        self._debounce_id = None
+        self.estimator.request()
+        return False  # GLib.SOURCE_REMOVE
+
+    def on_estimate(self, result):
+        """Show a finished estimate (called on the UI thread)."""
+        framing = result["framing"]
+        plates = result["plates"]
+        for size, label in self.framing_labels.items():
+            studs = framing[f"total_{size}_studs"]
+            plan = plates.get(size)
+            if not studs and plan is None:
+                label.set_text("—")
+                continue
+            text = f"{studs} studs"
+            if plan is not None:
+                boards = ", ".join(f"{count} × {int(length / 12)}'" for length, count in plan.counts().items())
+                text += f"\nplates {boards}"
+            label.set_text(text)
+        rooms = result["rooms"]
+        for key, (label, unit) in self.finish_labels.items():
+            label.set_text(f"{rooms[key]:,.0f} {unit}")
+        for kind, label in self.sheet_labels.items():
+            plan = result["sheets"][kind]
+            label.set_text(f"{plan.panels} panels ({plan.waste_pct:.0f}% waste)" if plan.panels else "—")
+        cost = result["cost"]
+        for key, label in self.cost_labels.items():
+            label.set_text(f"${getattr(cost, key):,.2f}")
+        self.status_label.set_text("Up to date" if not cost.unpriced
+                                   else f"Up to date ({len(cost.unpriced)} unpriced)")
+
+    def on_estimate_failed(self, message):
+        """Show that the takeoff raised (called on the UI thread); the figures stay at the last estimate."""
+        self.status_label.set_text(f"Estimate failed: {message}")
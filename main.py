@@ -1,7 +1,10 @@
+import cProfile
+import os
+import tempfile
+import time
 import gi
 gi.require_version('Gtk', '4.0')
-from gi.repository import Gtk, Gdk, Gio
-from types import SimpleNamespace
+from gi.repository import Gtk, Gdk, Gio, GLib
 import config
 import toolbar
 from Canvas import canvas_area
@@ -11,9 +14,11 @@ from Dialogs import estimate_materials
 from Dialogs import estimate_cost
 from Dialogs import help_dialog
 from properties_dock import PropertiesDock
+from estimate_panel import EstimatePanel
 from file_menu import create_file_menu
 from sh3d_importer import import_sh3d
 from project_io import save_project, open_project
+from document import WALL_CHANGED, POLYLINE_CHANGED, BULK_RELOAD
 
 class EstimatorApp(Gtk.Application):
     def __init__(self, config_constants):
@@ -25,6 +30,8 @@ class EstimatorApp(Gtk.Application):
         self.is_dirty = False
         # This is a list of recently opened files.
         self.recent_files = getattr(self.config, 'RECENT_FILES', [])
+        # Active cProfile capture (toggled with Ctrl+Shift+P)
+        self.profiler = None
     
     def do_startup(self):
         Gtk.Application.do_startup(self)
@@ -104,6 +111,8 @@ class EstimatorApp(Gtk.Application):
             'selection-changed',
             lambda canvas, selected: self.properties_dock.refresh_tabs(selected)
         )
+        # Properties Dock edits bypass save_state(), so they mark the project dirty here.
+        self.canvas.connect('properties-edited', lambda canvas, count: setattr(self, 'is_dirty', True))
 
         # Define toggle callbacks.
         def on_pointer_toggled(toggle_button):
@@ -277,6 +286,11 @@ class EstimatorApp(Gtk.Application):
             main_hbox.append(self.properties_dock)
             # Give canvas a reference to properties dock so it can update sidebar values
             self.canvas.properties_dock = self.properties_dock
+
+        # Live estimate, recomputed in the background as the plan changes
+        if getattr(self.config, 'SHOW_ESTIMATE_PANEL', True):
+            self.estimate_panel = EstimatePanel(self.canvas)
+            main_hbox.append(self.estimate_panel)
             
         vbox.append(main_hbox)
 
@@ -309,6 +323,9 @@ class EstimatorApp(Gtk.Application):
         self.properties_dock.refresh_tabs(self.canvas.selected_items)
 
         self.window.present()
+
+        # Pick up edits made to settings.json outside the app
+        GLib.timeout_add_seconds(2, self._reload_settings_file)
         
         # ---- Dirty State Handling ----
         # Connect the "changed" signal of the canvas to set the dirty state.
@@ -363,6 +380,7 @@ class EstimatorApp(Gtk.Application):
                     print("Esc pressed: Finalizing wall drawing")
                     # Removed duplicate save_state here
                     self.canvas.wall_sets.append(self.canvas.walls.copy())
+                    self.canvas.document.notify(WALL_CHANGED, self.canvas.walls)
                     self.canvas.walls = []
                     self.canvas.current_wall = None
                     self.canvas.drawing_wall = False
@@ -376,6 +394,7 @@ class EstimatorApp(Gtk.Application):
                     # commit any segments
                     if self.canvas.polylines:
                         self.canvas.polyline_sets.append(self.canvas.polylines.copy())
+                        self.canvas.document.notify(POLYLINE_CHANGED, self.canvas.polylines)
                     # clear in-progress state
                     self.canvas.drawing_polyline = False
                     self.canvas.current_polyline_start   = None
@@ -395,6 +414,12 @@ class EstimatorApp(Gtk.Application):
             elif keyname == "f1":
                 self.on_help_clicked(None)
                 return True
+            elif keyname == "f3":
+                self.canvas.toggle_perf_hud()
+                return True
+            elif keyname == "f4":
+                self.canvas.toggle_framing_layer()
+                return True
             elif keyname == "delete":
                 if self.canvas.selected_items:
                     self.canvas.delete_selected()
@@ -433,6 +458,9 @@ class EstimatorApp(Gtk.Application):
             elif keyname == "j":
                 self.canvas.join_selected_walls()
                 return True
+            elif keyname == "a":
+                self.canvas.select_all()
+                return True
             elif keyname == "s":
                 self.show_save_dialog()
                 return True
@@ -465,12 +493,33 @@ class EstimatorApp(Gtk.Application):
             elif keyname == "c":
                 self.on_estimate_cost_clicked(None)
                 return True
+            elif keyname == "p":
+                self.toggle_profiler()
+                return True
             elif keyname == "s":
                 self.show_save_as_dialog()
                 return True
 
         return False
 
+    def toggle_profiler(self):
+        """Start a cProfile capture of the live session, or stop it and dump a .prof file."""
+        if self.profiler is None:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+            print("Profiler started (Ctrl+Shift+P again to stop)")
+            return
+        self.profiler.disable()
+        output_dir = getattr(self.config, "PROFILE_OUTPUT_DIR", "") or tempfile.gettempdir()
+        filename = time.strftime("estisketch-%Y%m%d-%H%M%S.prof")
+        path = os.path.join(output_dir, filename)
+        try:
+            self.profiler.dump_stats(path)
+            print(f"Profile written to {path}")
+        except OSError as e:
+            print(f"Could not write profile to {path}: {e}")
+        self.profiler = None
+
     def on_zoom_in_clicked(self, button):
         center_x = self.canvas.get_width() / 2
         center_y = self.canvas.get_height() / 2
@@ -492,9 +541,14 @@ class EstimatorApp(Gtk.Application):
     def on_settings_response(self, dialog, response):
         if response == Gtk.ResponseType.OK:
             print("Settings updated")
-            config.save_config(self.config.__dict__)
+            self.config.save()
         dialog.destroy()
         
+    def _reload_settings_file(self):
+        if self.config.reload_if_changed():
+            self.canvas.queue_draw()
+        return True  # GLib.SOURCE_CONTINUE
+
     def on_manage_materials_clicked(self, button, *args):
         dialog = manage_materials.create_manage_materials_dialog(self.window, self.config, self.canvas)
         dialog.connect("response", self.on_manage_materials_response)
@@ -503,7 +557,7 @@ class EstimatorApp(Gtk.Application):
     def on_manage_materials_response(self, dialog, response):
         if response == Gtk.ResponseType.OK:
             print("Materials updated")
-            config.save_config(self.config.__dict__)
+            self.config.save()
         dialog.destroy()
 
     def on_estimate_materials_clicked(self, button):
@@ -511,7 +565,7 @@ class EstimatorApp(Gtk.Application):
         dialog.present()
 
     def on_estimate_cost_clicked(self, button):
-        dialog = estimate_cost.create_estimate_cost_dialog(self.window)
+        dialog = estimate_cost.create_estimate_cost_dialog(self.window, self.canvas)
         dialog.present()
 
     def on_help_clicked(self, button):
@@ -553,6 +607,7 @@ class EstimatorApp(Gtk.Application):
                 self.canvas.doors.extend(imported["doors"])
                 self.canvas.windows.extend(imported["windows"])
                 self.canvas.existing_ids.extend(imported["identifiers"])
+                self.canvas.document.notify(BULK_RELOAD)
                 # Mark the canvas as dirty since it has new content.
                 self.is_dirty = True
                 # Request redraw of canvas
@@ -602,12 +657,7 @@ class EstimatorApp(Gtk.Application):
     def clear_canvas_and_reset(self):
         """Clear the canvas and reset the application state."""
         # Clear all canvas content
-        self.canvas.wall_sets.clear()
-        self.canvas.walls.clear()
-        self.canvas.rooms.clear()
-        self.canvas.doors.clear()
-        self.canvas.windows.clear()
-        self.canvas.texts.clear()
+        self.canvas.document.clear()
         # Reset the current file path
         self.current_filepath = None
         # Reset the dirty state
@@ -789,7 +839,7 @@ class EstimatorApp(Gtk.Application):
         """Clear the recent files list."""
         self.recent_files = []
         self.config.RECENT_FILES = self.recent_files
-        config.save_config(self.config.__dict__)
+        self.config.save()
 
     def on_exit(self, action, parameter):
         self.window.emit("close-request")
@@ -838,12 +888,12 @@ class EstimatorApp(Gtk.Application):
     def do_shutdown(self):
         # Save recent files to config before shutdown
         self.config.RECENT_FILES = self.recent_files
-        config.save_config(self.config.__dict__)
+        self.config.save()
         Gtk.Application.do_shutdown(self)
 
 def main():
-    config_dict = config.load_config()
-    settings = SimpleNamespace(**config_dict)
+    # The canvas, dialogs and takeoff code all share this one settings object
+    settings = config.get_settings()
     app = EstimatorApp(settings)
     app.run(None)
 
@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import threading
+from collections import namedtuple
+
+DEFAULT_LIBRARY = os.path.join(os.path.dirname(__file__), "Resources", "materials.db")
+
+# Dimensions are in inches and None where they do not apply (paint, trim by the foot, ...)
+Material = namedtuple("Material", "sku name category thickness width length unit unit_price labor_hours")
+
+_COLUMNS = "sku, name, category, thickness, width, length, unit, unit_price, labor_hours"
+
+# Bulk lookups bind exactly this many SKUs per query, padding the last chunk, so every
+# chunk runs the same SQL text and reuses one prepared statement from the statement cache.
+LOOKUP_CHUNK = 256
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS materials ("
+    " sku TEXT PRIMARY KEY,"
+    " name TEXT NOT NULL,"
+    " category TEXT NOT NULL,"
+    " thickness REAL, width REAL, length REAL,"
+    " unit TEXT NOT NULL DEFAULT 'each',"
+    " unit_price REAL NOT NULL DEFAULT 0,"
+    " labor_hours REAL NOT NULL DEFAULT 0)",
+    # Browsing and paging: category, then name; the sku makes the order total
+    "CREATE INDEX IF NOT EXISTS materials_by_category ON materials (category, name, sku)",
+    # "2x6 stock at least 192 long", "1/2 sheets of 4x8"
+    "CREATE INDEX IF NOT EXISTS materials_by_dimensions ON materials (category, thickness, width, length)",
+)
+
+# Materials written into a new library, so walls and the cost engine have something to
+# price against. Lumber SKUs match the keys the takeoff produces (stud:2x6, lumber:2x6:192).
+_LUMBER = {"2x4": (1.5, 3.5, 0.55, 4.25), "2x6": (1.5, 5.5, 0.85, 6.75), "2x8": (1.5, 7.25, 1.15, 9.50)}
+
+
+def _seed_materials():
+    materials = []
+    for size, (thickness, width, per_foot, stud_price) in _LUMBER.items():
+        materials.append(Material(f"stud:{size}", f"{size} precut stud", "lumber", thickness, width, 92.625,
+                                  "each", stud_price, 0.15))
+        for length in (96, 120, 144, 168, 192, 240):
+            materials.append(Material(f"lumber:{size}:{length}", f"{size} x {length // 12}' plate stock", "lumber",
+                                      thickness, width, float(length), "each", round(per_foot * length / 12, 2), 0.1))
+    materials += [
+        Material("drywall:sheet", "1/2\" drywall, 4x8 sheet", "drywall", 0.5, 48.0, 96.0, "each", 15.50, 0.5),
+        Material("drywall:48x96", "1/2\" drywall, 4x8 sheet", "drywall", 0.5, 48.0, 96.0, "each", 15.50, 0.5),
+        Material("drywall:48x120", "1/2\" drywall, 4x10 sheet", "drywall", 0.5, 48.0, 120.0, "each", 19.75, 0.6),
+        Material("drywall:48x144", "1/2\" drywall, 4x12 sheet", "drywall", 0.5, 48.0, 144.0, "each", 23.50, 0.7),
+        Material("sheathing:48x96", "7/16\" OSB sheathing, 4x8", "sheathing", 0.4375, 48.0, 96.0, "each", 17.00, 0.4),
+        Material("sheathing:48x120", "7/16\" OSB sheathing, 4x10", "sheathing", 0.4375, 48.0, 120.0, "each", 23.00, 0.5),
+        Material("sheathing:48x144", "7/16\" OSB sheathing, 4x12", "sheathing", 0.4375, 48.0, 144.0, "each", 28.50, 0.6),
+        Material("paint:wall", "Interior wall paint, two coats", "paint", None, None, None, "sq ft", 0.35, 0.01),
+        Material("flooring:default", "Floor finish allowance", "flooring", None, None, None, "sq ft", 4.00, 0.03),
+        Material("baseboard:default", "Baseboard trim", "trim", None, None, None, "lin ft", 1.25, 0.03),
+        Material("interior:drywall", "Drywall", "interior finish", None, None, None, "sq ft", 1.10, 0.02),
+        Material("interior:tg-wood", "T&G Wood", "interior finish", None, None, None, "sq ft", 6.50, 0.06),
+        Material("exterior:hardie-lap", "Hardie Lap siding", "exterior finish", None, None, None, "sq ft", 4.75, 0.05),
+        Material("exterior:vinyl", "Vinyl siding", "exterior finish", None, None, None, "sq ft", 3.25, 0.04),
+        Material("exterior:stucco", "Stucco", "exterior finish", None, None, None, "sq ft", 8.50, 0.08),
+    ]
+    return materials
+
+
+class MaterialLibrary:
+    """
+    Local SQLite library of materials, indexed by SKU, category and dimensions.
+
+    Each thread gets its own connection, so the cost and takeoff engines can query
+    from worker threads while the UI pages through the library. Lookups for many
+    SKUs at once go through lookup() in fixed-size chunks instead of one query per
+    SKU. A new library file is created with a starter set of materials.
+    """
+
+    def __init__(self, path=DEFAULT_LIBRARY):
+        self.path = path
+        self._local = threading.local()
+        connection = self._connection()
+        with connection:
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            if connection.execute("SELECT COUNT(*) FROM materials").fetchone()[0] == 0:
+                self._insert(connection, _seed_materials())
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path)
+            self._local.connection = connection
+        return connection
+
+    def close(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
+
+    # ───── queries ─────
+    def count(self, category=None, search=None):
+        where, params = self._filter(category, search)
+        return self._connection().execute(f"SELECT COUNT(*) FROM materials{where}", params).fetchone()[0]
+
+    def page(self, offset, limit, category=None, search=None):
+        """Materials offset..offset+limit in (category, name, sku) order."""
+        where, params = self._filter(category, search)
+        rows = self._connection().execute(
+            f"SELECT {_COLUMNS} FROM materials{where} ORDER BY category, name, sku LIMIT ? OFFSET ?",
+            params + [limit, offset],
+        )
+        return [Material(*row) for row in rows]
+
+    @staticmethod
+    def _filter(category, search):
+        clauses = []
+        params = []
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if search:
+            clauses.append("(name LIKE ? OR sku LIKE ?)")
+            params += [f"%{search}%", f"%{search}%"]
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def categories(self):
+        return [row[0] for row in self._connection().execute(
+            "SELECT DISTINCT category FROM materials ORDER BY category")]
+
+    def names(self, category):
+        """Material names of one category, for choosers."""
+        return [row[0] for row in self._connection().execute(
+            "SELECT name FROM materials WHERE category = ? ORDER BY name", (category,))]
+
+    def find(self, category, thickness=None, width=None, min_length=None):
+        """Materials of a category with the given cross-section, shortest first."""
+        sql = f"SELECT {_COLUMNS} FROM materials WHERE category = ?"
+        params = [category]
+        if thickness is not None:
+            sql += " AND thickness = ?"
+            params.append(thickness)
+        if width is not None:
+            sql += " AND width = ?"
+            params.append(width)
+        if min_length is not None:
+            sql += " AND length >= ?"
+            params.append(min_length)
+        return [Material(*row) for row in self._connection().execute(sql + " ORDER BY length", params)]
+
+    def get(self, sku):
+        row = self._connection().execute(f"SELECT {_COLUMNS} FROM materials WHERE sku = ?", (sku,)).fetchone()
+        return Material(*row) if row else None
+
+    def lookup(self, skus):
+        """{sku: Material} for every SKU in skus that is in the library."""
+        skus = list(set(skus))
+        found = {}
+        connection = self._connection()
+        sql = f"SELECT {_COLUMNS} FROM materials WHERE sku IN ({','.join('?' * LOOKUP_CHUNK)})"
+        for start in range(0, len(skus), LOOKUP_CHUNK):
+            chunk = skus[start:start + LOOKUP_CHUNK]
+            chunk += [None] * (LOOKUP_CHUNK - len(chunk))
+            for row in connection.execute(sql, chunk):
+                found[row[0]] = Material(*row)
+        return found
+
+    def all(self):
+        return [Material(*row) for row in self._connection().execute(f"SELECT {_COLUMNS} FROM materials")]
+
+    # ───── edits ─────
+    @staticmethod
+    def _insert(connection, materials):
+        connection.executemany(
+            f"INSERT OR REPLACE INTO materials ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", materials
+        )
+
+    def upsert(self, materials):
+        """Add or replace materials (by SKU) in one transaction."""
+        connection = self._connection()
+        with connection:
+            self._insert(connection, materials)
+
+    def delete(self, skus):
+        connection = self._connection()
+        with connection:
+            connection.executemany("DELETE FROM materials WHERE sku = ?", [(sku,) for sku in skus])
+
+
+_library = None
+
+
+def get_material_library(config=None):
+    """The process-wide MaterialLibrary, opened from MATERIAL_LIBRARY_PATH (or Resources/materials.db)."""
+    global _library
+    if _library is None:
+        _library = MaterialLibrary(getattr(config, "MATERIAL_LIBRARY_PATH", "") or DEFAULT_LIBRARY)
+    return _library
@@ -1,11 +1,13 @@
 import xml.etree.ElementTree as ET
 from components import Wall, Room, Door, Window, Text, Dimension
+from document import Document, BULK_RELOAD
+from dimension_links import format_anchor, parse_anchor
 
 def save_project(canvas, window_width, window_height, filepath): 
     """ Save the entire project state to an XML file.
 
     Parameters:
-    canvas: The CanvasArea instance holding project elements.
+    canvas: The CanvasArea (or headless Document) holding project elements.
     window_width: The current width of the project window.
     window_height: The current height of the project window.
     filepath: The destination filepath to write the XML.
@@ -26,6 +28,8 @@ def save_project(canvas, window_width, window_height, filepath):
         for wall_index, wall in enumerate(wall_set):
             wall_mapping[id(wall)] = (set_index, wall_index)
             wall_elem = ET.SubElement(ws_elem, "Wall")
+            # The identifier is what associative dimensions are bound to.
+            ET.SubElement(wall_elem, "Identifier").text = wall.identifier
             # Save coordinates and dimensions.
             ET.SubElement(wall_elem, "Start", x=str(wall.start[0]), y=str(wall.start[1]))
             ET.SubElement(wall_elem, "End", x=str(wall.end[0]), y=str(wall.end[1]))
@@ -57,6 +61,7 @@ def save_project(canvas, window_width, window_height, filepath):
     doors_elem = ET.SubElement(root, "Doors")
     for attached_wall, door, ratio in canvas.doors:
         door_elem = ET.SubElement(doors_elem, "Door")
+        ET.SubElement(door_elem, "Identifier").text = door.identifier
         ET.SubElement(door_elem, "DoorType").text = door.door_type
         ET.SubElement(door_elem, "Width").text = str(door.width)
         ET.SubElement(door_elem, "Height").text = str(door.height)
@@ -81,6 +86,7 @@ def save_project(canvas, window_width, window_height, filepath):
     windows_elem = ET.SubElement(root, "Windows")
     for attached_wall, window_obj, ratio in canvas.windows:
         win_elem = ET.SubElement(windows_elem, "Window")
+        ET.SubElement(win_elem, "Identifier").text = window_obj.identifier
         ET.SubElement(win_elem, "Width").text = str(window_obj.width)
         ET.SubElement(win_elem, "Height").text = str(window_obj.height)
         ET.SubElement(win_elem, "WindowType").text = window_obj.window_type
@@ -132,6 +138,8 @@ def save_project(canvas, window_width, window_height, filepath):
         d_elem.set("color_r", str(color[0]))
         d_elem.set("color_g", str(color[1]))
         d_elem.set("color_b", str(color[2]))
+        d_elem.set("start_anchor", format_anchor(dimension.start_anchor))
+        d_elem.set("end_anchor", format_anchor(dimension.end_anchor))
 
     # Write out the XML to the given file (with declaration and proper encoding).
     tree = ET.ElementTree(root)
@@ -143,7 +151,7 @@ def open_project(canvas, filepath):
     """ Load a project from an XML file and update the canvas state.
     
     Parameters:
-    canvas: The CanvasArea instance where project elements will be restored.
+    canvas: The CanvasArea (or headless Document) where project elements will be restored.
     filepath: The file path of the XML project file.
     
     Returns:
@@ -186,7 +194,8 @@ def open_project(canvas, filepath):
                 exterior_wall = exterior_text.lower() == "true"
                 
                 # Create a new Wall instance.
-                wall = Wall(start, end, width, height, exterior_wall)
+                wall = Wall(start, end, width, height, exterior_wall,
+                            identifier=_load_identifier(canvas, wall_elem))
                 wall.material = wall_elem.find("Material").text
                 wall.interior_finish = wall_elem.find("InteriorFinish").text
                 wall.exterior_finish = wall_elem.find("ExteriorFinish").text
@@ -227,7 +236,8 @@ def open_project(canvas, filepath):
             orientation = door_elem.find("Orientation").text
             ratio = float(door_elem.find("AttachedToWallRatio").text)
             
-            door = Door(door_type, width, height, swing, orientation)
+            door = Door(door_type, width, height, swing, orientation,
+                        identifier=_load_identifier(canvas, door_elem))
             attached_wall = None
             wall_ref_elem = door_elem.find("WallReference")
             if wall_ref_elem is not None:
@@ -248,7 +258,8 @@ def open_project(canvas, filepath):
             window_type = win_elem.find("WindowType").text
             ratio = float(win_elem.find("AttachedToWallRatio").text)
             
-            window_obj = Window(win_width, win_height, window_type)
+            window_obj = Window(win_width, win_height, window_type,
+                                identifier=_load_identifier(canvas, win_elem))
             attached_wall = None
             wall_ref_elem = win_elem.find("WallReference")
             if wall_ref_elem is not None:
@@ -295,7 +306,9 @@ def open_project(canvas, filepath):
                 start=(start_x, start_y),
                 end=(end_x, end_y),
                 offset=offset,
-                identifier=identifier
+                identifier=identifier,
+                start_anchor=parse_anchor(d_elem.get("start_anchor", "")),
+                end_anchor=parse_anchor(d_elem.get("end_anchor", ""))
             )
             dimension_obj.text_size = float(d_elem.get("text_size", "12.0"))
             dimension_obj.show_arrows = d_elem.get("show_arrows", "True") == "True"
@@ -307,5 +320,31 @@ def open_project(canvas, filepath):
             
             canvas.dimensions.append(dimension_obj)
 
+    document = getattr(canvas, "document", canvas)
+    if hasattr(document, "notify"):
+        document.notify(BULK_RELOAD)
+
     # Return the saved window size.
     return window_width, window_height
+
+
+def _load_identifier(canvas, elem):
+    """ Read an element's <Identifier> (empty in older files) and register it. """
+    identifier = elem.findtext("Identifier") or ""
+    if identifier and identifier not in canvas.existing_ids:
+        canvas.existing_ids.append(identifier)
+    return identifier
+
+
+def load_document(filepath):
+    """ Load a project XML file into a new headless Document.
+
+    Parameters:
+    filepath: The file path of the XML project file.
+
+    Returns:
+    A tuple (document, window_width, window_height).
+    """
+    document = Document()
+    window_width, window_height = open_project(document, filepath)
+    return document, window_width, window_height
@@ -3,10 +3,28 @@ import os
 import json
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk
+from material_library import get_material_library
+
+
+def _combo_index(combo, value):
+    """Index of the first item in a ComboBoxText whose text is value, or 0 if there is none.
+
+    The dock's combos are filled once at construction, so the text -> index map is
+    built on first use and kept on the combo instead of walking the model each time.
+    """
+    index = getattr(combo, "_text_index", None)
+    if index is None:
+        index = {}
+        for i, row in enumerate(combo.get_model()):
+            # row[0] is the text for Gtk.ComboBoxText
+            index.setdefault(row[0], i)
+        combo._text_index = index
+    return index.get(value, 0)
+
 
 # Stub widgets—you can flesh these out with real controls
 class WallPropertiesWidget(Gtk.Box):
-    def __init__(self):
+    def __init__(self, config=None):
         super().__init__(orientation=Gtk.Orientation.VERTICAL, spacing=12)
         
         # ─── Initialize state fields ───
@@ -130,11 +148,14 @@ class WallPropertiesWidget(Gtk.Box):
         mat_row.append(self.material_combo)
         mat_box.append(mat_row)
 
+        # Finish choices come from the material library the canvas config points at
+        library = get_material_library(config)
+
         # Interior Finish
         int_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         int_row.append(Gtk.Label(label="Interior Finish:"))
         self.interior_combo = Gtk.ComboBoxText()
-        for val in ["Drywall", "T&G Wood"]:
+        for val in library.names("interior finish") or ["Drywall", "T&G Wood"]:
             self.interior_combo.append_text(val)
         self.interior_combo.set_active(0)
         int_row.append(self.interior_combo)
@@ -144,7 +165,7 @@ class WallPropertiesWidget(Gtk.Box):
         ext_row = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         ext_row.append(Gtk.Label(label="Exterior Finish:"))
         self.exterior_combo = Gtk.ComboBoxText()
-        for val in ["Hardie Lap siding", "Vinyl siding", "Stucco"]:
+        for val in library.names("exterior finish") or ["Hardie Lap siding", "Vinyl siding", "Stucco"]:
             self.exterior_combo.append_text(val)
         self.exterior_combo.set_active(0)
         ext_row.append(self.exterior_combo)
@@ -209,12 +230,7 @@ class WallPropertiesWidget(Gtk.Box):
     # ───── helpers ─────
     def _find_combo_index(self, combo, value):
         """Return the index of the item in combo whose text matches value, or 0 if not found."""
-        model = combo.get_model()
-        for i, row in enumerate(model):
-            # row[0] is the text for Gtk.ComboBoxText
-            if row[0] == value:
-                return i
-        return 0
+        return _combo_index(combo, value)
     
     # ───── handlers ─────
     def on_thickness_changed(self, combo):
@@ -236,9 +252,7 @@ class WallPropertiesWidget(Gtk.Box):
             return
 
         # Apply to all selected walls
-        for wall in self.current_walls:
-            wall.width = value
-        self.emit_property_changed()
+        self._apply(width=value)
 
     def on_height_changed(self, combo):
         if self._block_updates or not self.current_walls: return
@@ -251,91 +265,69 @@ class WallPropertiesWidget(Gtk.Box):
             height_feet = float(txt.split("'")[0])
             # Wall.height is stored in inches, UI shows feet, so convert
             height_inches = height_feet * 12.0
-            for wall in self.current_walls:
-                wall.height = height_inches
-        self.emit_property_changed()
+            self._apply(height=height_inches)
 
     def on_exterior_toggled(self, switch, gparam):
         if self._block_updates or not self.current_walls: return
         is_exterior = switch.get_active()
-        for wall in self.current_walls:
-            wall.exterior_wall = is_exterior
-        self.emit_property_changed()
+        self._apply(exterior_wall=is_exterior)
 
     def on_footer_toggled(self, button):
         if self._block_updates or not self.current_walls: return
         has_footer = button.get_active()
-        for wall in self.current_walls:
-            wall.footer = has_footer
-        self.emit_property_changed()
+        self._apply(footer=has_footer)
     
     def on_footer_left_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text().strip('"')
         if text.lower() != "custom":
             offset = float(text)
-            for wall in self.current_walls:
-                wall.footer_left_offset = offset
-        self.emit_property_changed()
+            self._apply(footer_left_offset=offset)
     
     def on_footer_right_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text().strip('"')
         if text.lower() != "custom":
             offset = float(text)
-            for wall in self.current_walls:
-                wall.footer_right_offset = offset
-        self.emit_property_changed()
+            self._apply(footer_right_offset=offset)
     
     def on_footer_depth_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text().strip('"')
         if text.lower() != "custom":
             depth = float(text)
-            for wall in self.current_walls:
-                wall.footer_depth = depth
-        self.emit_property_changed()
+            self._apply(footer_depth=depth)
     
     def on_material_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text()
         if text:
-            for wall in self.current_walls:
-                wall.material = text
-        self.emit_property_changed()
+            self._apply(material=text)
     
     def on_interior_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text()
         if text:
-            for wall in self.current_walls:
-                wall.interior_finish = text
-        self.emit_property_changed()
+            self._apply(interior_finish=text)
     
     def on_ext_finish_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text()
         if text:
-            for wall in self.current_walls:
-                wall.exterior_finish = text
-        self.emit_property_changed()
+            self._apply(exterior_finish=text)
     
     def on_stud_spacing_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text().strip('"')
         if text.lower() != "custom":
             spacing = float(text)
-            for wall in self.current_walls:
-                wall.stud_spacing = spacing
-        self.emit_property_changed()
+            self._apply(stud_spacing=spacing)
     
     def on_insulation_changed(self, combo):
         if self._block_updates or not self.current_walls: return
         text = combo.get_active_text()
         if text:
-            for wall in self.current_walls:
-                wall.insulation_type = text
-        self.emit_property_changed()
+            self._apply(insulation_type=text)
     
     def on_fire_rating_changed(self, combo):
         if self._block_updates or not self.current_walls: return
@@ -343,14 +335,11 @@ class WallPropertiesWidget(Gtk.Box):
         if text.lower() != "custom":
             # Extract the numeric part and convert to float
             rating = float(text.split()[0])
-            for wall in self.current_walls:
-                wall.fire_rating = rating
-        self.emit_property_changed()
+            self._apply(fire_rating=rating)
 
-    def emit_property_changed(self):
-        """Notify the rest of the app that the model changed."""
-        # you'll want to queue a redraw of the canvas:
-        self.canvas.queue_draw()
+    def _apply(self, **values):
+        """Set values on every selected wall as one undoable edit with one redraw."""
+        self.canvas.edit_properties(self.current_walls, **values)
 
     # ───── populate UI from a Wall instance ─────
     def set_wall(self, wall_objs):
@@ -524,53 +513,40 @@ class TextPropertiesWidget(Gtk.Box):
         
     def on_content_changed(self, entry):
         if self._block_updates or not self.current_texts: return
-        for text in self.current_texts:
-            text.content = entry.get_text()
-        self.emit_property_changed()
+        self._apply(content=entry.get_text())
         
     def on_size_changed(self, spin):
         if self._block_updates or not self.current_texts: return
-        for text in self.current_texts:
-            text.font_size = spin.get_value()
-        self.emit_property_changed()
+        self._apply(font_size=spin.get_value())
 
     def on_font_changed(self, combo):
         if self._block_updates or not self.current_texts: return
         font_family = combo.get_active_text()
-        for text in self.current_texts:
-            text.font_family = font_family
-        self.emit_property_changed()
+        self._apply(font_family=font_family)
     
     def on_rotation_changed(self, spin):
         if self._block_updates or not self.current_texts: return
         rotation = spin.get_value()
-        for text in self.current_texts:
-            text.rotation = rotation
-        self.emit_property_changed()
+        self._apply(rotation=rotation)
     
     def on_color_changed(self, color_button):
         if self._block_updates or not self.current_texts: return
         rgba = color_button.get_rgba()
         # Convert RGBA to RGB tuple (0.0-1.0 range)
         color = (rgba.red, rgba.green, rgba.blue)
-        for text in self.current_texts:
-            text.color = color
-        self.emit_property_changed()
+        self._apply(color=color)
 
     def on_style_toggled(self, check):
         if self._block_updates or not self.current_texts: return
         bold = self.bold_check.get_active()
         italic = self.italic_check.get_active()
         underline = self.underline_check.get_active()
-        for text in self.current_texts:
-            text.bold = bold
-            text.italic = italic
-            text.underline = underline
-        self.emit_property_changed()
+        self._apply(bold=bold, italic=italic, underline=underline)
     
-    def emit_property_changed(self):
+    def _apply(self, **values):
+        """Set values on every selected text; the canvas drops their cached layouts."""
         if hasattr(self, "canvas") and self.canvas:
-            self.canvas.queue_draw()
+            self.canvas.edit_properties(self.current_texts, **values)
         
     def set_text(self, text_objs):
         """Set text properties. Accepts either a single text object or a list of text objects."""
@@ -608,13 +584,7 @@ class TextPropertiesWidget(Gtk.Box):
         
         # Font Family
         all_same_font = all(t.font_family == first_text.font_family for t in text_objs)
-        idx = 0
-        model = self.font_combo.get_model()
-        for i, row in enumerate(model):
-            if row[0] == first_text.font_family:
-                idx = i
-                break
-        self.font_combo.set_active(idx)
+        self.font_combo.set_active(_combo_index(self.font_combo, first_text.font_family))
         
         # Color
         color = getattr(first_text, 'color', (0.0, 0.0, 0.0))
@@ -702,29 +672,25 @@ class DimensionPropertiesWidget(Gtk.Box):
     
     def on_text_size_changed(self, spin):
         if self._block_updates or not self.current_dimension: return
-        self.current_dimension.text_size = spin.get_value()
-        self.emit_property_changed()
+        self._apply(text_size=spin.get_value())
     
     def on_line_style_changed(self, combo):
         if self._block_updates or not self.current_dimension: return
-        self.current_dimension.line_style = combo.get_active_text()
-        self.emit_property_changed()
+        self._apply(line_style=combo.get_active_text())
     
     def on_color_changed(self, color_button):
         if self._block_updates or not self.current_dimension: return
         rgba = color_button.get_rgba()
         color = (rgba.red, rgba.green, rgba.blue)
-        self.current_dimension.color = color
-        self.emit_property_changed()
+        self._apply(color=color)
     
     def on_show_arrows_toggled(self, check):
         if self._block_updates or not self.current_dimension: return
-        self.current_dimension.show_arrows = check.get_active()
-        self.emit_property_changed()
+        self._apply(show_arrows=check.get_active())
     
-    def emit_property_changed(self):
+    def _apply(self, **values):
         if hasattr(self, "canvas") and self.canvas:
-            self.canvas.queue_draw()
+            self.canvas.edit_properties([self.current_dimension], **values)
     
     def set_dimension(self, dimension):
         """Set dimension to edit"""
@@ -835,9 +801,7 @@ class WindowPropertiesWidget(Gtk.Box):
         if self._block_updates or not self.current_windows: return
         window_type = combo.get_active_text()
         if window_type:
-            for wall, window, ratio in self.current_windows:
-                window.window_type = window_type
-        self.emit_property_changed()
+            self._apply(window_type=window_type)
     
     def on_width_changed(self, combo):
         if self._block_updates or not self.current_windows: return
@@ -846,9 +810,7 @@ class WindowPropertiesWidget(Gtk.Box):
         
         try:
             width = float(text.strip('"'))
-            for wall, window, ratio in self.current_windows:
-                window.width = width
-            self.emit_property_changed()
+            self._apply(width=width)
         except ValueError:
             pass
     
@@ -859,32 +821,23 @@ class WindowPropertiesWidget(Gtk.Box):
         
         try:
             height = float(text.strip('"'))
-            for wall, window, ratio in self.current_windows:
-                window.height = height
-            self.emit_property_changed()
+            self._apply(height=height)
         except ValueError:
             pass
     
     def on_elevation_changed(self, spin):
         if self._block_updates or not self.current_windows: return
         elevation = spin.get_value()
-        for wall, window, ratio in self.current_windows:
-            # Store elevation on window object
-            window.elevation = elevation
-        self.emit_property_changed()
+        self._apply(elevation=elevation)
     
-    def emit_property_changed(self):
+    def _apply(self, **values):
+        """Set values on every selected window as one undoable edit with one redraw."""
         if hasattr(self, "canvas") and self.canvas:
-            self.canvas.queue_draw()
-            self.canvas.save_state()
+            self.canvas.edit_properties([window for _, window, _ in self.current_windows], **values)
     
     def _find_combo_index(self, combo, value):
         """Find index of value in combo box"""
-        model = combo.get_model()
-        for i, row in enumerate(model):
-            if row[0] == value:
-                return i
-        return 0
+        return _combo_index(combo, value)
     
     def set_window(self, window_items):
         """Set window properties. Accepts either a single (wall, window, ratio) tuple or a list of them."""
@@ -1008,9 +961,7 @@ class DoorPropertiesWidget(Gtk.Box):
         if self._block_updates or not self.current_doors: return
         door_type = combo.get_active_text()
         if door_type:
-            for wall, door, ratio in self.current_doors:
-                door.door_type = door_type
-        self.emit_property_changed()
+            self._apply(door_type=door_type)
     
     def on_width_changed(self, combo):
         if self._block_updates or not self.current_doors: return
@@ -1019,9 +970,7 @@ class DoorPropertiesWidget(Gtk.Box):
         
         try:
             width = float(text.strip('"'))
-            for wall, door, ratio in self.current_doors:
-                door.width = width
-            self.emit_property_changed()
+            self._apply(width=width)
         except ValueError:
             pass
     
@@ -1032,9 +981,7 @@ class DoorPropertiesWidget(Gtk.Box):
         
         try:
             height = float(text.strip('"'))
-            for wall, door, ratio in self.current_doors:
-                door.height = height
-            self.emit_property_changed()
+            self._apply(height=height)
         except ValueError:
             pass
     
@@ -1042,30 +989,22 @@ class DoorPropertiesWidget(Gtk.Box):
         if self._block_updates or not self.current_doors: return
         swing = combo.get_active_text()
         if swing:
-            for wall, door, ratio in self.current_doors:
-                door.swing = swing
-        self.emit_property_changed()
+            self._apply(swing=swing)
     
     def on_orientation_changed(self, combo):
         if self._block_updates or not self.current_doors: return
         orientation = combo.get_active_text()
         if orientation:
-            for wall, door, ratio in self.current_doors:
-                door.orientation = orientation
-        self.emit_property_changed()
+            self._apply(orientation=orientation)
     
-    def emit_property_changed(self):
+    def _apply(self, **values):
+        """Set values on every selected door as one undoable edit with one redraw."""
         if hasattr(self, "canvas") and self.canvas:
-            self.canvas.queue_draw()
-            self.canvas.save_state()
+            self.canvas.edit_properties([door for _, door, _ in self.current_doors], **values)
     
     def _find_combo_index(self, combo, value):
         """Find index of value in combo box"""
-        model = combo.get_model()
-        for i, row in enumerate(model):
-            if row[0] == value:
-                return i
-        return 0
+        return _combo_index(combo, value)
     
     def set_door(self, door_items):
         """Set door properties. Accepts either a single (wall, door, ratio) tuple or a list of them."""
@@ -1115,6 +1054,8 @@ class PropertiesDock(Gtk.Box):
         super().__init__(orientation=Gtk.Orientation.HORIZONTAL)
         
         self.canvas = canvas
+        # (page, document version, ids of the objects) the visible page was last filled from
+        self._populated = None
 
         icon_dir = os.path.join(os.path.dirname(__file__), "Icons")
         
@@ -1154,7 +1095,7 @@ class PropertiesDock(Gtk.Box):
         self.stack.add_titled(blank_page, "blank", "No Selection")
 
         # Pre-create all pages and tabs upfront
-        self.wall_page = WallPropertiesWidget()
+        self.wall_page = WallPropertiesWidget(canvas.config)
         self.wall_page.canvas = canvas
         self.stack.add_titled(self.wall_page, "wall", "Wall Properties")
         
@@ -1254,7 +1195,8 @@ class PropertiesDock(Gtk.Box):
             
             # Populate wall properties with ALL selected walls (not just first)
             selected_walls = [item["object"] for item in wall_items]
-            self.wall_page.set_wall(selected_walls)
+            if self._needs_populate("wall", selected_walls):
+                self.wall_page.set_wall(selected_walls)
             
             # If not already on wall tab, switch to it with animation
             if not already_on_wall:
@@ -1273,7 +1215,8 @@ class PropertiesDock(Gtk.Box):
             
             # Populate text properties with ALL selected texts (not just first)
             selected_texts = [item["object"] for item in text_items]
-            self.text_page.set_text(selected_texts)
+            if self._needs_populate("text", selected_texts):
+                self.text_page.set_text(selected_texts)
             
             # If not already on text tab, switch to it with animation
             if not already_on_text:
@@ -1292,7 +1235,8 @@ class PropertiesDock(Gtk.Box):
             
             # Populate dimension properties with first selected dimension
             selected_dimension = dimension_items[0]["object"]
-            self.dimension_page.set_dimension(selected_dimension)
+            if self._needs_populate("dimension", [selected_dimension]):
+                self.dimension_page.set_dimension(selected_dimension)
             
             # If not already on dimension tab, switch to it with animation
             if not already_on_dimension:
@@ -1312,7 +1256,8 @@ class PropertiesDock(Gtk.Box):
             # Populate window properties with ALL selected windows (as tuples)
             # window_items contain {"type": "window", "object": (wall, window, ratio)}
             selected_windows = [item["object"] for item in window_items]
-            self.window_page.set_window(selected_windows)
+            if self._needs_populate("window", [window for _, window, _ in selected_windows]):
+                self.window_page.set_window(selected_windows)
             
             # If not already on window tab, switch to it with animation
             if not already_on_window:
@@ -1332,7 +1277,8 @@ class PropertiesDock(Gtk.Box):
             # Populate door properties with ALL selected doors (as tuples)
             # door_items contain {"type": "door", "object": (wall, door, ratio)}
             selected_doors = [item["object"] for item in door_items]
-            self.door_page.set_door(selected_doors)
+            if self._needs_populate("door", [door for _, door, _ in selected_doors]):
+                self.door_page.set_door(selected_doors)
             
             # If not already on door tab, switch to it with animation
             if not already_on_door:
@@ -1347,6 +1293,7 @@ class PropertiesDock(Gtk.Box):
                 self._set_active_tab("door")
         else:
         # Nothing selected - show blank and hide panel
+            self._populated = None
             self.stack.set_visible_child_name("blank")
             self.stack.set_visible(False)
             self.toggle_button.set_child(self.toggle_close_image)
@@ -1356,6 +1303,14 @@ class PropertiesDock(Gtk.Box):
                 tab_btn.set_active(False)
                 tab_btn.handler_unblock(tab_btn.handler_id)
 
+    def _needs_populate(self, page, objects):
+        """False when page already shows exactly these objects and nothing changed since."""
+        key = (page, self.canvas.document.version(), [id(obj) for obj in objects])
+        if key == self._populated:
+            return False
+        self._populated = key
+        return True
+
     def _set_active_tab(self, active_name):
         """Set the active tab while blocking signal handlers to prevent recursion."""
         for name, tab_btn in self.tabs.items():
@@ -5,13 +5,16 @@ import xml.etree.ElementTree as ET
 import math
 
 from components import Wall, Room, Door, Window
-from Canvas.canvas_area import CanvasArea
+from document import Document, BULK_RELOAD
 
-def import_sh3d(sh3d_file_path: str, canvas_area: CanvasArea) -> dict:
+def import_sh3d(sh3d_file_path: str, canvas_area=None) -> dict:
     """
     Import a Sweet Home 3D (.sh3d) file and extract walls, rooms, doors, and windows.
     All measurements (in centimeters) are converted to inches.
     Doors and windows are attached to the nearest wall based on a projection ratio.
+
+    The importer only builds model objects and never needs GTK; canvas_area is
+    accepted for backwards compatibility and is not used.
     """
     if not os.path.exists(sh3d_file_path):
         raise FileNotFoundError(f"File {sh3d_file_path} does not exist.")
@@ -148,3 +151,16 @@ def import_sh3d(sh3d_file_path: str, canvas_area: CanvasArea) -> dict:
                 windows.append((associated_wall, new_window, best_ratio))
 
         return {"wall_sets": wall_sets, "rooms": rooms, "doors": doors, "windows": windows, "identifiers": identifiers}
+
+
+def load_sh3d_document(sh3d_file_path):
+    """ Import a .sh3d file into a new headless Document. """
+    imported = import_sh3d(sh3d_file_path)
+    document = Document()
+    document.wall_sets.extend(imported["wall_sets"])
+    document.rooms.extend(imported["rooms"])
+    document.doors.extend(imported["doors"])
+    document.windows.extend(imported["windows"])
+    document.existing_ids.extend(imported["identifiers"])
+    document.notify(BULK_RELOAD)
+    return document
@@ -0,0 +1,224 @@
+"""
+Headless takeoff: estimate project files from the command line.
+
+Loads EstiSketch project XML files (project_io) or Sweet Home 3D .sh3d files
+(sh3d_importer), runs the framing takeoff and plate cut lists, optionally the room
+finish, sheet goods and cost takeoffs, and writes the result as JSON, JSON Lines or
+CSV. Nothing here imports GTK, so startup is only the takeoff modules themselves.
+
+    python -m takeoff_cli house.xml
+    python -m takeoff_cli --format csv --rooms --sheets plans/*.xml > takeoff.csv
+    find plans -name '*.xml' | python -m takeoff_cli --format jsonl --jobs 4 -
+
+With "-" (or no paths at all and a non-terminal stdin) file paths are read from
+stdin, one per line. JSON Lines and CSV rows are written as each file finishes,
+in input order. The exit status is 1 if any file could not be estimated.
+"""
+import argparse
+import csv
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+
+import config
+from Takeoff.cut_list import plate_cut_lists
+from Takeoff.framing_takeoff import LUMBER_SIZES, FramingTakeoff
+
+CSV_FIELDS = ("path", "section", "item", "quantity", "unit")
+
+
+def load_document(path):
+    """A headless Document for a project .xml or a .sh3d file."""
+    # The loaders report progress with print(); keep stdout for the output format.
+    with redirect_stdout(sys.stderr):
+        if path.lower().endswith(".sh3d"):
+            from sh3d_importer import load_sh3d_document
+            return load_sh3d_document(path)
+        import project_io
+        return project_io.load_document(path)[0]
+
+
+def load_settings(path=None):
+    """Settings from a settings file, or the application's settings.json."""
+    if not path:
+        return config.get_settings()
+    settings = config.Settings(path)
+    settings.load()
+    return settings
+
+
+def estimate_file(path, settings, rooms=False, sheets=False, cost=False):
+    """
+    Takeoff of one project file as a JSON-ready dict.
+
+    Returns:
+        dict: {"path", "walls", "framing", "plates"} plus "rooms", "sheets" and "cost"
+        when asked for, or {"path", "error"} if the file could not be estimated.
+    """
+    try:
+        return _takeoff(path, load_document(path), settings, rooms, sheets, cost)
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+
+def _takeoff(path, document, settings, rooms, sheets, cost):
+    framing = FramingTakeoff(document, settings).estimate()
+    plates = plate_cut_lists(framing, kerf=float(getattr(settings, "SAW_KERF_INCHES", 0.125)))
+    result = {
+        "path": path,
+        "walls": len(document.all_walls()),
+        "framing": {key: value for key, value in framing.items() if key != "wall_details"},
+        "plates": {
+            size: {"boards": {str(length): count for length, count in plan.counts().items()},
+                   "waste_ft": round(plan.waste / 12, 2)}
+            for size, plan in plates.items()
+        },
+    }
+
+    room_estimate = sheet_estimate = None
+    if rooms or cost:
+        from Takeoff.room_takeoff import RoomTakeoff
+        room_estimate = RoomTakeoff(document, settings).estimate()
+    if sheets or cost:
+        from Takeoff.sheet_goods import SheetTakeoff
+        sheet_estimate = SheetTakeoff(document, settings).estimate()
+    if rooms:
+        result["rooms"] = {key: value for key, value in room_estimate.items() if key != "rooms"}
+        result["rooms"]["count"] = len(document.rooms)
+    if sheets:
+        result["sheets"] = {
+            kind: {"panels": plan.panels,
+                   "counts": {f"{int(w)}x{int(h)}": count for (w, h), count in plan.counts.items()},
+                   "waste_pct": round(plan.waste_pct, 2)}
+            for kind, plan in sheet_estimate.items()
+        }
+    if cost:
+        from Takeoff.cost_engine import CostEngine, finish_lines, framing_lines, get_price_catalog, sheet_lines
+        lines = framing_lines(framing, plates) + sheet_lines(sheet_estimate) + finish_lines(room_estimate,
+                                                                                           wall_sheets=True)
+        estimate = CostEngine(get_price_catalog(settings), settings).price(lines)
+        result["cost"] = {
+            "material": estimate.material,
+            "labor_hours": estimate.labor_hours,
+            "labor": estimate.labor,
+            "tax": estimate.tax,
+            "total": estimate.total,
+            "lines": [
+                {"item": line.item, "description": line.description, "quantity": line.quantity,
+                 "unit": line.unit, "unit_price": entry.unit_price if entry is not None else None,
+                 "cost": round(line_cost, 2)}
+                for line, entry, line_cost in estimate.lines
+            ],
+        }
+    return result
+
+
+def csv_rows(result):
+    """Flat (path, section, item, quantity, unit) rows of an estimate_file() result."""
+    path = result["path"]
+    if "error" in result:
+        yield path, "error", result["error"], "", ""
+        return
+    framing = result["framing"]
+    for size in LUMBER_SIZES.values():
+        if framing[f"total_{size}_studs"]:
+            yield path, "studs", size, framing[f"total_{size}_studs"], "each"
+    for size, plan in result["plates"].items():
+        for length, count in plan["boards"].items():
+            yield path, "plates", f"{size} x {int(length) // 12}'", count, "each"
+    for key, value in result.get("rooms", {}).items():
+        if key == "floor_by_type":
+            for floor_type, area in value.items():
+                yield path, "flooring", floor_type, area, "sq ft"
+        elif key != "count":
+            yield path, "rooms", key, value, "ft" if key in ("perimeter", "baseboard_length") else "sq ft"
+    for kind, plan in result.get("sheets", {}).items():
+        for size, count in plan["counts"].items():
+            yield path, f"sheets:{kind}", size, count, "each"
+    if "cost" in result:
+        for line in result["cost"]["lines"]:
+            yield path, "cost", line["item"], line["cost"], "USD"
+        yield path, "cost", "total", result["cost"]["total"], "USD"
+
+
+def read_paths(args, stdin=sys.stdin):
+    """File paths from the command line, with "-" (or a piped stdin and no paths) read from stdin."""
+    paths = list(args)
+    if not paths and not stdin.isatty():
+        paths = ["-"]
+    for path in paths:
+        if path == "-":
+            for line in stdin:
+                line = line.strip()
+                if line:
+                    yield line
+        else:
+            yield path
+
+
+def _estimate_job(job):
+    path, settings_values, options = job
+    return estimate_file(path, config.Settings(**settings_values), **options)
+
+
+def estimates(paths, settings, jobs=1, **options):
+    """estimate_file() for each path, in order; jobs > 1 spreads the files over worker processes."""
+    if jobs <= 1:
+        for path in paths:
+            yield estimate_file(path, settings, **options)
+        return
+    values = settings.as_dict()
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield from pool.map(_estimate_job, ((path, values, options) for path in paths), chunksize=4)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m takeoff_cli",
+                                     description="Estimate EstiSketch (.xml) and Sweet Home 3D (.sh3d) files.")
+    parser.add_argument("paths", nargs="*", help="Project files; \"-\" reads paths from stdin, one per line.")
+    parser.add_argument("--format", choices=("json", "jsonl", "csv"), default="json", help="Output format.")
+    parser.add_argument("--output", "-o", help="Write here instead of stdout.")
+    parser.add_argument("--settings", help="Settings file to use instead of the application's settings.json.")
+    parser.add_argument("--rooms", action="store_true", help="Include the room finish takeoff.")
+    parser.add_argument("--sheets", action="store_true", help="Include drywall and sheathing panels.")
+    parser.add_argument("--cost", action="store_true", help="Price the takeoff against the material library.")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for many files.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = load_settings(args.settings)
+    options = {"rooms": args.rooms, "sheets": args.sheets, "cost": args.cost}
+    out = open(args.output, "w", newline="") if args.output else sys.stdout
+    failed = 0
+    try:
+        results = estimates(read_paths(args.paths), settings, args.jobs, **options)
+        if args.format == "json":
+            collected = list(results)
+            failed = sum(1 for result in collected if "error" in result)
+            json.dump({"files": collected}, out, indent=2)
+            out.write("\n")
+        elif args.format == "jsonl":
+            for result in results:
+                failed += "error" in result
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+        else:
+            writer = csv.writer(out)
+            writer.writerow(CSV_FIELDS)
+            for result in results:
+                failed += "error" in result
+                writer.writerows(csv_rows(result))
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if failed:
+        print(f"{failed} file(s) could not be estimated", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())